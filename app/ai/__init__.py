@@ -3,22 +3,48 @@ AI/ML Module for TBAML System
 Handles LLM integration, text processing, classification, and flag generation
 """
 
-from app.ai.config import AIConfig
-from app.ai.llm_client import LLMClient
-from app.ai.text_processor import TextProcessor
-from app.ai.classifier import ActivityClassifier, RiskClassifier
-from app.ai.flag_generator import FlagGenerator
-from app.ai.orchestrator import AIOrchestrator
-from app.ai.prompts import PromptTemplates, ResponseParser
+import importlib
+
+from app.ai.config import AIConfig, get_ai_config
+
+# Heavy components (LLM SDKs, HTTP clients) are imported on first attribute access
+_LAZY_IMPORTS = {
+    "LLMClient": "app.ai.llm_client",
+    "TextProcessor": "app.ai.text_processor",
+    "ActivityClassifier": "app.ai.classifier",
+    "RiskClassifier": "app.ai.classifier",
+    "Flag": "app.ai.flag_generator",
+    "FlagGenerator": "app.ai.flag_generator",
+    "AIOrchestrator": "app.ai.orchestrator",
+    "AnalysisResult": "app.ai.orchestrator",
+    "PromptTemplates": "app.ai.prompts",
+    "ResponseParser": "app.ai.prompts",
+}
 
 __all__ = [
     "AIConfig",
+    "get_ai_config",
     "LLMClient",
     "TextProcessor",
     "ActivityClassifier",
     "RiskClassifier",
+    "Flag",
     "FlagGenerator",
     "AIOrchestrator",
+    "AnalysisResult",
     "PromptTemplates",
     "ResponseParser"
 ]
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,100 @@
+"""
+Request Batcher Module
+Coalesces concurrent async LLM calls into micro-batches
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class Batcher:
+    """
+    Collects calls issued within a short window and dispatches them together
+    
+    Identical requests in the same batch share a single dispatch, so
+    concurrent analyses of the same counterparty make one LLM call.
+    """
+    
+    def __init__(
+        self,
+        dispatch: Callable[..., Awaitable[Dict[str, Any]]],
+        max_batch: int = 32,
+        max_wait_ms: float = 10
+    ):
+        """
+        Initialize batcher
+        
+        Args:
+            dispatch: Coroutine function performing one request (keyword arguments)
+            max_batch: Flush as soon as this many distinct requests are pending
+            max_wait_ms: Flush at most this long after the first pending request
+        """
+        self.dispatch = dispatch
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Dict[Tuple, Tuple[Dict[str, Any], asyncio.Future]] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+    
+    async def submit(self, **request: Any) -> Dict[str, Any]:
+        """
+        Queue a request for the next batch and wait for its result
+        
+        Args:
+            **request: Keyword arguments for dispatch (must be hashable values)
+        
+        Returns:
+            The dispatch result for this request
+        """
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Pending state belongs to one event loop (e.g. successive asyncio.run calls)
+            self._loop = loop
+            self._pending = {}
+            self._timer = None
+        
+        key = tuple(sorted(request.items()))
+        entry = self._pending.get(key)
+        if entry is None:
+            entry = (request, loop.create_future())
+            self._pending[key] = entry
+            
+            if len(self._pending) >= self.max_batch:
+                self._flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.max_wait, self._flush)
+        
+        # Shield: one caller being cancelled must not cancel the shared result;
+        # each caller gets its own copy of a shared response
+        return dict(await asyncio.shield(entry[1]))
+    
+    def _flush(self):
+        """Dispatch everything pending as one batch"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        
+        batch = list(self._pending.values())
+        self._pending = {}
+        if batch:
+            self._loop.create_task(self._run_batch(batch))
+    
+    async def _run_batch(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        """Run a batch's requests concurrently and resolve their futures"""
+        logger.debug("Dispatching LLM micro-batch", size=len(batch))
+        
+        results = await asyncio.gather(
+            *(self.dispatch(**request) for request, _ in batch),
+            return_exceptions=True
+        )
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -0,0 +1,189 @@
+"""
+Response Cache Module
+In-process TTL cache for LLM responses with optional semantic lookup
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Any, Tuple
+from app.core.logging import get_logger
+from app.ai.config import AIConfig
+
+logger = get_logger(__name__)
+
+
+class ResponseCache:
+    """TTL/LRU cache for LLM responses keyed by a normalized prompt hash"""
+    
+    def __init__(
+        self,
+        maxsize: int = 10000,
+        ttl: int = 3600,
+        semantic: bool = False,
+        similarity_threshold: float = 0.95,
+        embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    ):
+        """
+        Initialize response cache
+        
+        Args:
+            maxsize: Maximum number of cached responses
+            ttl: Time-to-live for each entry in seconds
+            semantic: Enable embedding-similarity lookup on exact-key misses
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+            embedding_model: sentence-transformers model used for embeddings
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.semantic = semantic
+        self.similarity_threshold = similarity_threshold
+        self.embedding_model = embedding_model
+        
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._vectors: Dict[str, Tuple[str, Any]] = {}  # key -> (namespace, vector)
+        self._encoder = None
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """
+        Build a cache key from prompt parts
+        
+        Whitespace is collapsed so formatting-only differences share a key.
+        """
+        normalized = "\x1f".join(" ".join(str(part).split()) for part in parts)
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+    
+    def get(
+        self,
+        key: str,
+        namespace: Optional[str] = None,
+        text: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response
+        
+        Args:
+            key: Exact cache key
+            namespace: Partition for semantic lookup (provider/model/system prompt)
+            text: Text to embed for semantic lookup on an exact miss
+        
+        Returns:
+            Cached response dictionary or None
+        """
+        with self._lock:
+            value = self._get_entry(key)
+        if value is not None:
+            return value
+        
+        if not self.semantic or text is None:
+            return None
+        
+        vector = self._embed(text)
+        if vector is None:
+            return None
+        
+        with self._lock:
+            best_key, best_score = None, self.similarity_threshold
+            for candidate_key, (candidate_ns, candidate_vec) in self._vectors.items():
+                if candidate_ns != namespace:
+                    continue
+                score = float(candidate_vec @ vector)
+                if score >= best_score:
+                    best_key, best_score = candidate_key, score
+            
+            if best_key is None:
+                return None
+            
+            value = self._get_entry(best_key)
+        
+        if value is not None:
+            logger.debug("Semantic cache hit", similarity=round(best_score, 4))
+        return value
+    
+    def set(
+        self,
+        key: str,
+        value: Dict[str, Any],
+        namespace: Optional[str] = None,
+        text: Optional[str] = None,
+        ttl: Optional[int] = None
+    ):
+        """
+        Store a response in the cache
+        
+        Args:
+            key: Exact cache key
+            value: Response dictionary to store
+            namespace: Partition for semantic lookup
+            text: Text to embed for semantic lookup
+            ttl: Time-to-live for this entry in seconds (defaults to the cache's ttl)
+        """
+        vector = self._embed(text) if self.semantic and text is not None else None
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            if vector is not None:
+                self._vectors[key] = (namespace, vector)
+            
+            while len(self._entries) > self.maxsize:
+                evicted_key, _ = self._entries.popitem(last=False)
+                self._vectors.pop(evicted_key, None)
+    
+    def clear(self):
+        """Remove all cached responses"""
+        with self._lock:
+            self._entries.clear()
+            self._vectors.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def _get_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a live entry, dropping it if expired (caller holds the lock)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self._vectors.pop(key, None)
+            return None
+        
+        self._entries.move_to_end(key)
+        return value
+    
+    def _embed(self, text: str) -> Optional[Any]:
+        """Embed text with a normalized sentence-transformers vector"""
+        if self._encoder is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+                self._encoder = SentenceTransformer(self.embedding_model)
+            except Exception as e:
+                logger.warning("Semantic cache disabled, embedding model unavailable", error=str(e))
+                self.semantic = False
+                return None
+        
+        return self._encoder.encode(text, normalize_embeddings=True)
+
+
+# Singleton instance for caching
+_cache_instance: Optional[ResponseCache] = None
+
+
+def get_response_cache(config: AIConfig) -> ResponseCache:
+    """Get singleton response cache instance"""
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = ResponseCache(
+            maxsize=config.llm_cache_maxsize,
+            ttl=config.llm_cache_ttl,
+            semantic=config.llm_semantic_cache,
+            similarity_threshold=config.llm_semantic_threshold
+        )
+    return _cache_instance
@@ -4,22 +4,53 @@ Activity level and risk classification
 """
 
 from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
 from app.core.logging import get_logger
-from app.ai.config import AIConfig
+from app.ai.config import AIConfig, get_ai_config
 from app.ai.llm_client import LLMClient
 from app.ai.prompts import PromptTemplates, ResponseParser
+from app.ai.keywords import KeywordMatcher
 
 logger = get_logger(__name__)
 
+# Keyword fallbacks, compiled once at import
+_ACTIVITY_MATCHER = KeywordMatcher({
+    "active": "Active", "operational": "Active", "operating": "Active", "current": "Active",
+    "dormant": "Dormant", "inactive": "Dormant", "no activity": "Dormant",
+    "suspended": "Suspended", "suspension": "Suspended",
+    "discontinued": "Inactive", "closed": "Inactive", "shut down": "Inactive"
+})
+_ACTIVITY_PRIORITY = ("Active", "Dormant", "Suspended", "Inactive")
+
+_RISK_MATCHER = KeywordMatcher({
+    # High-risk keywords
+    "sanctions": "high", "prohibited": "high", "illegal": "high", "violation": "high",
+    "suspicious": "high", "fraud": "high", "money laundering": "high",
+    # Medium-risk keywords
+    "concern": "medium", "issue": "medium", "risk": "medium", "warning": "medium",
+    "uncertainty": "medium", "unverified": "medium"
+})
+
+
+def _combine_risk_score(high_count: int, medium_count: int, flag_count: int) -> float:
+    """Combine keyword and flag counts into a 0-1 fallback risk score"""
+    score = 0.3  # Base risk score
+    score += min(high_count * 0.1, 0.4)  # Max 0.4 from high-risk keywords
+    score += min(medium_count * 0.05, 0.2)  # Max 0.2 from medium-risk keywords
+    score += min(flag_count * 0.1, 0.3)  # Max 0.3 from flags
+    return min(score, 1.0)
+
 
 class ActivityClassifier:
     """Classifies business activity levels"""
     
     def __init__(self, config: Optional[AIConfig] = None, llm_client: Optional[LLMClient] = None):
         """Initialize activity classifier"""
-        self.config = config or AIConfig()
+        self.config = config or get_ai_config()
         self.llm_client = llm_client or LLMClient(config)
         self.parser = ResponseParser()
+        # Valid classes map to themselves; anything else resolves to "Unknown" in one lookup
+        self.activity_classes = {level: level for level in self.config.activity_classes}
         logger.info("ActivityClassifier initialized")
     
     def classify(
@@ -39,83 +70,133 @@ class ActivityClassifier:
         Returns:
             Classification result with activity_level and confidence
         """
+        evidence_text = self.config.truncate_text(evidence_text)
+        insufficient = self._insufficient_evidence_result(evidence_text)
+        if insufficient is not None:
+            return insufficient
+        
         try:
-            prompt = PromptTemplates.activity_classification_prompt(
-                company_name=company_name,
-                evidence_text=evidence_text
-            )
-            
-            system_prompt = PromptTemplates.SYSTEM_PROMPT_BASE + "\n\nFocus on activity level classification based on evidence."
-            
             response = self.llm_client.generate_response(
-                prompt=prompt,
-                system_prompt=system_prompt
+                prompt=PromptTemplates.activity_classification_prompt(
+                    company_name=company_name,
+                    evidence_text=evidence_text
+                ),
+                system_prompt=PromptTemplates.ACTIVITY_SYSTEM_PROMPT,
+                stop_on_json=True  # Only the first JSON object is parsed
             )
-            
-            if response.get("error"):
-                logger.error(f"LLM error in activity classification", error=response.get("error"))
-                return {
-                    "activity_level": "Unknown",
-                    "confidence": "Low",
-                    "reasoning": "Error in classification",
-                    "error": response.get("error")
-                }
-            
-            content = response.get("content", "")
-            if not content:
-                return {
-                    "activity_level": "Unknown",
-                    "confidence": "Low",
-                    "reasoning": "No response from LLM"
-                }
-            
-            # Parse response
-            parsed = self.parser.parse_lob_response(content)
-            
-            # Extract activity level
-            activity_level = parsed.get("activity_level")
-            if not activity_level:
-                # Try to find in text
-                activity_level = self._extract_activity_level(content)
-            
-            # Validate activity level
-            if activity_level not in self.config.activity_classes:
-                activity_level = "Unknown"
-            
-            result = {
-                "activity_level": activity_level,
-                "confidence": parsed.get("confidence", "Medium"),
-                "reasoning": parsed.get("analysis", content[:500]),
-                "raw_response": content
-            }
-            
-            logger.info(f"Activity classified: {activity_level} (confidence: {result['confidence']})")
-            return result
+            return self._build_result(response)
         
         except Exception as e:
-            logger.error(f"Error in activity classification", error=str(e))
+            logger.error("Error in activity classification", error=str(e))
+            return self._error_result(e)
+    
+    async def classify_async(
+        self,
+        company_name: str,
+        evidence_text: str,
+        additional_context: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Classify activity level without blocking the event loop
+        
+        Args:
+            company_name: Company name
+            evidence_text: Evidence text to analyze
+            additional_context: Optional additional context
+        
+        Returns:
+            Classification result with activity_level and confidence
+        """
+        evidence_text = self.config.truncate_text(evidence_text)
+        insufficient = self._insufficient_evidence_result(evidence_text)
+        if insufficient is not None:
+            return insufficient
+        
+        try:
+            response = await self.llm_client.generate_response_async(
+                prompt=PromptTemplates.activity_classification_prompt(
+                    company_name=company_name,
+                    evidence_text=evidence_text
+                ),
+                system_prompt=PromptTemplates.ACTIVITY_SYSTEM_PROMPT,
+                stop_on_json=True  # Only the first JSON object is parsed
+            )
+            return self._build_result(response)
+        
+        except Exception as e:
+            logger.error("Error in activity classification", error=str(e))
+            return self._error_result(e)
+    
+    def _insufficient_evidence_result(self, evidence_text: str) -> Optional[Dict[str, Any]]:
+        """Default result when there is too little evidence to spend an LLM call on"""
+        if not evidence_text or len(evidence_text.strip()) < self.config.min_text_length:
+            return {
+                "activity_level": "Unknown",
+                "confidence": "Low",
+                "reasoning": "Insufficient evidence"
+            }
+        return None
+    
+    def _build_result(self, response: Dict[str, Any]) -> Dict[str, Any]:
+        """Turn an LLM response into a classification result"""
+        if response.get("error"):
+            logger.error("LLM error in activity classification", error=response.get("error"))
             return {
                 "activity_level": "Unknown",
                 "confidence": "Low",
-                "reasoning": f"Error: {str(e)}",
-                "error": str(e)
+                "reasoning": "Error in classification",
+                "error": response.get("error")
             }
+        
+        content = response.get("content", "")
+        if not content:
+            return {
+                "activity_level": "Unknown",
+                "confidence": "Low",
+                "reasoning": "No response from LLM"
+            }
+        
+        # Parse response
+        parsed = self.parser.parse_lob_response(content)
+        
+        # Extract activity level
+        activity_level = parsed.get("activity_level")
+        if not activity_level:
+            # Try to find in text
+            activity_level = self._extract_activity_level(content)
+        
+        # Validate activity level
+        activity_level = self.activity_classes.get(activity_level, "Unknown")
+        
+        result = {
+            "activity_level": activity_level,
+            "confidence": parsed.get("confidence", "Medium"),
+            "reasoning": parsed["analysis"] if "analysis" in parsed else content[:500]
+        }
+        if self.config.include_raw_response:
+            result["raw_response"] = content
+        
+        logger.info("Activity classified", activity_level=activity_level, confidence=result["confidence"])
+        return result
+    
+    @staticmethod
+    def _error_result(error: Exception) -> Dict[str, Any]:
+        """Result returned when classification raises"""
+        return {
+            "activity_level": "Unknown",
+            "confidence": "Low",
+            "reasoning": f"Error: {str(error)}",
+            "error": str(error)
+        }
     
     def _extract_activity_level(self, text: str) -> str:
         """Extract activity level from text using keywords"""
-        text_lower = text.lower()
-        
-        # Keyword matching (fallback)
-        if any(word in text_lower for word in ["active", "operational", "operating", "current"]):
-            return "Active"
-        elif any(word in text_lower for word in ["dormant", "inactive", "no activity"]):
-            return "Dormant"
-        elif any(word in text_lower for word in ["suspended", "suspension"]):
-            return "Suspended"
-        elif any(word in text_lower for word in ["discontinued", "closed", "shut down"]):
-            return "Inactive"
-        else:
-            return "Unknown"
+        # Keyword matching (fallback) - one scan, then first class in priority order
+        found = _ACTIVITY_MATCHER.count_labels(text.lower())
+        for activity_level in _ACTIVITY_PRIORITY:
+            if found[activity_level]:
+                return activity_level
+        return "Unknown"
 
 
 class RiskClassifier:
@@ -123,7 +204,7 @@ class RiskClassifier:
     
     def __init__(self, config: Optional[AIConfig] = None, llm_client: Optional[LLMClient] = None):
         """Initialize risk classifier"""
-        self.config = config or AIConfig()
+        self.config = config or get_ai_config()
         self.llm_client = llm_client or LLMClient(config)
         self.parser = ResponseParser()
         logger.info("RiskClassifier initialized")
@@ -149,98 +230,173 @@ class RiskClassifier:
         Returns:
             Risk assessment with risk_score and flags
         """
+        evidence_text = self.config.truncate_text(evidence_text)
+        sanctions_info = self.config.truncate_text(sanctions_info)
+        insufficient = self._insufficient_evidence_result(evidence_text, sanctions_info)
+        if insufficient is not None:
+            return insufficient
+        
         try:
-            prompt = PromptTemplates.risk_assessment_prompt(
-                company_name=company_name,
-                country=country,
-                evidence_text=evidence_text,
-                sanctions_info=sanctions_info
-            )
-            
-            system_prompt = PromptTemplates.SYSTEM_PROMPT_BASE + "\n\nFocus on risk and compliance assessment."
-            
             response = self.llm_client.generate_response(
-                prompt=prompt,
-                system_prompt=system_prompt
+                prompt=PromptTemplates.risk_assessment_prompt(
+                    company_name=company_name,
+                    country=country,
+                    evidence_text=evidence_text,
+                    sanctions_info=sanctions_info
+                ),
+                system_prompt=PromptTemplates.RISK_SYSTEM_PROMPT,
+                stop_on_json=True  # Only the first JSON object is parsed
             )
-            
-            if response.get("error"):
-                logger.error(f"LLM error in risk assessment", error=response.get("error"))
-                return {
-                    "risk_score": 0.5,
-                    "risk_level": "Medium",
-                    "flags": [],
-                    "error": response.get("error")
-                }
-            
-            content = response.get("content", "")
-            if not content:
-                return {
-                    "risk_score": 0.5,
-                    "risk_level": "Medium",
-                    "flags": []
-                }
-            
-            # Parse response
-            parsed = self.parser.parse_lob_response(content)
-            
-            # Extract risk score
-            risk_score = parsed.get("risk_score")
-            if risk_score is None:
-                risk_score = self._calculate_risk_score(content, parsed.get("flags", []))
-            
-            # Determine risk level
-            if risk_score >= self.config.risk_threshold_high:
-                risk_level = "High"
-            elif risk_score >= self.config.risk_threshold_medium:
-                risk_level = "Medium"
-            else:
-                risk_level = "Low"
-            
-            result = {
-                "risk_score": float(risk_score),
-                "risk_level": risk_level,
-                "flags": parsed.get("flags", []),
-                "reasoning": parsed.get("analysis", content[:500]),
-                "raw_response": content
-            }
-            
-            logger.info(f"Risk assessed: {risk_level} (score: {risk_score:.2f})")
-            return result
+            return self._build_result(response)
         
         except Exception as e:
-            logger.error(f"Error in risk assessment", error=str(e))
+            logger.error("Error in risk assessment", error=str(e))
+            return self._error_result(e)
+    
+    async def assess_risk_async(
+        self,
+        company_name: str,
+        country: str,
+        evidence_text: str,
+        sanctions_info: Optional[str] = None,
+        additional_context: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Assess risk level without blocking the event loop
+        
+        Args:
+            company_name: Company name
+            country: Country code
+            evidence_text: Evidence text
+            sanctions_info: Optional sanctions information
+            additional_context: Optional additional context
+        
+        Returns:
+            Risk assessment with risk_score and flags
+        """
+        evidence_text = self.config.truncate_text(evidence_text)
+        sanctions_info = self.config.truncate_text(sanctions_info)
+        insufficient = self._insufficient_evidence_result(evidence_text, sanctions_info)
+        if insufficient is not None:
+            return insufficient
+        
+        try:
+            response = await self.llm_client.generate_response_async(
+                prompt=PromptTemplates.risk_assessment_prompt(
+                    company_name=company_name,
+                    country=country,
+                    evidence_text=evidence_text,
+                    sanctions_info=sanctions_info
+                ),
+                system_prompt=PromptTemplates.RISK_SYSTEM_PROMPT,
+                stop_on_json=True  # Only the first JSON object is parsed
+            )
+            return self._build_result(response)
+        
+        except Exception as e:
+            logger.error("Error in risk assessment", error=str(e))
+            return self._error_result(e)
+    
+    def _insufficient_evidence_result(
+        self,
+        evidence_text: str,
+        sanctions_info: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Default result when there is too little evidence (and no sanctions info) to assess"""
+        if not sanctions_info and (not evidence_text or len(evidence_text.strip()) < self.config.min_text_length):
+            return {
+                "risk_score": 0.5,
+                "risk_level": "Medium",
+                "flags": [],
+                "reasoning": "Insufficient evidence"
+            }
+        return None
+    
+    def _build_result(self, response: Dict[str, Any]) -> Dict[str, Any]:
+        """Turn an LLM response into a risk assessment"""
+        if response.get("error"):
+            logger.error("LLM error in risk assessment", error=response.get("error"))
             return {
                 "risk_score": 0.5,
                 "risk_level": "Medium",
                 "flags": [],
-                "error": str(e)
+                "error": response.get("error")
             }
+        
+        content = response.get("content", "")
+        if not content:
+            return {
+                "risk_score": 0.5,
+                "risk_level": "Medium",
+                "flags": []
+            }
+        
+        # Parse response
+        parsed = self.parser.parse_lob_response(content)
+        
+        # Extract risk score
+        risk_score = parsed.get("risk_score")
+        if risk_score is None:
+            risk_score = self._calculate_risk_score(content, parsed.get("flags", []))
+        
+        # Determine risk level
+        if risk_score >= self.config.risk_threshold_high:
+            risk_level = "High"
+        elif risk_score >= self.config.risk_threshold_medium:
+            risk_level = "Medium"
+        else:
+            risk_level = "Low"
+        
+        result = {
+            "risk_score": float(risk_score),
+            "risk_level": risk_level,
+            "flags": parsed.get("flags", []),
+            "reasoning": parsed["analysis"] if "analysis" in parsed else content[:500]
+        }
+        if self.config.include_raw_response:
+            result["raw_response"] = content
+        
+        logger.info("Risk assessed", risk_level=risk_level, risk_score=round(risk_score, 2))
+        return result
+    
+    @staticmethod
+    def _error_result(error: Exception) -> Dict[str, Any]:
+        """Result returned when risk assessment raises"""
+        return {
+            "risk_score": 0.5,
+            "risk_level": "Medium",
+            "flags": [],
+            "error": str(error)
+        }
+    
+    def assess_risk_batch(
+        self,
+        cases: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Assess risk for many companies with concurrent LLM calls
+        
+        Args:
+            cases: List of assess_risk keyword arguments
+                   (company_name, country, evidence_text, sanctions_info, additional_context)
+            max_concurrency: Maximum in-flight LLM calls (defaults to config)
+        
+        Returns:
+            Risk assessments in the same order as cases
+        """
+        if not cases:
+            return []
+        
+        max_workers = min(len(cases), max_concurrency or self.config.llm_batch_concurrency)
+        logger.info("Assessing risk in batch", companies=len(cases), max_workers=max_workers)
+        
+        # assess_risk never raises, so one failing case cannot abort the batch
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda case: self.assess_risk(**case), cases))
     
     def _calculate_risk_score(self, text: str, flags: List[str]) -> float:
         """Calculate risk score from text and flags"""
-        score = 0.3  # Base risk score
-        
-        text_lower = text.lower()
-        
-        # High-risk keywords
-        high_risk_keywords = [
-            "sanctions", "prohibited", "illegal", "violation",
-            "suspicious", "fraud", "money laundering"
-        ]
-        high_risk_count = sum(1 for keyword in high_risk_keywords if keyword in text_lower)
-        score += min(high_risk_count * 0.1, 0.4)  # Max 0.4 from keywords
-        
-        # Medium-risk keywords
-        medium_risk_keywords = [
-            "concern", "issue", "risk", "warning",
-            "uncertainty", "unverified"
-        ]
-        medium_risk_count = sum(1 for keyword in medium_risk_keywords if keyword in text_lower)
-        score += min(medium_risk_count * 0.05, 0.2)  # Max 0.2 from keywords
-        
-        # Flags increase risk
-        score += min(len(flags) * 0.1, 0.3)  # Max 0.3 from flags
-        
-        return min(score, 1.0)
+        keyword_counts = _RISK_MATCHER.count_labels(text.lower())
+        return _combine_risk_score(keyword_counts["high"], keyword_counts["medium"], len(flags))
 
@@ -4,12 +4,17 @@ Settings for LLM APIs, model parameters, and AI processing
 """
 
 import os
+from functools import lru_cache
 from pydantic_settings import BaseSettings
 from typing import Optional
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+# Load environment variables (once per process, including child processes)
+if not os.getenv("_TBAML_DOTENV_LOADED"):
+    load_dotenv()
+    os.environ["_TBAML_DOTENV_LOADED"] = "1"
+
+_TRUNCATION_MARKER = "\n...\n"
 
 
 class AIConfig(BaseSettings):
@@ -20,16 +25,43 @@ class AIConfig(BaseSettings):
     llm_model: str = os.getenv("LLM_MODEL", "gpt-4-turbo-preview")
     llm_temperature: float = float(os.getenv("LLM_TEMPERATURE", "0.3"))
     llm_max_tokens: int = int(os.getenv("LLM_MAX_TOKENS", "2000"))
+    llm_batch_concurrency: int = 32  # Max in-flight LLM calls for batch methods / per micro-batch
+    llm_batch_window_ms: float = 10.0  # How long async calls wait to be coalesced into a micro-batch
+    llm_warmup_prefixes: bool = False  # Prime provider prefix cache with task system prompts at startup
     
     # OpenAI Settings
     openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
     
     # Ollama Settings (Local LLM)
     ollama_base_url: str = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+    ollama_model: str = os.getenv("OLLAMA_MODEL", "llama3.2")
+    ollama_temperature: float = float(os.getenv("OLLAMA_TEMPERATURE", "0.3"))
+    ollama_max_tokens: int = int(os.getenv("OLLAMA_MAX_TOKENS", "2000"))
+    ollama_stream: bool = True  # Stream completions instead of waiting for the full body
+    
+    # HTTP Connection Pool (shared by OpenAI and Ollama calls)
+    llm_http_timeout: float = 60.0  # Seconds
+    llm_http_max_connections: int = 32
+    
+    # Response Cache
+    llm_cache_enabled: bool = True
+    llm_cache_ttl: int = 3600  # Seconds
+    llm_cache_maxsize: int = 10000
+    llm_cache_max_temperature: float = 0.3  # Only cache (near-)deterministic calls
+    llm_semantic_cache: bool = False  # Requires sentence-transformers
+    llm_semantic_threshold: float = 0.95
+    ai_response_cache_ttl: int = 86400  # Seconds; main LOB analysis responses
+    ai_response_semantic_threshold: float = 0.92
+    analysis_cache_ttl: int = 3600  # Seconds; complete analyze_lob results
+    analysis_cache_maxsize: int = 256
+    
+    # Debugging
+    include_raw_response: bool = False  # Keep full LLM completion in classifier results
     
     # Feature Extraction
     min_text_length: int = 50  # Minimum text length for analysis
     max_text_length: int = 8000  # Maximum text length (will be truncated)
+    feature_cache_maxsize: int = 1024  # Memoized extract_features results
     
     # Activity Classification
     activity_classes: list = [
@@ -63,7 +95,37 @@ class AIConfig(BaseSettings):
         "env_prefix": "AI_"
     }
     
-    def __init__(self, **kwargs):
-        """Initialize config"""
-        super().__init__(**kwargs)
+    @property
+    def active_model(self) -> str:
+        """Model the configured provider runs"""
+        return self.llm_model if self.llm_provider == "openai" else self.ollama_model
+    
+    @property
+    def active_temperature(self) -> float:
+        """Default temperature of the configured provider"""
+        return self.llm_temperature if self.llm_provider == "openai" else self.ollama_temperature
+    
+    @property
+    def active_max_tokens(self) -> int:
+        """Default max tokens of the configured provider"""
+        return self.llm_max_tokens if self.llm_provider == "openai" else self.ollama_max_tokens
+    
+    def truncate_text(self, text: Optional[str]) -> Optional[str]:
+        """
+        Truncate text to max_text_length
+        
+        Over-long text keeps its head and tail, where summaries and
+        closing remarks (status, sanctions notes) tend to sit.
+        """
+        if not text or len(text) <= self.max_text_length:
+            return text
+        
+        tail_length = self.max_text_length // 4
+        head_length = self.max_text_length - tail_length - len(_TRUNCATION_MARKER)
+        return text[:head_length] + _TRUNCATION_MARKER + text[-tail_length:]
+
 
+@lru_cache(maxsize=1)
+def get_ai_config() -> AIConfig:
+    """Get cached AI configuration instance"""
+    return AIConfig()
@@ -3,20 +3,48 @@ Flag Generation Module
 Generates compliance flags and alerts
 """
 
+from dataclasses import asdict, dataclass, replace
 from typing import Dict, List, Optional, Any
 from app.core.logging import get_logger
-from app.ai.config import AIConfig
+from app.ai.config import AIConfig, get_ai_config
 from app.ai.classifier import RiskClassifier
+from app.ai.keywords import KeywordMatcher
 
 logger = get_logger(__name__)
 
+# Common compliance concerns: keyword -> (category, message)
+_COMPLIANCE_KEYWORDS = {
+    "unregistered": ("compliance_issue", "Company may be unregistered"),
+    "no website": ("data_quality", "No website found - limited verification"),
+    "insufficient data": ("data_quality", "Insufficient data for verification"),
+    "suspicious": ("suspicious_activity", "Suspicious activity indicators"),
+}
+_SEVERITY_RANK = {"low": 0, "medium": 1, "high": 2}
+_SEVERITY_LABELS = {"low": "LOW", "medium": "MEDIUM", "high": "HIGH"}
+_COMPLIANCE_MATCHER = KeywordMatcher({keyword: category for keyword, (category, _) in _COMPLIANCE_KEYWORDS.items()})
+
+
+@dataclass(frozen=True, slots=True)
+class Flag:
+    """Compliance flag or alert"""
+    category: str
+    severity: str
+    message: str
+    risk_level: Optional[str] = None
+    source: Optional[str] = None
+    details: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary, omitting unset fields"""
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
 
 class FlagGenerator:
     """Generates compliance flags and alerts"""
     
     def __init__(self, config: Optional[AIConfig] = None, risk_classifier: Optional[RiskClassifier] = None):
         """Initialize flag generator"""
-        self.config = config or AIConfig()
+        self.config = config or get_ai_config()
         self.risk_classifier = risk_classifier or RiskClassifier(config)
         logger.info("FlagGenerator initialized")
     
@@ -28,7 +56,7 @@ class FlagGenerator:
         sanctions_info: Optional[str] = None,
         risk_assessment: Optional[Dict[str, Any]] = None,
         additional_context: Optional[Dict[str, Any]] = None
-    ) -> List[Dict[str, Any]]:
+    ) -> List[Flag]:
         """
         Generate flags and alerts
         
@@ -41,9 +69,11 @@ class FlagGenerator:
             additional_context: Optional additional context
         
         Returns:
-            List of flag dictionaries
+            List of flags
         """
         flags = []
+        evidence_text = self.config.truncate_text(evidence_text)
+        sanctions_info = self.config.truncate_text(sanctions_info)
         
         try:
             # Get risk assessment if not provided
@@ -76,18 +106,79 @@ class FlagGenerator:
             )
             flags.extend(data_quality_flags)
             
-            logger.info(f"Generated {len(flags)} flags for {company_name}")
+            flags = self._merge_flags(flags)
+            
+            logger.info("Generated flags", company=company_name, count=len(flags))
             return flags
         
         except Exception as e:
-            logger.error(f"Error generating flags", error=str(e))
-            return [{
-                "category": "system_error",
-                "severity": "medium",
-                "message": f"Error in flag generation: {str(e)}"
-            }]
+            logger.error("Error generating flags", error=str(e))
+            return [Flag(
+                category="system_error",
+                severity="medium",
+                message=f"Error in flag generation: {str(e)}"
+            )]
+    
+    def generate_flags_batch(
+        self,
+        cases: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = None
+    ) -> List[List[Flag]]:
+        """
+        Generate flags for many companies
+        
+        Risk assessments missing from the cases are fetched in one
+        concurrent batch instead of one LLM round-trip per company.
+        
+        Args:
+            cases: List of generate_flags keyword arguments
+            max_concurrency: Maximum in-flight LLM calls (defaults to config)
+        
+        Returns:
+            List of flag lists in the same order as cases
+        """
+        pending = [i for i, case in enumerate(cases) if not case.get("risk_assessment")]
+        
+        assessments = self.risk_classifier.assess_risk_batch(
+            [
+                {
+                    "company_name": cases[i]["company_name"],
+                    "country": cases[i]["country"],
+                    "evidence_text": cases[i]["evidence_text"],
+                    "sanctions_info": cases[i].get("sanctions_info"),
+                    "additional_context": cases[i].get("additional_context")
+                }
+                for i in pending
+            ],
+            max_concurrency=max_concurrency
+        )
+        risk_by_index = dict(zip(pending, assessments))
+        
+        return [
+            self.generate_flags(**{**case, "risk_assessment": risk_by_index.get(i, case.get("risk_assessment"))})
+            for i, case in enumerate(cases)
+        ]
+    
+    @staticmethod
+    def _merge_flags(flags: List[Flag]) -> List[Flag]:
+        """
+        Drop duplicate flags
+        
+        Flags with the same category and message are merged, keeping the
+        first one's position and the highest severity seen.
+        """
+        merged: Dict[tuple, Flag] = {}
+        for flag in flags:
+            key = (flag.category, flag.message)
+            existing = merged.get(key)
+            if existing is None:
+                merged[key] = flag
+            elif _SEVERITY_RANK.get(flag.severity, 1) > _SEVERITY_RANK.get(existing.severity, 1):
+                merged[key] = replace(existing, severity=flag.severity)
+        
+        return list(merged.values())
     
-    def _generate_risk_flags(self, risk_assessment: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _generate_risk_flags(self, risk_assessment: Dict[str, Any]) -> List[Flag]:
         """Generate flags based on risk assessment"""
         flags = []
         
@@ -95,21 +186,21 @@ class FlagGenerator:
         risk_level = risk_assessment.get("risk_level", "Low")
         
         if risk_score >= self.config.risk_threshold_high:
-            flags.append({
-                "category": "high_risk",
-                "severity": "high",
-                "message": f"High risk identified (score: {risk_score:.2f})",
-                "risk_level": risk_level
-            })
+            flags.append(Flag(
+                category="high_risk",
+                severity="high",
+                message=f"High risk identified (score: {risk_score:.2f})",
+                risk_level=risk_level
+            ))
         
         assessment_flags = risk_assessment.get("flags", [])
         for flag_text in assessment_flags:
-            flags.append({
-                "category": "risk_indicator",
-                "severity": "medium" if risk_score < 0.7 else "high",
-                "message": str(flag_text),
-                "source": "risk_assessment"
-            })
+            flags.append(Flag(
+                category="risk_indicator",
+                severity="medium" if risk_score < 0.7 else "high",
+                message=str(flag_text),
+                source="risk_assessment"
+            ))
         
         return flags
     
@@ -119,7 +210,7 @@ class FlagGenerator:
         country: str,
         evidence_text: str,
         sanctions_info: Optional[str] = None
-    ) -> List[Dict[str, Any]]:
+    ) -> List[Flag]:
         """Generate compliance-related flags"""
         flags = []
         
@@ -127,29 +218,24 @@ class FlagGenerator:
         
         # Check for sanctions
         if sanctions_info:
-            if "sanctions" in sanctions_info.lower() or "prohibited" in sanctions_info.lower():
-                flags.append({
-                    "category": "sanctions_match",
-                    "severity": "high",
-                    "message": "Potential sanctions match detected",
-                    "details": sanctions_info[:200]
-                })
+            sanctions_lower = sanctions_info.lower()
+            if "sanctions" in sanctions_lower or "prohibited" in sanctions_lower:
+                flags.append(Flag(
+                    category="sanctions_match",
+                    severity="high",
+                    message="Potential sanctions match detected",
+                    details=sanctions_info[:200]
+                ))
         
         # Check for common compliance concerns
-        compliance_keywords = {
-            "unregistered": ("compliance_issue", "Company may be unregistered"),
-            "no website": ("data_quality", "No website found - limited verification"),
-            "insufficient data": ("data_quality", "Insufficient data for verification"),
-            "suspicious": ("suspicious_activity", "Suspicious activity indicators"),
-        }
-        
-        for keyword, (category, message) in compliance_keywords.items():
-            if keyword in evidence_lower:
-                flags.append({
-                    "category": category,
-                    "severity": "medium",
-                    "message": message
-                })
+        found = _COMPLIANCE_MATCHER.find(evidence_lower)
+        for keyword, (category, message) in _COMPLIANCE_KEYWORDS.items():
+            if keyword in found:
+                flags.append(Flag(
+                    category=category,
+                    severity="medium",
+                    message=message
+                ))
         
         return flags
     
@@ -157,46 +243,42 @@ class FlagGenerator:
         self,
         evidence_text: str,
         additional_context: Optional[Dict[str, Any]] = None
-    ) -> List[Dict[str, Any]]:
+    ) -> List[Flag]:
         """Generate data quality flags"""
         flags = []
         
         # Check text length
         if not evidence_text or len(evidence_text.strip()) < 100:
-            flags.append({
-                "category": "data_quality",
-                "severity": "low",
-                "message": "Limited evidence available - low data quality"
-            })
+            flags.append(Flag(
+                category="data_quality",
+                severity="low",
+                message="Limited evidence available - low data quality"
+            ))
         
         # Check source reliability
         if additional_context:
             sources = additional_context.get("sources", [])
             if not sources or len(sources) < 2:
-                flags.append({
-                    "category": "source_reliability",
-                    "severity": "medium",
-                    "message": "Limited number of data sources"
-                })
+                flags.append(Flag(
+                    category="source_reliability",
+                    severity="medium",
+                    message="Limited number of data sources"
+                ))
         
         return flags
     
-    def format_flags_for_storage(self, flags: List[Dict[str, Any]]) -> List[str]:
+    def format_flags_for_storage(self, flags: List[Flag]) -> List[str]:
         """
         Format flags for storage in database
         
         Args:
-            flags: List of flag dictionaries
+            flags: List of flags
         
         Returns:
             List of formatted flag strings
         """
-        formatted = []
-        for flag in flags:
-            category = flag.get("category", "unknown")
-            severity = flag.get("severity", "medium")
-            message = flag.get("message", "")
-            formatted.append(f"[{severity.upper()}] {category}: {message}")
-        
-        return formatted
+        return [
+            f"[{_SEVERITY_LABELS.get(flag.severity) or flag.severity.upper()}] {flag.category}: {flag.message}"
+            for flag in flags
+        ]
 
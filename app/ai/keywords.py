@@ -0,0 +1,106 @@
+"""
+Keyword Matching Module
+Precompiled multi-keyword matching for the rule-based fallbacks
+"""
+
+from collections import Counter
+from typing import Dict, FrozenSet, Iterable, Union
+
+try:
+    import ahocorasick  # Optional: pip install pyahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+class KeywordMatcher:
+    """Finds which of a fixed set of labelled keywords occur in a text"""
+    
+    def __init__(self, keywords: Dict[str, Union[str, Iterable[str]]]):
+        """
+        Initialize keyword matcher
+        
+        Args:
+            keywords: Mapping of lowercase keyword to its label (or labels)
+        """
+        self.keywords = {
+            keyword: (labels,) if isinstance(labels, str) else tuple(labels)
+            for keyword, labels in keywords.items()
+        }
+        self.labels = frozenset(label for labels in self.keywords.values() for label in labels)
+        self._automaton = None
+        
+        if ahocorasick is not None:
+            # Single Aho-Corasick automaton: one pass over the text for all keywords
+            automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                automaton.add_word(keyword, keyword)
+            automaton.make_automaton()
+            self._automaton = automaton
+    
+    @classmethod
+    def from_groups(cls, groups: Dict[str, Iterable[str]]) -> "KeywordMatcher":
+        """
+        Build a matcher from keyword groups
+        
+        Args:
+            groups: Mapping of label to its lowercase keywords (a keyword may
+                appear in several groups)
+        """
+        keywords: Dict[str, list] = {}
+        for label, group in groups.items():
+            for keyword in group:
+                keywords.setdefault(keyword, []).append(label)
+        return cls(keywords)
+    
+    def find(self, text_lower: str) -> FrozenSet[str]:
+        """
+        Find keywords present in text
+        
+        Args:
+            text_lower: Lowercased text to scan
+        
+        Returns:
+            Set of matched keywords
+        """
+        if self._automaton is not None:
+            return frozenset(keyword for _, keyword in self._automaton.iter(text_lower))
+        return frozenset(keyword for keyword in self.keywords if keyword in text_lower)
+    
+    def count_labels(self, text_lower: str) -> Dict[str, int]:
+        """
+        Count distinct matched keywords per label
+        
+        Args:
+            text_lower: Lowercased text to scan
+        
+        Returns:
+            Dictionary of label to number of distinct keywords found
+        """
+        return Counter(label for keyword in self.find(text_lower) for label in self.keywords[keyword])
+    
+    def find_labels(self, text_lower: str) -> FrozenSet[str]:
+        """
+        Find labels with at least one keyword present in text
+        
+        Stops scanning as soon as every label has been found.
+        
+        Args:
+            text_lower: Lowercased text to scan
+        
+        Returns:
+            Set of matched labels
+        """
+        found = set()
+        if self._automaton is not None:
+            for _, keyword in self._automaton.iter(text_lower):
+                found.update(self.keywords[keyword])
+                if len(found) == len(self.labels):
+                    break
+            return frozenset(found)
+        
+        for keyword, labels in self.keywords.items():
+            if not found.issuperset(labels) and keyword in text_lower:
+                found.update(labels)
+                if len(found) == len(self.labels):
+                    break
+        return frozenset(found)
@@ -3,33 +3,183 @@ LLM Client Module
 Handles integration with OpenAI and Ollama
 """
 
-from typing import Dict, Optional, Any
-import openai
+import asyncio
+import threading
+from typing import AsyncIterator, Dict, Optional, Any, Tuple
+import httpx
+
+try:
+    from orjson import loads as json_loads  # Optional: pip install orjson
+except ImportError:
+    from json import loads as json_loads
+
 from app.core.logging import get_logger
-from app.ai.config import AIConfig
+from app.ai.config import AIConfig, get_ai_config
+from app.ai.batcher import Batcher
+from app.ai.cache import ResponseCache, get_response_cache
+from app.ai.prompts import PromptTemplates, ResponseParser
 
 logger = get_logger(__name__)
 
+# Prefix warmup runs once per process, not once per client
+_warmup_started = False
+_warmup_lock = threading.Lock()
+
 
 class LLMClient:
     """Client for interacting with OpenAI or Ollama"""
     
     def __init__(self, config: Optional[AIConfig] = None):
         """Initialize LLM client"""
-        self.config = config or AIConfig()
+        self.config = config or get_ai_config()
+        self.cache = get_response_cache(self.config)
+        self._http = self._create_http_client()
+        self._openai_client = None  # openai.OpenAI, imported lazily
+        self._async_http: Optional[httpx.AsyncClient] = None
+        self._async_openai_client = None  # openai.AsyncOpenAI, created on first async call
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None  # Loop the async clients belong to
+        self._batcher = Batcher(
+            self._dispatch_async,
+            max_batch=self.config.llm_batch_concurrency,
+            max_wait_ms=self.config.llm_batch_window_ms
+        )
         
         if self.config.llm_provider == "openai":
-            openai.api_key = self.config.openai_api_key
-            logger.info(f"LLMClient initialized with OpenAI model: {self.config.llm_model}")
+            logger.info("LLMClient initialized", provider="openai", model=self.config.llm_model)
         else:
-            logger.info(f"LLMClient initialized with Ollama model: {self.config.llm_model}")
+            logger.info("LLMClient initialized", provider="ollama", model=self.config.ollama_model)
+        
+        if self.config.llm_warmup_prefixes:
+            self._start_prefix_warmup()
+    
+    def _start_prefix_warmup(self):
+        """Warm the provider prefix cache in the background (once per process)"""
+        global _warmup_started
+        with _warmup_lock:
+            if _warmup_started:
+                return
+            _warmup_started = True
+        
+        threading.Thread(target=self._warmup_prefixes, name="llm-prefix-warmup", daemon=True).start()
+    
+    def _warmup_prefixes(self):
+        """Send a 1-token request per task system prompt so real calls hit a cached prefix"""
+        generate = self._generate_openai if self.config.llm_provider == "openai" else self._generate_ollama
+        
+        # Bypasses the response cache: the warmup completions themselves are throwaway
+        for system_prompt in (PromptTemplates.ACTIVITY_SYSTEM_PROMPT, PromptTemplates.RISK_SYSTEM_PROMPT):
+            response = generate(prompt=".", system_prompt=system_prompt, max_tokens=1)
+            if response.get("error"):
+                logger.debug("LLM prefix warmup skipped", error=response.get("error"))
+                return
+        
+        logger.debug("LLM prefix warmup complete")
+    
+    def _http_client_options(self) -> Dict[str, Any]:
+        """Connection pool options shared by the sync and async HTTP clients"""
+        options = {
+            "timeout": self.config.llm_http_timeout,
+            "limits": httpx.Limits(
+                max_connections=self.config.llm_http_max_connections,
+                max_keepalive_connections=self.config.llm_http_max_connections
+            )
+        }
+        if self.config.llm_provider != "openai":
+            options["base_url"] = self.config.ollama_base_url
+        return options
+    
+    def _create_http_client(self) -> httpx.Client:
+        """Create pooled keep-alive HTTP client (HTTP/2 when h2 is installed)"""
+        options = self._http_client_options()
+        try:
+            return httpx.Client(http2=True, **options)
+        except ImportError:
+            logger.debug("h2 not installed, using HTTP/1.1 connection pool")
+            return httpx.Client(**options)
+    
+    def _check_async_loop(self):
+        """
+        Drop async clients created on another event loop
+        
+        Their pooled connections belong to that loop (e.g. an earlier
+        asyncio.run call) and can't be used or closed from this one.
+        """
+        loop = asyncio.get_running_loop()
+        if loop is not self._async_loop:
+            if self._async_loop is not None:
+                logger.debug("Event loop changed, recreating async LLM clients")
+            self._async_loop = loop
+            self._async_http = None
+            self._async_openai_client = None
+    
+    @property
+    def async_http(self) -> httpx.AsyncClient:
+        """Pooled async HTTP client for the running event loop (created on first use)"""
+        self._check_async_loop()
+        if self._async_http is None:
+            options = self._http_client_options()
+            try:
+                self._async_http = httpx.AsyncClient(http2=True, **options)
+            except ImportError:
+                self._async_http = httpx.AsyncClient(**options)
+        return self._async_http
+    
+    @property
+    def openai_client(self) -> Any:
+        """OpenAI client bound to the shared connection pool (created on first use)"""
+        if self._openai_client is None:
+            import openai  # Deferred: the SDK is slow to import and unused by Ollama
+            
+            self._openai_client = openai.OpenAI(
+                api_key=self.config.openai_api_key,
+                http_client=self._http
+            )
+        return self._openai_client
+    
+    @property
+    def async_openai_client(self) -> Any:
+        """Async OpenAI client bound to the async connection pool (created on first use)"""
+        self._check_async_loop()
+        if self._async_openai_client is None:
+            import openai
+            
+            self._async_openai_client = openai.AsyncOpenAI(
+                api_key=self.config.openai_api_key,
+                http_client=self.async_http
+            )
+        return self._async_openai_client
+    
+    def close(self):
+        """Close pooled HTTP connections"""
+        self._http.close()
+    
+    async def aclose(self):
+        """Close pooled HTTP connections, including the async pool"""
+        self._http.close()
+        if self._async_http is not None and self._async_loop is asyncio.get_running_loop():
+            await self._async_http.aclose()
+            self._async_http = None
+            self._async_openai_client = None
+    
+    def __enter__(self) -> "LLMClient":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    async def __aenter__(self) -> "LLMClient":
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
     
     def generate_response(
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
         temperature: Optional[float] = None,
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        stop_on_json: bool = False
     ) -> Dict[str, Any]:
         """
         Generate response from LLM (OpenAI or Ollama)
@@ -39,37 +189,214 @@ class LLMClient:
             system_prompt: Optional system prompt
             temperature: Temperature for generation (defaults to config)
             max_tokens: Max tokens for response (defaults to config)
+            stop_on_json: Stop a streamed Ollama completion once it holds a
+                complete JSON object (only for prompts whose answer is that object)
         
         Returns:
             Dictionary with 'content' and 'metadata'
         """
         try:
+            cache_keys = self._cache_keys(prompt, system_prompt, temperature, max_tokens, stop_on_json)
+            cached = self._get_cached(cache_keys, prompt)
+            if cached is not None:
+                return cached
+            
             if self.config.llm_provider == "openai":
-                return self._generate_openai(
+                response = self._generate_openai(
                     prompt=prompt,
                     system_prompt=system_prompt,
                     temperature=temperature,
                     max_tokens=max_tokens
                 )
             else:
-                return self._generate_ollama(
+                response = self._generate_ollama(
                     prompt=prompt,
                     system_prompt=system_prompt,
                     temperature=temperature,
-                    max_tokens=max_tokens
+                    max_tokens=max_tokens,
+                    stop_on_json=stop_on_json
                 )
+            
+            self._set_cached(cache_keys, prompt, response)
+            return response
         
         except Exception as e:
-            logger.error(f"Error generating LLM response", error=str(e))
-            return {
-                "content": None,
-                "error": str(e),
-                "metadata": {
-                    "provider": self.config.llm_provider,
-                    "model": self.config.llm_model
-                }
-            }
+            logger.error("Error generating LLM response", error=str(e))
+            return self._error_response(e)
+    
+    async def generate_response_async(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        stop_on_json: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Generate response from LLM without blocking the event loop
+        
+        Same contract (and response cache) as generate_response.
+        
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            temperature: Temperature for generation (defaults to config)
+            max_tokens: Max tokens for response (defaults to config)
+            stop_on_json: Stop a streamed Ollama completion at its first JSON object
+        
+        Returns:
+            Dictionary with 'content' and 'metadata'
+        """
+        try:
+            cache_keys = self._cache_keys(prompt, system_prompt, temperature, max_tokens, stop_on_json)
+            cached = self._get_cached(cache_keys, prompt)
+            if cached is not None:
+                return cached
+            
+            # Concurrent calls (across analyses) are coalesced into micro-batches
+            response = await self._batcher.submit(
+                prompt=prompt,
+                system_prompt=system_prompt,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stop_on_json=stop_on_json
+            )
             
+            self._set_cached(cache_keys, prompt, response)
+            return response
+        
+        except Exception as e:
+            logger.error("Error generating LLM response", error=str(e))
+            return self._error_response(e)
+    
+    async def _dispatch_async(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        stop_on_json: bool = False
+    ) -> Dict[str, Any]:
+        """Send one uncached request to the configured provider"""
+        if self.config.llm_provider == "openai":
+            return await self._generate_openai_async(
+                prompt=prompt,
+                system_prompt=system_prompt,
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+        return await self._generate_ollama_async(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stop_on_json=stop_on_json
+        )
+    
+    async def stream_response(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream response text from LLM as it is generated
+        
+        Bypasses the response cache; errors propagate to the consumer.
+        
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            temperature: Temperature for generation (defaults to config)
+            max_tokens: Max tokens for response (defaults to config)
+        
+        Yields:
+            Text chunks in generation order
+        """
+        if self.config.llm_provider == "openai":
+            stream = await self.async_openai_client.chat.completions.create(
+                stream=True,
+                **self._openai_request(prompt, system_prompt, temperature, max_tokens)
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+            return
+        
+        payload = self._ollama_payload(prompt, system_prompt, temperature, max_tokens)
+        payload["stream"] = True
+        
+        async with self.async_http.stream("POST", "/api/generate", json=payload) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                chunk = json_loads(line)
+                if chunk.get("response"):
+                    yield chunk["response"]
+                if chunk.get("done"):
+                    break
+    
+    def _error_response(self, error: Exception) -> Dict[str, Any]:
+        """Build the error response returned when generation fails"""
+        return {
+            "content": None,
+            "error": str(error),
+            "metadata": {
+                "provider": self.config.llm_provider,
+                "model": self.config.llm_model
+            }
+        }
+    
+    def _cache_keys(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        stop_on_json: bool = False
+    ) -> Optional[Tuple[str, str]]:
+        """Return (namespace, key) for a cacheable call, or None if it must not be cached"""
+        effective_temperature = temperature or self.config.active_temperature
+        if not self.config.llm_cache_enabled or effective_temperature > self.config.llm_cache_max_temperature:
+            return None
+        
+        # Keyed on what the active provider actually runs (OpenAI or Ollama settings)
+        namespace = ResponseCache.make_key(
+            self.config.llm_provider,
+            self.config.active_model,
+            system_prompt or "",
+            effective_temperature,
+            max_tokens or self.config.active_max_tokens,
+            stop_on_json
+        )
+        return namespace, ResponseCache.make_key(namespace, prompt)
+    
+    def _get_cached(self, cache_keys: Optional[Tuple[str, str]], prompt: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached response (returned as a copy marked cached)"""
+        if cache_keys is None:
+            return None
+        
+        namespace, key = cache_keys
+        cached = self.cache.get(key, namespace=namespace, text=prompt)
+        if cached is None:
+            return None
+        
+        logger.debug("LLM response cache hit", model=self.config.active_model)
+        return {
+            **cached,
+            "metadata": {**cached.get("metadata", {}), "cached": True}
+        }
+    
+    def _set_cached(self, cache_keys: Optional[Tuple[str, str]], prompt: str, response: Dict[str, Any]):
+        """Store a successful response in the cache"""
+        if cache_keys is None or not response.get("content") or response.get("error"):
+            return
+        
+        namespace, key = cache_keys
+        self.cache.set(key, dict(response), namespace=namespace, text=prompt)
+    
     def _generate_openai(
         self,
         prompt: str,
@@ -79,119 +406,264 @@ class LLMClient:
     ) -> Dict[str, Any]:
         """Generate response using OpenAI"""
         try:
-            messages = []
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
-            messages.append({"role": "user", "content": prompt})
-            
-            response = openai.chat.completions.create(
-                model=self.config.llm_model,
-                messages=messages,
-                temperature=temperature or self.config.llm_temperature,
-                max_tokens=max_tokens or self.config.llm_max_tokens
+            response = self.openai_client.chat.completions.create(
+                **self._openai_request(prompt, system_prompt, temperature, max_tokens)
             )
+            return self._openai_result(response)
             
-            content = response.choices[0].message.content
-            
+        except Exception as e:
+            logger.error("OpenAI API error", error=str(e))
             return {
-                "content": content,
-                "metadata": {
-                    "provider": "openai",
-                    "model": self.config.llm_model,
-                    "tokens_used": response.usage.total_tokens,
-                    "prompt_tokens": response.usage.prompt_tokens,
-                    "completion_tokens": response.usage.completion_tokens
-                }
+                "content": None,
+                "error": str(e),
+                "metadata": {"provider": "openai", "model": self.config.llm_model}
             }
+    
+    async def _generate_openai_async(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Generate response using OpenAI's async client"""
+        try:
+            response = await self.async_openai_client.chat.completions.create(
+                **self._openai_request(prompt, system_prompt, temperature, max_tokens)
+            )
+            return self._openai_result(response)
             
         except Exception as e:
-            logger.error(f"OpenAI API error", error=str(e))
+            logger.error("OpenAI API error", error=str(e))
             return {
                 "content": None,
                 "error": str(e),
                 "metadata": {"provider": "openai", "model": self.config.llm_model}
             }
     
+    def _openai_request(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int]
+    ) -> Dict[str, Any]:
+        """Build chat completion request arguments"""
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        
+        return {
+            "model": self.config.llm_model,
+            "messages": messages,
+            "temperature": temperature or self.config.llm_temperature,
+            "max_tokens": max_tokens or self.config.llm_max_tokens
+        }
+    
+    def _openai_result(self, response: Any) -> Dict[str, Any]:
+        """Convert a chat completion into the response dictionary"""
+        return {
+            "content": response.choices[0].message.content,
+            "metadata": {
+                "provider": "openai",
+                "model": self.config.llm_model,
+                "tokens_used": response.usage.total_tokens,
+                "prompt_tokens": response.usage.prompt_tokens,
+                "completion_tokens": response.usage.completion_tokens
+            }
+        }
+    
     def _generate_ollama(
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
         temperature: Optional[float] = None,
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        stop_on_json: bool = False
     ) -> Dict[str, Any]:
         """Generate response using Ollama (local LLM)"""
         try:
-            import requests
-            
-            base_url = self.config.ollama_base_url
-            model = self.config.ollama_model
-            
-            # Combine system prompt and user prompt
-            full_prompt = prompt
-            if system_prompt:
-                full_prompt = f"{system_prompt}\n\n{prompt}"
-            
-            # Ollama API endpoint
-            url = f"{base_url}/api/generate"
-            
-            payload = {
-                "model": model,
-                "prompt": full_prompt,
-                "stream": False,
-                "options": {
-                    "temperature": temperature or self.config.ollama_temperature,
-                    "num_predict": max_tokens or self.config.ollama_max_tokens
-                }
-            }
-            
-            logger.debug(f"Calling Ollama API: {url} with model {model}")
-            
-            response = requests.post(url, json=payload, timeout=60)
-            response.raise_for_status()
-            
-            result = response.json()
-            content = result.get("response", "")
+            payload = self._ollama_payload(prompt, system_prompt, temperature, max_tokens)
             
-            # Calculate tokens (Ollama provides this)
-            tokens_used = result.get("eval_count", 0) + result.get("prompt_eval_count", 0)
-            
-            logger.debug(
-                f"Ollama response generated",
-                model=model,
-                tokens_used=tokens_used
-            )
+            # Ollama API endpoint (relative to the pooled client's base_url)
+            if self.config.ollama_stream:
+                result, content = self._stream_ollama(payload, stop_on_json)
+            else:
+                response = self._http.post("/api/generate", json=payload)
+                response.raise_for_status()
+                result = json_loads(response.content)
+                content = result.get("response", "")
             
-            return {
-                "content": content,
-                "metadata": {
-                    "provider": "ollama",
-                    "model": model,
-                    "tokens_used": tokens_used,
-                    "prompt_tokens": result.get("prompt_eval_count", 0),
-                    "completion_tokens": result.get("eval_count", 0),
-                    "total_duration": result.get("total_duration", 0),
-                    "load_duration": result.get("load_duration", 0)
-                }
-            }
+            return self._ollama_result(result, content)
         
-        except ImportError:
-            logger.error("requests library not installed. Install with: pip install requests")
-            return {
-                "content": None,
-                "error": "requests library not installed",
-                "metadata": {"provider": "ollama"}
-            }
-        except requests.exceptions.ConnectionError:
-            logger.error("Cannot connect to Ollama. Make sure Ollama is running.")
+        except httpx.ConnectError:
+            return self._ollama_connect_error()
+        except Exception as e:
+            logger.error("Ollama API error", error=str(e))
             return {
                 "content": None,
-                "error": "Cannot connect to Ollama. Make sure Ollama is running on localhost:11434",
+                "error": str(e),
                 "metadata": {"provider": "ollama"}
             }
+    
+    async def _generate_ollama_async(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        stop_on_json: bool = False
+    ) -> Dict[str, Any]:
+        """Generate response using Ollama over the async connection pool"""
+        try:
+            payload = self._ollama_payload(prompt, system_prompt, temperature, max_tokens)
+            
+            if self.config.ollama_stream:
+                result, content = await self._stream_ollama_async(payload, stop_on_json)
+            else:
+                response = await self.async_http.post("/api/generate", json=payload)
+                response.raise_for_status()
+                result = json_loads(response.content)
+                content = result.get("response", "")
+            
+            return self._ollama_result(result, content)
+        
+        except httpx.ConnectError:
+            return self._ollama_connect_error()
         except Exception as e:
-            logger.error(f"Ollama API error", error=str(e))
+            logger.error("Ollama API error", error=str(e))
             return {
                 "content": None,
                 "error": str(e),
                 "metadata": {"provider": "ollama"}
             }
+    
+    def _ollama_payload(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int]
+    ) -> Dict[str, Any]:
+        """Build Ollama /api/generate payload"""
+        model = self.config.ollama_model
+        
+        # Combine system prompt and user prompt
+        full_prompt = prompt
+        if system_prompt:
+            full_prompt = f"{system_prompt}\n\n{prompt}"
+        
+        logger.debug("Calling Ollama API", base_url=self.config.ollama_base_url, model=model)
+        
+        return {
+            "model": model,
+            "prompt": full_prompt,
+            "stream": self.config.ollama_stream,
+            "options": {
+                "temperature": temperature or self.config.ollama_temperature,
+                "num_predict": max_tokens or self.config.ollama_max_tokens
+            }
+        }
+    
+    def _ollama_result(self, result: Dict[str, Any], content: str) -> Dict[str, Any]:
+        """Convert an Ollama status chunk and content into the response dictionary"""
+        model = self.config.ollama_model
+        
+        # Calculate tokens (Ollama provides this)
+        tokens_used = result.get("eval_count", 0) + result.get("prompt_eval_count", 0)
+        
+        logger.debug(
+            "Ollama response generated",
+            model=model,
+            tokens_used=tokens_used
+        )
+        
+        return {
+            "content": content,
+            "metadata": {
+                "provider": "ollama",
+                "model": model,
+                "tokens_used": tokens_used,
+                "prompt_tokens": result.get("prompt_eval_count", 0),
+                "completion_tokens": result.get("eval_count", 0),
+                "total_duration": result.get("total_duration", 0),
+                "load_duration": result.get("load_duration", 0),
+                "early_stop": result.get("early_stop", False)
+            }
+        }
+    
+    @staticmethod
+    def _ollama_connect_error() -> Dict[str, Any]:
+        """Error response for an unreachable Ollama server"""
+        logger.error("Cannot connect to Ollama. Make sure Ollama is running.")
+        return {
+            "content": None,
+            "error": "Cannot connect to Ollama. Make sure Ollama is running on localhost:11434",
+            "metadata": {"provider": "ollama"}
+        }
+    
+    def _stream_ollama(self, payload: Dict[str, Any], stop_on_json: bool = False) -> Tuple[Dict[str, Any], str]:
+        """
+        Stream an Ollama completion
+        
+        With stop_on_json, generation is cut short once the accumulated text
+        holds a complete JSON object, which is all ResponseParser extracts
+        from a JSON-answer completion.
+        
+        Args:
+            payload: Ollama /api/generate payload with stream enabled
+            stop_on_json: Stop at the first complete JSON object
+        
+        Returns:
+            Tuple of (last status chunk, accumulated content)
+        """
+        chunks = []
+        result: Dict[str, Any] = {}
+        
+        with self._http.stream("POST", "/api/generate", json=payload) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line and self._consume_stream_line(line, chunks, result, stop_on_json):
+                    break
+        
+        return result, "".join(chunks)
+    
+    async def _stream_ollama_async(self, payload: Dict[str, Any], stop_on_json: bool = False) -> Tuple[Dict[str, Any], str]:
+        """Async counterpart of _stream_ollama"""
+        chunks = []
+        result: Dict[str, Any] = {}
+        
+        async with self.async_http.stream("POST", "/api/generate", json=payload) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line and self._consume_stream_line(line, chunks, result, stop_on_json):
+                    break
+        
+        return result, "".join(chunks)
+    
+    @staticmethod
+    def _consume_stream_line(line: str, chunks: list, result: Dict[str, Any], stop_on_json: bool) -> bool:
+        """
+        Apply one NDJSON stream line
+        
+        Appends the text piece to chunks and updates result with the chunk's
+        status fields.
+        
+        Returns:
+            True when the stream should stop (done, or with stop_on_json a
+            complete JSON object arrived)
+        """
+        result.update(json_loads(line))
+        piece = result.get("response", "")
+        chunks.append(piece)
+        if result.get("done"):
+            return True
+        
+        if stop_on_json and "}" in piece:
+            if ResponseParser.extract_json("".join(chunks), partial=True) is not None:
+                # Leaving the stream closes the connection, which cancels generation
+                result["early_stop"] = True
+                return True
+        
+        return False
@@ -3,41 +3,132 @@ AI Orchestrator Module
 Main orchestrator that coordinates all AI/ML components for UC1
 """
 
-from typing import Dict, List, Optional, Any
+import asyncio
+import copy
+import hashlib
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields, replace
+from functools import cached_property
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Any, Tuple
+
+try:
+    import orjson  # Optional: pip install orjson
+except ImportError:
+    orjson = None
+
 from app.core.logging import get_logger
-from app.ai.config import AIConfig
+from app.ai.config import AIConfig, get_ai_config
 from app.ai.llm_client import LLMClient
+from app.ai.cache import ResponseCache
 from app.ai.text_processor import TextProcessor
 from app.ai.classifier import ActivityClassifier, RiskClassifier
-from app.ai.flag_generator import FlagGenerator
+from app.ai.flag_generator import Flag, FlagGenerator
 from app.ai.prompts import PromptTemplates, ResponseParser
 
 logger = get_logger(__name__)
 
+# Collection times, set anew on every fetch; left out of the result cache key
+_VOLATILE_KEYS = frozenset({"timestamp", "checked_at", "collected_at"})
+
+
+def _without_volatile_keys(value: Any) -> Any:
+    """Copy of nested dicts/lists with collection-time keys removed"""
+    if isinstance(value, dict):
+        return {
+            key: _without_volatile_keys(item)
+            for key, item in value.items()
+            if key not in _VOLATILE_KEYS
+        }
+    if isinstance(value, (list, tuple)):
+        return [_without_volatile_keys(item) for item in value]
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class AnalysisResult:
+    """Complete UC1 analysis output"""
+    ai_response: str
+    activity_level: str
+    flags: List[Any]
+    confidence_score: str
+    is_red_flag: bool
+    risk_score: Optional[float] = None
+    risk_level: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary, omitting unset fields"""
+        return {
+            field.name: getattr(self, field.name)
+            for field in fields(self)
+            if getattr(self, field.name) is not None
+        }
+
 
 class AIOrchestrator:
     """Orchestrates AI/ML analysis for LOB verification"""
     
     def __init__(self, config: Optional[AIConfig] = None):
         """Initialize AI orchestrator"""
-        self.config = config or AIConfig()
+        self.config = config or get_ai_config()
+        
+        # Main AI responses, keyed by company/evidence (semantic lookup when enabled)
+        self.ai_response_cache = ResponseCache(
+            maxsize=self.config.llm_cache_maxsize,
+            ttl=self.config.ai_response_cache_ttl,
+            semantic=self.config.llm_semantic_cache,
+            similarity_threshold=self.config.ai_response_semantic_threshold
+        )
         
-        # Initialize components
-        self.llm_client = LLMClient(self.config)
-        self.text_processor = TextProcessor(self.config)
-        self.activity_classifier = ActivityClassifier(self.config, self.llm_client)
-        self.risk_classifier = RiskClassifier(self.config, self.llm_client)
-        self.flag_generator = FlagGenerator(self.config, self.risk_classifier)
-        self.response_parser = ResponseParser()
+        # Complete results, keyed by a hash of the analysis inputs
+        self.result_cache = ResponseCache(
+            maxsize=self.config.analysis_cache_maxsize,
+            ttl=self.config.analysis_cache_ttl
+        )
         
         logger.info("AIOrchestrator initialized")
     
+    # Components are built lazily, so constructing the orchestrator stays cheap
+    @cached_property
+    def llm_client(self) -> LLMClient:
+        """LLM client (created on first use)"""
+        return LLMClient(self.config)
+    
+    @cached_property
+    def text_processor(self) -> TextProcessor:
+        """Text processor (created on first use)"""
+        return TextProcessor(self.config)
+    
+    @cached_property
+    def activity_classifier(self) -> ActivityClassifier:
+        """Activity classifier sharing llm_client (created on first use)"""
+        return ActivityClassifier(self.config, self.llm_client)
+    
+    @cached_property
+    def risk_classifier(self) -> RiskClassifier:
+        """Risk classifier sharing llm_client (created on first use)"""
+        return RiskClassifier(self.config, self.llm_client)
+    
+    @cached_property
+    def flag_generator(self) -> FlagGenerator:
+        """Flag generator sharing risk_classifier (created on first use)"""
+        return FlagGenerator(self.config, self.risk_classifier)
+    
+    @cached_property
+    def response_parser(self) -> ResponseParser:
+        """Response parser (created on first use)"""
+        return ResponseParser()
+    
     def analyze_lob(
         self,
         input_data: Dict[str, Any],
         collected_data: Dict[str, Any],
-        aggregated_data: Dict[str, Any]
-    ) -> Dict[str, Any]:
+        aggregated_data: Dict[str, Any],
+        force_refresh: bool = False
+    ) -> AnalysisResult:
         """
         Perform complete LOB analysis
         
@@ -45,139 +136,325 @@ class AIOrchestrator:
             input_data: Input data (company_name, country, role, product)
             collected_data: Collected data from sources
             aggregated_data: Aggregated and cleaned data
+            force_refresh: Re-run the analysis even if a cached result exists
         
         Returns:
             Complete analysis result with all UC1 outputs
         """
         try:
-            company_name = input_data.get("client", "")
-            country = input_data.get("client_country", "")
-            role = input_data.get("client_role", "")
-            product = input_data.get("product_name", "")
-            
-            logger.info(f"Starting LOB analysis for: {company_name} ({country})")
+            # Re-runs with identical inputs (retries, replays) skip every step
+            result_key = self._result_cache_key(input_data, collected_data, aggregated_data)
+            cached = None if force_refresh else self._get_cached_result(result_key)
+            if cached is not None:
+                return cached
             
-            # Step 1: Extract and prepare text from collected data
-            evidence_text = self._prepare_evidence_text(collected_data, aggregated_data)
+            analysis = self._prepare_analysis(input_data, collected_data, aggregated_data)
             
-            # Step 2: Extract features
-            features = self.text_processor.extract_features(evidence_text)
+            # Steps 3-5 (main AI response, activity, risk) only depend on the
+            # prepared evidence, so their LLM calls run concurrently
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                ai_future = executor.submit(self._generate_ai_response, **analysis["ai_request"])
+                activity_future = executor.submit(self.activity_classifier.classify, **analysis["activity_request"])
+                risk_future = executor.submit(self.risk_classifier.assess_risk, **analysis["risk_request"])
             
-            # Step 3: Generate main AI response
-            ai_response = self._generate_ai_response(
-                company_name=company_name,
-                country=country,
-                role=role,
-                product=product,
-                collected_data=collected_data,
-                evidence_text=evidence_text
-            )
-            
-            # Step 4: Classify activity level
-            activity_result = self.activity_classifier.classify(
-                company_name=company_name,
-                evidence_text=evidence_text,
-                additional_context={
-                    "features": features,
-                    "input_data": input_data
-                }
-            )
-            
-            # Step 5: Assess risk
-            sanctions_info = self._extract_sanctions_info(collected_data)
-            risk_result = self.risk_classifier.assess_risk(
-                company_name=company_name,
-                country=country,
-                evidence_text=evidence_text,
-                sanctions_info=sanctions_info,
-                additional_context={
-                    "features": features,
-                    "input_data": input_data
-                }
+            result = self._complete_analysis(
+                analysis,
+                ai_response=ai_future.result(),
+                activity_result=activity_future.result(),
+                risk_result=risk_future.result()
             )
+            return self._cache_result(result_key, result)
+        
+        except Exception as e:
+            logger.error("Error in LOB analysis", error=str(e))
+            return self._error_result(e)
+    
+    async def analyze_lob_async(
+        self,
+        input_data: Dict[str, Any],
+        collected_data: Dict[str, Any],
+        aggregated_data: Dict[str, Any],
+        force_refresh: bool = False
+    ) -> AnalysisResult:
+        """
+        Perform complete LOB analysis without blocking the event loop
+        
+        Args:
+            input_data: Input data (company_name, country, role, product)
+            collected_data: Collected data from sources
+            aggregated_data: Aggregated and cleaned data
+            force_refresh: Re-run the analysis even if a cached result exists
+        
+        Returns:
+            Complete analysis result with all UC1 outputs
+        """
+        try:
+            result_key = self._result_cache_key(input_data, collected_data, aggregated_data)
+            cached = None if force_refresh else self._get_cached_result(result_key)
+            if cached is not None:
+                return cached
             
-            # Step 6: Generate flags
-            flags = self.flag_generator.generate_flags(
-                company_name=company_name,
-                country=country,
-                evidence_text=evidence_text,
-                sanctions_info=sanctions_info,
-                risk_assessment=risk_result,
-                additional_context={
-                    "features": features,
-                    "input_data": input_data,
-                    "collected_data": collected_data
-                }
-            )
+            analysis = self._prepare_analysis(input_data, collected_data, aggregated_data)
             
-            # Step 7: Determine if red flag (needed for confidence calculation)
-            is_red_flag = self._determine_red_flag(risk_result, flags)
+            # Start the (longest) main generation streaming first; the
+            # classifier calls run while its chunks accumulate
+            main_task = asyncio.create_task(self._generate_ai_response_async(**analysis["ai_request"]))
+            try:
+                activity_result, risk_result = await asyncio.gather(
+                    self.activity_classifier.classify_async(**analysis["activity_request"]),
+                    self.risk_classifier.assess_risk_async(**analysis["risk_request"])
+                )
+            except BaseException:
+                main_task.cancel()
+                raise
+            ai_response = await main_task
             
-            # Step 8: Calculate confidence score (after determining red flag)
-            confidence_score = self._calculate_confidence_score(
-                features=features,
+            result = self._complete_analysis(
+                analysis,
+                ai_response=ai_response,
                 activity_result=activity_result,
-                risk_result=risk_result,
-                evidence_text=evidence_text,
-                flags=flags,
-                is_red_flag=is_red_flag
+                risk_result=risk_result
             )
-            
-            # Step 9: Format response
-            result = {
-                "ai_response": ai_response.get("content", "") or ai_response.get("analysis", ""),
-                "activity_level": activity_result.get("activity_level", "Unknown"),
-                "flags": self.flag_generator.format_flags_for_storage(flags),
-                "confidence_score": confidence_score,
-                "is_red_flag": is_red_flag,
-                "risk_score": risk_result.get("risk_score", 0.0),
-                "risk_level": risk_result.get("risk_level", "Medium"),
-                "metadata": {
-                    "features": features,
-                    "activity_reasoning": activity_result.get("reasoning", ""),
-                    "risk_reasoning": risk_result.get("reasoning", ""),
-                    "llm_metadata": ai_response.get("metadata", {})
-                }
-            }
-            
-            logger.info(
-                f"LOB analysis complete",
-                company=company_name,
-                activity_level=result["activity_level"],
-                risk_level=result["risk_level"],
-                flags_count=len(result["flags"]),
-                is_red_flag=is_red_flag
-            )
-            
-            return result
+            return self._cache_result(result_key, result)
         
         except Exception as e:
-            logger.error(f"Error in LOB analysis", error=str(e))
-            return {
-                "ai_response": f"Error in analysis: {str(e)}",
-                "activity_level": "Unknown",
-                "flags": [{"category": "system_error", "message": str(e)}],
-                "confidence_score": "Low",
-                "is_red_flag": False,
-                "error": str(e)
+            logger.error("Error in LOB analysis", error=str(e))
+            return self._error_result(e)
+    
+    def _result_cache_key(
+        self,
+        input_data: Dict[str, Any],
+        collected_data: Dict[str, Any],
+        aggregated_data: Dict[str, Any]
+    ) -> Optional[str]:
+        """
+        Content hash of the analysis inputs, or None when results aren't cached
+        
+        Collection timestamps differ on every fetch of the same data, so they
+        are left out; otherwise re-collected inputs would never hit the cache.
+        """
+        if not self.config.llm_cache_enabled:
+            return None
+        
+        inputs = _without_volatile_keys((input_data, collected_data, aggregated_data))
+        try:
+            if orjson is not None:
+                payload = orjson.dumps(inputs, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str)
+            else:
+                payload = json.dumps(inputs, sort_keys=True, default=str).encode("utf-8")
+        except TypeError:
+            return None
+        
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+    
+    def _get_cached_result(self, key: Optional[str]) -> Optional[AnalysisResult]:
+        """Look up a complete analysis result"""
+        if key is None:
+            return None
+        
+        cached = self.result_cache.get(key)
+        if cached is None:
+            return None
+        
+        logger.info("LOB analysis result cache hit")
+        return self._copy_result(cached)
+    
+    def _cache_result(self, key: Optional[str], result: AnalysisResult) -> AnalysisResult:
+        """Store a successful analysis result and return it"""
+        if key is not None and result.error is None:
+            self.result_cache.set(key, self._copy_result(result))
+        return result
+    
+    @staticmethod
+    def _copy_result(result: AnalysisResult) -> AnalysisResult:
+        """
+        Copy of a result with its own flags and metadata
+        
+        Cached results are shared between callers, and those fields are
+        mutable, so the cache never hands out or keeps a caller's objects.
+        """
+        return replace(result, flags=copy.deepcopy(result.flags), metadata=copy.deepcopy(result.metadata))
+    
+    def _prepare_analysis(
+        self,
+        input_data: Dict[str, Any],
+        collected_data: Dict[str, Any],
+        aggregated_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Steps 1-2: prepare evidence, features and the LLM step arguments"""
+        company_name = input_data.get("client", "")
+        country = input_data.get("client_country", "")
+        role = input_data.get("client_role", "")
+        product = input_data.get("product_name", "")
+        
+        logger.info("Starting LOB analysis", company=company_name, country=country)
+        
+        # Step 1: Extract and prepare text from collected data
+        evidence_text = self._prepare_evidence_text(collected_data, aggregated_data)
+        
+        # Step 2: Extract features
+        features = self.text_processor.extract_features(evidence_text)
+        
+        sources_by_name = self._index_sources(collected_data)
+        sanctions_info = self._extract_sanctions_info(sources_by_name)
+        classifier_context = {
+            "features": features,
+            "input_data": input_data
+        }
+        
+        return {
+            "company_name": company_name,
+            "country": country,
+            "evidence_text": evidence_text,
+            "features": features,
+            "sanctions_info": sanctions_info,
+            "input_data": input_data,
+            "collected_data": collected_data,
+            "ai_request": {
+                "company_name": company_name,
+                "country": country,
+                "role": role,
+                "product": product,
+                "collected_data": collected_data,
+                "evidence_text": evidence_text
+            },
+            "activity_request": {
+                "company_name": company_name,
+                "evidence_text": evidence_text,
+                "additional_context": classifier_context
+            },
+            "risk_request": {
+                "company_name": company_name,
+                "country": country,
+                "evidence_text": evidence_text,
+                "sanctions_info": sanctions_info,
+                "additional_context": classifier_context
             }
+        }
+    
+    def _complete_analysis(
+        self,
+        analysis: Dict[str, Any],
+        ai_response: Dict[str, Any],
+        activity_result: Dict[str, Any],
+        risk_result: Dict[str, Any]
+    ) -> AnalysisResult:
+        """Steps 6-9: flags, red flag, confidence and the formatted result"""
+        features = analysis["features"]
+        evidence_text = analysis["evidence_text"]
+        
+        # Step 6: Generate flags
+        flags = self.flag_generator.generate_flags(
+            company_name=analysis["company_name"],
+            country=analysis["country"],
+            evidence_text=evidence_text,
+            sanctions_info=analysis["sanctions_info"],
+            risk_assessment=risk_result,
+            additional_context={
+                "features": features,
+                "input_data": analysis["input_data"],
+                "collected_data": analysis["collected_data"]
+            }
+        )
+        
+        # Step 7: Determine if red flag (needed for confidence calculation)
+        flag_summary = self._summarize_flags(flags)
+        is_red_flag = self._determine_red_flag(risk_result, flags, flag_summary)
+        
+        # Step 8: Calculate confidence score (after determining red flag)
+        confidence_score = self._calculate_confidence_score(
+            features=features,
+            activity_result=activity_result,
+            risk_result=risk_result,
+            evidence_text=evidence_text,
+            flags=flags,
+            is_red_flag=is_red_flag,
+            flag_summary=flag_summary
+        )
+        
+        # Step 9: Format response
+        result = AnalysisResult(
+            ai_response=ai_response.get("content", "") or ai_response.get("analysis", ""),
+            activity_level=activity_result.get("activity_level", "Unknown"),
+            flags=self.flag_generator.format_flags_for_storage(flags),
+            confidence_score=confidence_score,
+            is_red_flag=is_red_flag,
+            risk_score=risk_result.get("risk_score", 0.0),
+            risk_level=risk_result.get("risk_level", "Medium"),
+            metadata={
+                "features": features,
+                "activity_reasoning": activity_result.get("reasoning", ""),
+                "risk_reasoning": risk_result.get("reasoning", ""),
+                "llm_metadata": ai_response.get("metadata", {})
+            }
+        )
+        
+        logger.info(
+            "LOB analysis complete",
+            company=analysis["company_name"],
+            activity_level=result.activity_level,
+            risk_level=result.risk_level,
+            flags_count=len(result.flags),
+            is_red_flag=is_red_flag
+        )
+        
+        return result
+    
+    @staticmethod
+    def _error_result(error: Exception) -> AnalysisResult:
+        """Result returned when LOB analysis raises"""
+        return AnalysisResult(
+            ai_response=f"Error in analysis: {str(error)}",
+            activity_level="Unknown",
+            flags=[{"category": "system_error", "message": str(error)}],
+            confidence_score="Low",
+            is_red_flag=False,
+            error=str(error)
+        )
     
     def _prepare_evidence_text(
         self,
         collected_data: Dict[str, Any],
         aggregated_data: Dict[str, Any]
     ) -> str:
-        """Prepare evidence text from collected data"""
-        texts = []
+        """
+        Prepare evidence text from collected data
         
+        Pieces are written into a bounded buffer, so only the part of each
+        source that can still fit is ever materialized.
+        """
+        max_length = 4000
+        buffer = io.StringIO()
+        # One character past the limit, so prepare_text_for_llm still marks the cut
+        remaining = max_length + 1
+        
+        for piece in self._evidence_pieces(collected_data, aggregated_data, remaining):
+            if buffer.tell():
+                piece = "\n\n" + piece
+            piece = piece[:remaining]
+            buffer.write(piece)
+            remaining -= len(piece)
+            if remaining <= 0:
+                break
+        
+        # Prepare text for LLM (limit length)
+        return self.text_processor.prepare_text_for_llm(buffer.getvalue(), max_length=max_length)
+    
+    def _evidence_pieces(
+        self,
+        collected_data: Dict[str, Any],
+        aggregated_data: Dict[str, Any],
+        limit: int
+    ) -> Iterator[str]:
+        """Yield evidence pieces in order, each capped at its own length"""
         # Extract from aggregated data
         data = aggregated_data.get("data", {})
         if isinstance(data, dict):
             # Website content
             if "website_content" in data:
-                texts.append(f"Website: {data['website_content'][:1000]}")
+                yield f"Website: {data['website_content'][:1000]}"
             if "description" in data:
-                texts.append(f"Description: {data['description']}")
+                yield f"Description: {str(data['description'])[:limit]}"
         
         # Extract from collected_data sources
         sources = collected_data.get("sources", [])
@@ -186,14 +463,30 @@ class AIOrchestrator:
                 content = source.get("content") or source.get("text") or source.get("data")
                 if content:
                     if isinstance(content, str):
-                        texts.append(content[:500])
+                        yield content[:500]
                     elif isinstance(content, dict):
-                        texts.append(str(content)[:500])
+                        yield self._summarize_source_dict(content, 500)
+    
+    @staticmethod
+    def _summarize_source_dict(content: Dict[str, Any], limit: int) -> str:
+        """
+        str(content)[:limit], without rendering the items past the limit
         
-        evidence = "\n\n".join(texts)
+        The dict repr is written item by item and stops once limit
+        characters exist, so the prompt text is unchanged.
+        """
+        buffer = io.StringIO()
+        buffer.write("{")
+        for i, (key, value) in enumerate(content.items()):
+            if buffer.tell() >= limit:
+                break
+            if i:
+                buffer.write(", ")
+            buffer.write(f"{key!r}: {value!r}")
+        else:
+            buffer.write("}")
         
-        # Prepare text for LLM (limit length)
-        return self.text_processor.prepare_text_for_llm(evidence, max_length=4000)
+        return buffer.getvalue()[:limit]
     
     def _generate_ai_response(
         self,
@@ -205,13 +498,137 @@ class AIOrchestrator:
         evidence_text: str
     ) -> Dict[str, Any]:
         """Generate main AI response"""
+        cache_entry = self._ai_cache_entry(company_name, country, role, product, evidence_text)
+        cached = self._get_cached_ai_response(cache_entry)
+        if cached is not None:
+            return cached
+        
+        response = self.llm_client.generate_response(
+            prompt=self._build_ai_prompt(company_name, country, role, product, collected_data, evidence_text),
+            system_prompt=PromptTemplates.SYSTEM_PROMPT_BASE
+        )
+        return self._cache_ai_response(cache_entry, self._parse_ai_response(response))
+    
+    async def _generate_ai_response_async(
+        self,
+        company_name: str,
+        country: str,
+        role: str,
+        product: str,
+        collected_data: Dict[str, Any],
+        evidence_text: str
+    ) -> Dict[str, Any]:
+        """Generate main AI response without blocking the event loop"""
+        cache_entry = self._ai_cache_entry(company_name, country, role, product, evidence_text)
+        cached = self._get_cached_ai_response(cache_entry)
+        if cached is not None:
+            return cached
+        
+        response = await self._consume_stream(
+            self.llm_client.stream_response(
+                prompt=self._build_ai_prompt(company_name, country, role, product, collected_data, evidence_text),
+                system_prompt=PromptTemplates.SYSTEM_PROMPT_BASE
+            )
+        )
+        return self._cache_ai_response(cache_entry, self._parse_ai_response(response))
+    
+    async def _consume_stream(self, stream: AsyncIterator[str]) -> Dict[str, Any]:
+        """
+        Accumulate a streamed LLM response
+        
+        Returns:
+            Dictionary with 'content' and 'metadata', as generate_response does
+        """
+        provider = self.config.llm_provider
+        metadata = {
+            "provider": provider,
+            "model": self.config.active_model,
+            "streamed": True
+        }
+        
+        chunks = []
+        try:
+            async for chunk in stream:
+                chunks.append(chunk)
+        except Exception as e:
+            logger.error("Error streaming LLM response", error=str(e))
+            return {"content": None, "error": str(e), "metadata": metadata}
+        
+        return {"content": "".join(chunks), "metadata": metadata}
+    
+    def _ai_cache_entry(
+        self,
+        company_name: str,
+        country: str,
+        role: str,
+        product: str,
+        evidence_text: str
+    ) -> Optional[Dict[str, str]]:
+        """
+        Build main AI response cache lookup (namespace, exact key, text to embed)
+        
+        Role and product change the prompt, so they partition the cache;
+        company, country and evidence are what the semantic lookup compares.
+        """
+        if not self.config.llm_cache_enabled:
+            return None
+        
+        namespace = ResponseCache.make_key(self.config.llm_provider, self.config.active_model, role, product)
+        text = f"{company_name} | {country} | {evidence_text[:1024]}"
+        return {
+            "namespace": namespace,
+            "key": ResponseCache.make_key(namespace, text),
+            "text": text
+        }
+    
+    def _get_cached_ai_response(self, cache_entry: Optional[Dict[str, str]]) -> Optional[Dict[str, Any]]:
+        """Look up a cached main AI response (returned as a copy marked cached)"""
+        if cache_entry is None:
+            return None
+        
+        cached = self.ai_response_cache.get(
+            cache_entry["key"],
+            namespace=cache_entry["namespace"],
+            text=cache_entry["text"]
+        )
+        if cached is None:
+            return None
+        
+        logger.debug("Main AI response cache hit")
+        return {**cached, "metadata": {**cached.get("metadata", {}), "cached": True}}
+    
+    def _cache_ai_response(
+        self,
+        cache_entry: Optional[Dict[str, str]],
+        response: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Store a successful main AI response and return it"""
+        if cache_entry is not None and response.get("content") and not response.get("error"):
+            self.ai_response_cache.set(
+                cache_entry["key"],
+                dict(response),
+                namespace=cache_entry["namespace"],
+                text=cache_entry["text"]
+            )
+        return response
+    
+    def _build_ai_prompt(
+        self,
+        company_name: str,
+        country: str,
+        role: str,
+        product: str,
+        collected_data: Dict[str, Any],
+        evidence_text: str
+    ) -> str:
+        """Build the main LOB verification prompt"""
         # Get website text if available
         website_text = None
         data = collected_data.get("data", {})
         if isinstance(data, dict) and "website_content" in data:
             website_text = data["website_content"]
         
-        prompt = PromptTemplates.lob_verification_prompt(
+        return PromptTemplates.lob_verification_prompt(
             company_name=company_name,
             country=country,
             role=role,
@@ -219,32 +636,34 @@ class AIOrchestrator:
             collected_data=collected_data,
             website_text=website_text or evidence_text
         )
-        
-        response = self.llm_client.generate_response(
-            prompt=prompt,
-            system_prompt=PromptTemplates.SYSTEM_PROMPT_BASE
-        )
-        
-        # Parse response
+    
+    def _parse_ai_response(self, response: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge parsed fields into the main AI response"""
         if response.get("content"):
             parsed = self.response_parser.parse_lob_response(response["content"])
             response.update(parsed)
         
         return response
     
-    def _extract_sanctions_info(self, collected_data: Dict[str, Any]) -> Optional[str]:
-        """Extract sanctions information from collected data"""
-        sources = collected_data.get("sources", [])
-        for source in sources:
+    @staticmethod
+    def _index_sources(collected_data: Dict[str, Any]) -> Dict[Any, List[Dict[str, Any]]]:
+        """Group source dicts by name (in collection order) for direct lookups"""
+        sources_by_name: Dict[Any, List[Dict[str, Any]]] = {}
+        for source in collected_data.get("sources", []):
             if isinstance(source, dict):
-                if source.get("name") == "sanctions_checker":
-                    sanctions_data = source.get("data") or source.get("result")
-                    if sanctions_data:
-                        if isinstance(sanctions_data, dict):
-                            if sanctions_data.get("match"):
-                                return f"Sanctions match found: {sanctions_data}"
-                        else:
-                            return str(sanctions_data)
+                sources_by_name.setdefault(source.get("name"), []).append(source)
+        return sources_by_name
+    
+    def _extract_sanctions_info(self, sources_by_name: Dict[Any, List[Dict[str, Any]]]) -> Optional[str]:
+        """Extract sanctions information from the indexed sources"""
+        for source in sources_by_name.get("sanctions_checker", []):
+            sanctions_data = source.get("data") or source.get("result")
+            if sanctions_data:
+                if isinstance(sanctions_data, dict):
+                    if sanctions_data.get("match"):
+                        return f"Sanctions match found: {sanctions_data}"
+                else:
+                    return str(sanctions_data)
         
         return None
     
@@ -254,8 +673,9 @@ class AIOrchestrator:
         activity_result: Dict[str, Any],
         risk_result: Dict[str, Any],
         evidence_text: str,
-        flags: Optional[List[Dict[str, Any]]] = None,
-        is_red_flag: Optional[bool] = None
+        flags: Optional[List[Flag]] = None,
+        is_red_flag: Optional[bool] = None,
+        flag_summary: Optional[Tuple[bool, int]] = None
     ) -> str:
         """
         Calculate overall confidence score
@@ -265,14 +685,10 @@ class AIOrchestrator:
         - Red flags = HIGH confidence (we found clear risk indicators)
         - Limited evidence = LOW confidence (but sanctions match overrides this)
         """
-        flags = flags or []
+        has_sanctions_match, _ = flag_summary or self._summarize_flags(flags or [])
         
         # Check for sanctions match - this is STRONG evidence (high confidence)
-        sanctions_flags = [
-            flag for flag in flags
-            if flag.get("category") == "sanctions_match"
-        ]
-        if sanctions_flags:
+        if has_sanctions_match:
             # Sanctions match is concrete evidence, so HIGH confidence
             return "High"
         
@@ -306,28 +722,38 @@ class AIOrchestrator:
     def _determine_red_flag(
         self,
         risk_result: Dict[str, Any],
-        flags: List[Dict[str, Any]]
+        flags: List[Flag],
+        flag_summary: Optional[Tuple[bool, int]] = None
     ) -> bool:
         """Determine if this is a red flag case"""
         # High risk score
         if risk_result.get("risk_score", 0.0) >= self.config.risk_threshold_high:
             return True
         
+        has_sanctions_match, high_severity_count = flag_summary or self._summarize_flags(flags)
+        
         # High severity flags
-        high_severity_flags = [
-            flag for flag in flags
-            if flag.get("severity") == "high"
-        ]
-        if len(high_severity_flags) >= 2:  # 2+ high severity flags
+        if high_severity_count >= 2:  # 2+ high severity flags
             return True
         
         # Sanctions match
-        sanctions_flags = [
-            flag for flag in flags
-            if flag.get("category") == "sanctions_match"
-        ]
-        if sanctions_flags:
-            return True
+        return has_sanctions_match
+    
+    @staticmethod
+    def _summarize_flags(flags: List[Flag]) -> Tuple[bool, int]:
+        """
+        Scan flags once for the red flag and confidence checks
+        
+        Returns:
+            Tuple of (any sanctions_match flag, number of high severity flags)
+        """
+        has_sanctions_match = False
+        high_severity_count = 0
+        for flag in flags:
+            if flag.category == "sanctions_match":
+                has_sanctions_match = True
+            if flag.severity == "high":
+                high_severity_count += 1
         
-        return False
+        return has_sanctions_match, high_severity_count
 
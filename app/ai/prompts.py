@@ -3,7 +3,17 @@ Prompt Templates for LLM Queries
 Templates for different analysis tasks
 """
 
-from typing import Dict, Any, Optional
+import re
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
+
+try:
+    from orjson import loads as json_loads  # Optional: pip install orjson
+except ImportError:
+    from json import loads as json_loads
+
+# Evidence is capped before prompt assembly, which also bounds the prompt cache keys
+PROMPT_EVIDENCE_CHARS = 1500
 
 
 class PromptTemplates:
@@ -20,6 +30,61 @@ Guidelines:
 - Be objective and avoid speculation
 - Cite specific evidence for your conclusions"""
     
+    # Task-specific system prompts (static, so the whole system message is a stable prefix)
+    ACTIVITY_SYSTEM_PROMPT = SYSTEM_PROMPT_BASE + "\n\nFocus on activity level classification based on evidence."
+    RISK_SYSTEM_PROMPT = SYSTEM_PROMPT_BASE + "\n\nFocus on risk and compliance assessment."
+    
+    # Task instructions placed ahead of any company-specific data
+    ACTIVITY_INSTRUCTIONS = """Classify the business activity level of the company described below.
+
+Classify the business as one of:
+- Active: Business is currently operational with evidence of recent activity
+- Dormant: Business exists but shows no recent activity
+- Inactive: Business appears to be inactive or discontinued
+- Suspended: Business operations are suspended
+- Unknown: Insufficient data to determine status
+
+Provide:
+1. Classification (one of the above)
+2. Confidence level (High/Medium/Low)
+3. Key evidence supporting your classification"""
+    
+    RISK_INSTRUCTIONS = """Assess compliance and risk indicators for the company described below.
+
+Identify:
+1. Compliance issues (if any)
+2. Risk indicators
+3. Data quality concerns
+4. Source reliability issues
+
+Format your response with specific flags/categories."""
+    
+    # UC1: LOB verification instructions (placed ahead of the company data)
+    LOB_INSTRUCTIONS = """Analyze the company described below for Line of Business (LOB) verification.
+
+ANALYSIS REQUIRED:
+Please provide a comprehensive analysis including:
+
+1. BUSINESS LEGITIMACY ASSESSMENT:
+   - Is this a legitimate business operation?
+   - Is there evidence of actual business activity?
+   - Are there any concerns about the business legitimacy?
+
+2. ACTIVITY LEVEL CLASSIFICATION:
+   - Classify as one of: Active, Dormant, Inactive, Suspended, Unknown
+   - Provide reasoning for the classification
+
+3. RISK INDICATORS:
+   - Identify any compliance concerns
+   - Flag any suspicious patterns
+   - Note any data quality issues
+
+4. CONFIDENCE LEVEL:
+   - Rate your confidence in this assessment (High, Medium, Low)
+   - Explain any limitations in the available data
+
+Please provide your analysis in a clear, structured format."""
+    
     # UC1: LOB Verification Prompts
     @staticmethod
     def lob_verification_prompt(
@@ -44,8 +109,10 @@ Guidelines:
         Returns:
             Formatted prompt string
         """
-        prompt = f"""Analyze the following company for Line of Business (LOB) verification:
+        # Invariant instructions first, per-company data last (prefix-cache friendly)
+        prompt = f"""{PromptTemplates.LOB_INSTRUCTIONS}
 
+---
 COMPANY INFORMATION:
 - Name: {company_name}
 - Country: {country}
@@ -59,44 +126,23 @@ COLLECTED DATA:
         if website_text:
             prompt += f"""
 WEBSITE CONTENT:
-{website_text[:2000]}  # Limit length
+{website_text[:2000]}
 """
         
-        # Add sources summary
+        # Add sources summary (sorted, so identical source sets give identical prompts)
         sources = collected_data.get("sources", [])
         if sources:
             prompt += f"""
 DATA SOURCES:
 {len(sources)} source(s) were consulted:
 """
-            for i, source in enumerate(sources[:5], 1):  # Limit to 5 sources
-                source_name = source.get("name", "Unknown") if isinstance(source, dict) else str(source)
+            source_names = sorted((
+                source.get("name", "Unknown") if isinstance(source, dict) else str(source)
+                for source in sources
+            ), key=str)
+            for i, source_name in enumerate(source_names[:5], 1):  # Limit to 5 sources
                 prompt += f"  {i}. {source_name}\n"
         
-        prompt += """
-ANALYSIS REQUIRED:
-Please provide a comprehensive analysis including:
-
-1. BUSINESS LEGITIMACY ASSESSMENT:
-   - Is this a legitimate business operation?
-   - Is there evidence of actual business activity?
-   - Are there any concerns about the business legitimacy?
-
-2. ACTIVITY LEVEL CLASSIFICATION:
-   - Classify as one of: Active, Dormant, Inactive, Suspended, Unknown
-   - Provide reasoning for the classification
-
-3. RISK INDICATORS:
-   - Identify any compliance concerns
-   - Flag any suspicious patterns
-   - Note any data quality issues
-
-4. CONFIDENCE LEVEL:
-   - Rate your confidence in this assessment (High, Medium, Low)
-   - Explain any limitations in the available data
-
-Please provide your analysis in a clear, structured format."""
-
         return prompt
     
     @staticmethod
@@ -105,24 +151,7 @@ Please provide your analysis in a clear, structured format."""
         evidence_text: str
     ) -> str:
         """Generate prompt for activity level classification"""
-        prompt = f"""Classify the business activity level for: {company_name}
-
-Based on the following evidence:
-{evidence_text[:1500]}
-
-Classify the business as one of:
-- Active: Business is currently operational with evidence of recent activity
-- Dormant: Business exists but shows no recent activity
-- Inactive: Business appears to be inactive or discontinued
-- Suspended: Business operations are suspended
-- Unknown: Insufficient data to determine status
-
-Provide:
-1. Classification (one of the above)
-2. Confidence level (High/Medium/Low)
-3. Key evidence supporting your classification"""
-        
-        return prompt
+        return _activity_classification_prompt(company_name, evidence_text[:PROMPT_EVIDENCE_CHARS])
     
     @staticmethod
     def risk_assessment_prompt(
@@ -132,28 +161,12 @@ Provide:
         sanctions_info: Optional[str] = None
     ) -> str:
         """Generate prompt for risk assessment"""
-        prompt = f"""Assess compliance and risk indicators for: {company_name} ({country})
-
-EVIDENCE:
-{evidence_text[:1500]}
-
-"""
-        
-        if sanctions_info:
-            prompt += f"""SANCTIONS INFORMATION:
-{sanctions_info}
-
-"""
-        
-        prompt += """Identify:
-1. Compliance issues (if any)
-2. Risk indicators
-3. Data quality concerns
-4. Source reliability issues
-
-Format your response with specific flags/categories."""
-        
-        return prompt
+        return _risk_assessment_prompt(
+            company_name,
+            country,
+            evidence_text[:PROMPT_EVIDENCE_CHARS],
+            sanctions_info
+        )
     
     @staticmethod
     def generate_structured_response() -> str:
@@ -172,9 +185,73 @@ Format your response with specific flags/categories."""
 Ensure the response is valid JSON."""
 
 
+
+# Re-screens of the same company rebuild identical prompts, so memoize assembly
+@lru_cache(maxsize=4096)
+def _activity_classification_prompt(company_name: str, evidence_text: str) -> str:
+    """Assemble activity classification prompt (memoized)"""
+    # Invariant instructions first, per-company data last (prefix-cache friendly)
+    return f"""{PromptTemplates.ACTIVITY_INSTRUCTIONS}
+
+COMPANY: {company_name}
+
+EVIDENCE:
+{evidence_text}"""
+
+
+@lru_cache(maxsize=4096)
+def _risk_assessment_prompt(
+    company_name: str,
+    country: str,
+    evidence_text: str,
+    sanctions_info: Optional[str]
+) -> str:
+    """Assemble risk assessment prompt (memoized)"""
+    # Invariant instructions first, per-company data last (prefix-cache friendly)
+    prompt = f"""{PromptTemplates.RISK_INSTRUCTIONS}
+
+COMPANY: {company_name} ({country})
+
+EVIDENCE:
+{evidence_text}"""
+    
+    if sanctions_info:
+        prompt += f"""
+
+SANCTIONS INFORMATION:
+{sanctions_info}"""
+    
+    return prompt
+
+
 class ResponseParser:
     """Parse LLM responses into structured format"""
     
+    # Characters that matter when matching JSON braces
+    JSON_TOKEN_PATTERN = re.compile(r'[{}"\\]')
+    
+    # Text fallback patterns
+    ACTIVITY_PATTERN = re.compile(
+        r'(?:Activity|Classification|Status).*?:\s*(Active|Dormant|Inactive|Suspended|Unknown)',
+        re.IGNORECASE
+    )
+    CONFIDENCE_PATTERN = re.compile(
+        r'(?:Confidence|Confidence Level).*?:\s*(High|Medium|Low)',
+        re.IGNORECASE
+    )
+    FLAG_PATTERN = re.compile(
+        r'(?:Flag|Issue|Concern|Alert).*?:\s*([^\n]+)',
+        re.IGNORECASE
+    )
+    
+    # Same fields for the single-pass fallback (lowercase)
+    ACTIVITY_KEYWORDS = ("activity", "classification", "status")
+    ACTIVITY_VALUES = ("active", "dormant", "inactive", "suspended", "unknown")
+    CONFIDENCE_KEYWORDS = ("confidence",)
+    CONFIDENCE_VALUES = ("high", "medium", "low")
+    FLAG_KEYWORDS = ("flag", "issue", "concern", "alert")
+    MAX_FLAGS = 10
+    
     @staticmethod
     def parse_lob_response(response: str) -> Dict[str, Any]:
         """
@@ -186,17 +263,10 @@ class ResponseParser:
         Returns:
             Parsed structured data
         """
-        import json
-        import re
-        
         # Try to extract JSON if present
-        json_match = re.search(r'\{[^{}]*\}', response, re.DOTALL)
-        if json_match:
-            try:
-                parsed = json.loads(json_match.group(0))
-                return parsed
-            except json.JSONDecodeError:
-                pass
+        parsed = ResponseParser.extract_json(response)
+        if parsed is not None:
+            return parsed
         
         # Fallback: Extract key information from text
         parsed = {
@@ -207,32 +277,151 @@ class ResponseParser:
             "risk_score": None
         }
         
+        response_lower = response.lower()
+        if len(response_lower) != len(response):
+            # Lowercasing changed offsets (rare non-ASCII), so use the patterns
+            return ResponseParser._parse_text_fields_regex(response, parsed)
+        
+        # Single pass over the colons: each "<keyword> ...: <value>" field is
+        # read at its colon, matching what the fallback patterns would find
+        length = len(response)
+        flags_end = 0  # Flag values don't overlap (findall semantics)
+        colon = response_lower.find(":")
+        while colon != -1:
+            head = response_lower[response_lower.rfind("\n", 0, colon) + 1:colon]
+            value_start = colon + 1
+            while value_start < length and response_lower[value_start].isspace():
+                value_start += 1
+            
+            if parsed["activity_level"] is None and any(k in head for k in ResponseParser.ACTIVITY_KEYWORDS):
+                value = ResponseParser._value_at(response_lower, value_start, ResponseParser.ACTIVITY_VALUES)
+                if value:
+                    parsed["activity_level"] = value.capitalize()
+            
+            if parsed["confidence"] is None and any(k in head for k in ResponseParser.CONFIDENCE_KEYWORDS):
+                value = ResponseParser._value_at(response_lower, value_start, ResponseParser.CONFIDENCE_VALUES)
+                if value:
+                    parsed["confidence"] = response[value_start:value_start + len(value)]
+            
+            if (
+                colon >= flags_end
+                and len(parsed["flags"]) < ResponseParser.MAX_FLAGS
+                and any(k in head for k in ResponseParser.FLAG_KEYWORDS)
+            ):
+                if value_start < length:
+                    line_end = response.find("\n", value_start)
+                    flags_end = length if line_end == -1 else line_end
+                    parsed["flags"].append(response[value_start:flags_end].strip())
+                elif response[colon + 1:].strip("\n"):
+                    # Only whitespace follows: the pattern still matches a blank value
+                    parsed["flags"].append("")
+                    flags_end = length
+            
+            colon = response_lower.find(":", colon + 1)
+        
+        return parsed
+    
+    @staticmethod
+    def _value_at(text_lower: str, start: int, values: Tuple[str, ...]) -> Optional[str]:
+        """Return the value that text_lower has at start, if any"""
+        for value in values:
+            if text_lower.startswith(value, start):
+                return value
+        return None
+    
+    @staticmethod
+    def _parse_text_fields_regex(response: str, parsed: Dict[str, Any]) -> Dict[str, Any]:
+        """Fill text fallback fields using the regex patterns"""
         # Try to extract activity level
-        activity_match = re.search(
-            r'(?:Activity|Classification|Status).*?:\s*(Active|Dormant|Inactive|Suspended|Unknown)',
-            response,
-            re.IGNORECASE
-        )
+        activity_match = ResponseParser.ACTIVITY_PATTERN.search(response)
         if activity_match:
             parsed["activity_level"] = activity_match.group(1).capitalize()
         
         # Try to extract confidence
-        confidence_match = re.search(
-            r'(?:Confidence|Confidence Level).*?:\s*(High|Medium|Low)',
-            response,
-            re.IGNORECASE
-        )
+        confidence_match = ResponseParser.CONFIDENCE_PATTERN.search(response)
         if confidence_match:
             parsed["confidence"] = confidence_match.group(1)
         
         # Try to extract flags
-        flags_match = re.findall(
-            r'(?:Flag|Issue|Concern|Alert).*?:\s*([^\n]+)',
-            response,
-            re.IGNORECASE
-        )
+        flags_match = ResponseParser.FLAG_PATTERN.findall(response)
         if flags_match:
-            parsed["flags"] = [flag.strip() for flag in flags_match[:10]]  # Limit to 10
+            parsed["flags"] = [flag.strip() for flag in flags_match[:ResponseParser.MAX_FLAGS]]
         
         return parsed
-
+    
+    @staticmethod
+    def extract_json(text: str, partial: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Extract the first JSON object embedded in text
+        
+        Braces are matched in one pass (skipping string contents), so
+        nested objects are supported. A prefix of a streamed completion
+        only yields an object once that object is complete.
+        
+        Args:
+            text: LLM response text
+            partial: text is a prefix of a streamed completion, so an
+                unclosed brace may still be closed and ends the search
+        
+        Returns:
+            Parsed JSON object or None
+        """
+        # Clean JSON response: skip the scan entirely
+        if text.lstrip().startswith("{"):
+            try:
+                value = json_loads(text)
+                if isinstance(value, dict):
+                    return value
+            except ValueError:
+                pass
+        
+        start = text.find("{")
+        while start != -1:
+            end = ResponseParser._matching_brace(text, start)
+            if end == -1:
+                if partial:
+                    # The object may still be closing: any later brace is nested inside it
+                    return None
+                # Stray brace in finished text; an object may still follow it
+                start = text.find("{", start + 1)
+                continue
+            
+            try:
+                value = json_loads(text[start:end + 1])
+                if isinstance(value, dict):
+                    return value
+            except ValueError:
+                pass
+            
+            start = text.find("{", start + 1)
+        
+        return None
+    
+    @staticmethod
+    def _matching_brace(text: str, start: int) -> int:
+        """Return index of the brace closing the one at start, or -1"""
+        depth = 0
+        in_string = False
+        escaped_pos = -1
+        
+        for match in ResponseParser.JSON_TOKEN_PATTERN.finditer(text, start):
+            pos = match.start()
+            if pos == escaped_pos:
+                continue
+            
+            char = match.group()
+            if char == "\\":
+                if in_string:
+                    escaped_pos = pos + 1
+            elif char == '"':
+                in_string = not in_string
+            elif in_string:
+                continue
+            elif char == "{":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return pos
+        
+        return -1
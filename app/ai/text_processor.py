@@ -3,26 +3,84 @@ Text Processing Module
 Handles NLP text processing, feature extraction, and entity extraction
 """
 
+import hashlib
 import re
+import threading
+from collections import OrderedDict
 from typing import Dict, List, Optional, Any
 from app.core.logging import get_logger
-from app.ai.config import AIConfig
+from app.core.patterns import LinearPattern
+from app.ai.config import AIConfig, get_ai_config
+from app.ai.keywords import KeywordMatcher
 
 logger = get_logger(__name__)
 
+# Patterns and keyword lists, compiled once at import
+_SPECIAL_CHARS_PATTERN = re.compile(r'[^\w\s\.\,\!\?\-]')
+
+# Same substitution as _SPECIAL_CHARS_PATTERN for ASCII text, via str.translate
+_SPECIAL_CHARS_TABLE = str.maketrans({
+    chr(code): ' ' for code in range(128) if _SPECIAL_CHARS_PATTERN.match(chr(code))
+})
+
+# Entity candidates in one scan: capitalized phrases (companies), years and dates.
+# The alternatives can't overlap (letters vs digits), so this finds exactly what
+# separate phrase and date scans would.
+_ENTITY_PATTERN = LinearPattern(
+    r'\b(?P<phrase>[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\b'
+    r'|\b(?P<year>\d{4})\b'
+    r'|\b(?P<date>\d{1,2}[/-]\d{1,2}[/-]\d{4})\b'
+)
+_MAX_COMPANY_CANDIDATES = 10
+_MAX_DATE_CANDIDATES = 5
+
+_COMPANY_KEYWORDS = (
+    'company', 'corporation', 'corp', 'inc', 'ltd', 'limited',
+    'group', 'holdings', 'enterprises', 'business', 'firm'
+)
+_LOCATION_KEYWORDS = (
+    'country', 'city', 'region', 'address', 'located', 'headquarters',
+    'office', 'branch', 'international', 'global'
+)
+_ACTIVITY_KEYWORDS = (
+    'trade', 'import', 'export', 'commerce', 'trading', 'business',
+    'operations', 'activities', 'services', 'products'
+)
+
+# One matcher for all three mention checks ("business" is both company and activity)
+_MENTION_MATCHER = KeywordMatcher.from_groups({
+    "company": _COMPANY_KEYWORDS,
+    "location": _LOCATION_KEYWORDS,
+    "activity": _ACTIVITY_KEYWORDS
+})
+
+# Common capitalized words that aren't companies
+_EXCLUDED_ENTITY_WORDS = frozenset({
+    'The', 'This', 'That', 'These', 'Those', 'Where', 'When',
+    'What', 'Who', 'Which', 'How', 'Why', 'Monday', 'Tuesday'
+})
+
 
 class TextProcessor:
     """Processes and extracts features from text data"""
     
     def __init__(self, config: Optional[AIConfig] = None):
         """Initialize text processor"""
-        self.config = config or AIConfig()
+        self.config = config or get_ai_config()
+        
+        # Features by evidence hash: analyses often share byte-identical evidence
+        self._feature_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        self._feature_cache_lock = threading.Lock()
+        
         logger.info("TextProcessor initialized")
     
     def extract_features(self, text: str) -> Dict[str, Any]:
         """
         Extract features from text
         
+        Results are memoized by a hash of the text, so repeated evidence
+        (e.g. the same website content across a batch) is processed once.
+        
         Args:
             text: Input text to process
         
@@ -40,60 +98,58 @@ class TextProcessor:
                 "text_quality_score": 0.0
             }
         
-        # Clean and normalize text
+        key = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        with self._feature_cache_lock:
+            features = self._feature_cache.get(key)
+            if features is not None:
+                self._feature_cache.move_to_end(key)
+        
+        if features is None:
+            features = self._compute_features(text)
+            with self._feature_cache_lock:
+                self._feature_cache[key] = features
+                while len(self._feature_cache) > self.config.feature_cache_maxsize:
+                    self._feature_cache.popitem(last=False)
+        
+        # Callers get their own copy of the cached entry
+        return {
+            **features,
+            "extracted_entities": [dict(entity) for entity in features["extracted_entities"]]
+        }
+    
+    def _compute_features(self, text: str) -> Dict[str, Any]:
+        """Extract features from text that passed the length check (uncached)"""
+        # Clean and normalize text, then collect word and keyword stats in one place
         cleaned_text = self._clean_text(text)
+        stats = self._text_stats(cleaned_text)
         
         # Extract basic features
         features = {
-            "word_count": len(cleaned_text.split()),
+            "word_count": stats["word_count"],
             "char_count": len(cleaned_text),
-            "has_company_mention": self._has_company_mention(cleaned_text),
-            "has_location_mention": self._has_location_mention(cleaned_text),
-            "has_activity_mention": self._has_activity_mention(cleaned_text),
+            "has_company_mention": stats["has_company_mention"],
+            "has_location_mention": stats["has_location_mention"],
+            "has_activity_mention": stats["has_activity_mention"],
             "extracted_entities": self._extract_entities(cleaned_text),
-            "text_quality_score": self._calculate_quality_score(cleaned_text)
+            "text_quality_score": self._calculate_quality_score(cleaned_text, stats)
         }
         
-        logger.debug(f"Extracted {len(features['extracted_entities'])} entities from text")
+        logger.debug("Extracted entities from text", count=len(features["extracted_entities"]))
         return features
     
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text"""
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        # Remove extra whitespace (str.split uses the same whitespace set as \s)
+        text = ' '.join(text.split())
         
         # Remove special characters but keep basic punctuation
-        text = re.sub(r'[^\w\s\.\,\!\?\-]', ' ', text)
+        if text.isascii():
+            text = text.translate(_SPECIAL_CHARS_TABLE)
+        else:
+            text = _SPECIAL_CHARS_PATTERN.sub(' ', text)
         
         return text.strip()
     
-    def _has_company_mention(self, text: str) -> bool:
-        """Check if text mentions company-related keywords"""
-        company_keywords = [
-            'company', 'corporation', 'corp', 'inc', 'ltd', 'limited',
-            'group', 'holdings', 'enterprises', 'business', 'firm'
-        ]
-        text_lower = text.lower()
-        return any(keyword in text_lower for keyword in company_keywords)
-    
-    def _has_location_mention(self, text: str) -> bool:
-        """Check if text mentions location-related keywords"""
-        location_keywords = [
-            'country', 'city', 'region', 'address', 'located', 'headquarters',
-            'office', 'branch', 'international', 'global'
-        ]
-        text_lower = text.lower()
-        return any(keyword in text_lower for keyword in location_keywords)
-    
-    def _has_activity_mention(self, text: str) -> bool:
-        """Check if text mentions business activity keywords"""
-        activity_keywords = [
-            'trade', 'import', 'export', 'commerce', 'trading', 'business',
-            'operations', 'activities', 'services', 'products'
-        ]
-        text_lower = text.lower()
-        return any(keyword in text_lower for keyword in activity_keywords)
-    
     def _extract_entities(self, text: str) -> List[Dict[str, str]]:
         """
         Extract entities from text (simple rule-based extraction)
@@ -102,49 +158,69 @@ class TextProcessor:
         Returns:
             List of extracted entities with type and value
         """
-        entities = []
+        companies = []
+        dates = []
         
-        # Extract potential company names (capitalized words/phrases)
-        company_pattern = r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\b'
-        companies = re.findall(company_pattern, text)
+        for match in _ENTITY_PATTERN.finditer(text):
+            phrase = match.group("phrase")
+            if phrase is not None:
+                # Extract potential company names (capitalized words/phrases)
+                if len(companies) < _MAX_COMPANY_CANDIDATES:
+                    companies.append(phrase)
+            elif len(dates) < _MAX_DATE_CANDIDATES:
+                # Extract dates
+                dates.append(match.group("year") or match.group("date"))
+            
+            if len(companies) >= _MAX_COMPANY_CANDIDATES and len(dates) >= _MAX_DATE_CANDIDATES:
+                break
         
         # Filter out common words that aren't companies
-        exclude_words = {
-            'The', 'This', 'That', 'These', 'Those', 'Where', 'When',
-            'What', 'Who', 'Which', 'How', 'Why', 'Monday', 'Tuesday'
-        }
-        
-        for company in companies[:10]:  # Limit to first 10
-            if company not in exclude_words and len(company.split()) <= 4:
-                entities.append({
-                    "type": "COMPANY",
-                    "value": company,
-                    "confidence": 0.6
-                })
+        entities = [
+            {"type": "COMPANY", "value": company, "confidence": 0.6}
+            for company in companies
+            if company not in _EXCLUDED_ENTITY_WORDS and len(company.split()) <= 4
+        ]
         
         # Extract potential locations (countries, cities)
         # This is simplified - in production use proper NER
-        location_pattern = r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\b'
         # Could add country/city lists here
         
-        # Extract dates
-        date_pattern = r'\b(\d{4})\b|\b(\d{1,2}[/-]\d{1,2}[/-]\d{4})\b'
-        dates = re.findall(date_pattern, text)
-        for date in dates[:5]:  # Limit to first 5
-            date_str = date[0] if date[0] else date[1]
-            entities.append({
-                "type": "DATE",
-                "value": date_str,
-                "confidence": 0.7
-            })
+        entities.extend(
+            {"type": "DATE", "value": date_str, "confidence": 0.7}
+            for date_str in dates
+        )
         
         return entities
     
-    def _calculate_quality_score(self, text: str) -> float:
-        """Calculate text quality score (0.0 to 1.0)"""
+    def _text_stats(self, text: str) -> Dict[str, Any]:
+        """
+        Tokenize and lowercase text once for the word and keyword features
+        
+        Returns:
+            Dictionary with word_count, unique_word_count and has_*_mention flags
+        """
+        words = text.split()
+        mentions = _MENTION_MATCHER.find_labels(text.lower())
+        return {
+            "word_count": len(words),
+            "unique_word_count": len(set(words)),
+            "has_company_mention": "company" in mentions,
+            "has_location_mention": "location" in mentions,
+            "has_activity_mention": "activity" in mentions
+        }
+    
+    def _calculate_quality_score(self, text: str, stats: Optional[Dict[str, Any]] = None) -> float:
+        """
+        Calculate text quality score (0.0 to 1.0)
+        
+        Args:
+            text: Cleaned text
+            stats: Precomputed _text_stats (computed here if omitted)
+        """
         if not text or len(text) < self.config.min_text_length:
             return 0.0
         
+        stats = stats or self._text_stats(text)
         score = 0.5  # Base score
         
         # Length score (longer is better, up to a point)
@@ -152,18 +228,16 @@ class TextProcessor:
         score += length_score
         
         # Word diversity (simple measure)
-        words = text.split()
-        unique_words = len(set(words))
-        if len(words) > 0:
-            diversity = unique_words / len(words)
+        if stats["word_count"] > 0:
+            diversity = stats["unique_word_count"] / stats["word_count"]
             score += diversity * 0.2
         
         # Has meaningful content indicators
-        if self._has_company_mention(text):
+        if stats["has_company_mention"]:
             score += 0.05
-        if self._has_location_mention(text):
+        if stats["has_location_mention"]:
             score += 0.05
-        if self._has_activity_mention(text):
+        if stats["has_activity_mention"]:
             score += 0.05
         
         return min(score, 1.0)
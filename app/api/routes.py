@@ -3,18 +3,34 @@ API Routes
 REST API endpoints for TBAML system
 """
 
-from fastapi import APIRouter, HTTPException, Depends, status
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Header, Response, status
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+import hashlib
+from typing import Any, Iterator, List, Optional
 from app.api.schemas import (
     LOBVerificationInput,
     LOBVerificationOutput,
+    LOBVerificationStatus,
     ErrorResponse,
     HealthResponse
 )
 from app.services.ai_service import AIService
 from app.data.connector import DataConnector
-from app.models.base import get_session_factory
+from app.data.scraper import WebScraper
+from app.data.company_registry import CompanyRegistryFetcher
+from app.data.sanctions_checker import SanctionsChecker
+from app.data.storage import DataStorage
+from app.services.lob_tasks import (
+    collect_lob_data,
+    create_pending_verification,
+    run_lob_verification,
+    get_job_status
+)
+from app.models.base import get_db, get_session_factory
 from app.models.lob import LOBVerification
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.orm import Session, load_only, raiseload
 from app.core.logging import get_logger
 from datetime import datetime
 import datetime as dt
@@ -27,6 +43,52 @@ router = APIRouter()
 # Initialize services
 ai_service = AIService()
 data_connector = DataConnector()
+data_storage = DataStorage()
+
+# Register data sources once; they (and their HTTP sessions) are reused across requests
+data_connector.register_source(WebScraper())
+data_connector.register_source(CompanyRegistryFetcher())
+data_connector.register_source(SanctionsChecker())
+
+
+def _get_verification(db: Session, verification_id: int) -> Optional[LOBVerification]:
+    """
+    Load a verification record by ID
+    
+    The lambda statement is built and compiled once; later calls only bind
+    verification_id.
+    """
+    stmt = lambda_stmt(lambda: (
+        select(LOBVerification)
+        .options(raiseload("*"))
+        .where(LOBVerification.id == verification_id)
+    ))
+    return db.scalars(stmt).first()
+
+
+def _get_verification_updated_at(db: Session, verification_id: int) -> Optional[datetime]:
+    """Load only a verification's updated_at (None if the record doesn't exist)"""
+    stmt = lambda_stmt(lambda: (
+        select(LOBVerification.updated_at)
+        .where(LOBVerification.id == verification_id)
+    ))
+    return db.scalars(stmt).first()
+
+
+def _verification_etag(verification_id: int, updated_at: Optional[datetime]) -> str:
+    """Weak ETag for a verification record; changes whenever the record is updated"""
+    version = updated_at.isoformat() if updated_at else ""
+    digest = hashlib.blake2b(f"{verification_id}:{version}".encode("utf-8"), digest_size=8).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate == "*" or candidate.removeprefix("W/") == opaque
+        for candidate in (part.strip() for part in if_none_match.split(","))
+    )
 
 
 @router.get("/health", response_model=HealthResponse, tags=["System"])
@@ -44,7 +106,7 @@ async def health_check():
 
 
 @router.post("/api/v1/lob/verify", response_model=LOBVerificationOutput, tags=["UC1"])
-async def verify_lob(input_data: LOBVerificationInput):
+async def verify_lob(input_data: LOBVerificationInput, db: Session = Depends(get_db)):
     """
     UC1: Line of Business Verification
     
@@ -63,7 +125,7 @@ async def verify_lob(input_data: LOBVerificationInput):
     """
     try:
         logger.info(
-            f"LOB verification request",
+            "LOB verification request",
             company=input_data.client,
             country=input_data.client_country,
             role=input_data.client_role
@@ -77,47 +139,12 @@ async def verify_lob(input_data: LOBVerificationInput):
             "product_name": input_data.product_name
         }
         
-        # Step 2: Collect data from sources
+        # Step 2-3: Collect, aggregate and validate data from sources
         logger.info("Collecting data from sources...")
-        
-        # Initialize data sources
-        from app.data.scraper import WebScraper
-        from app.data.company_registry import CompanyRegistryFetcher
-        from app.data.sanctions_checker import SanctionsChecker
-        
-        # Register sources
-        data_connector.register_source(WebScraper())
-        data_connector.register_source(CompanyRegistryFetcher())
-        data_connector.register_source(SanctionsChecker())
-        
-        # Collect from all sources
-        results = data_connector.collect_from_all_sources(input_dict)
-        
-        # Format collected data
-        collected_data = {
-            "sources": [],
-            "data": {}
-        }
-        
-        for result in results:
-            if result.success:
-                collected_data["sources"].append({
-                    "name": result.source,
-                    "data": result.data,
-                    "timestamp": result.timestamp.isoformat() if result.timestamp else None
-                })
-                # Merge data
-                if result.data:
-                    collected_data["data"].update(result.data)
-        
-        # Step 3: Aggregate and validate data
-        logger.info("Aggregating and validating data...")
-        aggregated_data = data_connector.aggregate_results(results)
+        collected_data, aggregated_data = await collect_lob_data(data_connector, input_dict)
         
         # Step 4: Store collected data (without AI outputs yet)
-        from app.data.storage import DataStorage
-        storage = DataStorage()
-        verification_id = storage.store_verification(
+        verification_id = data_storage.store_verification(
             input_data=input_dict,
             collected_data=collected_data,
             aggregated_data=aggregated_data
@@ -131,160 +158,275 @@ async def verify_lob(input_data: LOBVerificationInput):
         
         # Step 5: Run AI analysis and update
         logger.info("Running AI analysis...")
-        ai_result = ai_service.analyze_and_update(
+        ai_result = await ai_service.analyze_and_update_async(
             verification_id=verification_id,
-            force_update=False
+            force_update=False,
+            return_record=True
         )
         
         if not ai_result or ai_result.get("status") == "error":
             logger.warning("AI analysis encountered issues, returning partial results")
         
-        # Step 6: Get updated record
-        SessionLocal, _ = get_session_factory()
-        db = SessionLocal()
+        # Step 6: Get updated record (only re-read when the analysis didn't return it)
+        verification = (ai_result or {}).get("record") or _get_verification(db, verification_id)
         
-        try:
-            verification = db.query(LOBVerification).filter(
-                LOBVerification.id == verification_id
-            ).first()
-            
-            if not verification:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Verification record not found"
-                )
-            
-            # Step 7: Format response
-            sources_list = verification.sources if isinstance(verification.sources, list) else [verification.sources] if verification.sources else []
-            sources_names = [s.get("name") if isinstance(s, dict) else str(s) for s in sources_list] if sources_list else []
-            
-            flags_list = verification.flags if isinstance(verification.flags, list) else [verification.flags] if verification.flags else []
-            
-            output = LOBVerificationOutput(
-                id=verification.id,
-                ai_response=verification.ai_response or "Analysis in progress...",
-                website_source=verification.website_source,
-                publication_date=verification.publication_date,
-                activity_level=verification.activity_level or "Unknown",
-                flags=flags_list,
-                sources=sources_names,
-                confidence_score=verification.confidence_score or "Low",
-                is_red_flag=verification.is_red_flag,
-                created_at=verification.created_at,
-                updated_at=verification.updated_at
-            )
-            
-            logger.info(
-                f"LOB verification complete",
-                verification_id=verification_id,
-                activity_level=output.activity_level,
-                flags_count=len(output.flags)
+        if not verification:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Verification record not found"
             )
-            
-            return output
         
-        finally:
-            db.close()
+        # Step 7: Format response (same validators as the read endpoints)
+        output = LOBVerificationOutput.model_validate(verification)
+        # A failed analysis leaves these unset; this endpoint reports it as pending
+        if not output.ai_response:
+            output.ai_response = "Analysis in progress..."
+        if not output.confidence_score:
+            output.confidence_score = "Low"
+        
+        logger.info(
+            "LOB verification complete",
+            verification_id=verification_id,
+            activity_level=output.activity_level,
+            flags_count=len(output.flags)
+        )
+        
+        return output
     
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error in LOB verification", error=str(e))
+        logger.error("Error in LOB verification", error=str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal server error: {str(e)}"
         )
 
 
+@router.post(
+    "/api/v1/lob/verify/async",
+    response_model=LOBVerificationStatus,
+    status_code=status.HTTP_202_ACCEPTED,
+    tags=["UC1"]
+)
+async def verify_lob_async(input_data: LOBVerificationInput, background_tasks: BackgroundTasks):
+    """
+    UC1: Line of Business Verification as a background job
+    
+    Stores a pending record and returns its ID right away; data collection
+    and AI analysis run after the response is sent. Poll
+    /api/v1/lob/{id}/status, then fetch the result from /api/v1/lob/{id}.
+    
+    Args:
+        input_data: LOB verification input (company, country, role, product)
+    
+    Returns:
+        Verification ID and job status
+    """
+    logger.info(
+        "LOB verification job request",
+        company=input_data.client,
+        country=input_data.client_country,
+        role=input_data.client_role
+    )
+    
+    input_dict = {
+        "client": input_data.client,
+        "client_country": input_data.client_country,
+        "client_role": input_data.client_role,
+        "product_name": input_data.product_name
+    }
+    
+    verification_id = create_pending_verification(data_storage, input_dict)
+    if not verification_id:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to store verification data"
+        )
+    
+    background_tasks.add_task(
+        run_lob_verification,
+        verification_id,
+        input_dict,
+        data_connector,
+        ai_service,
+        data_storage
+    )
+    
+    return LOBVerificationStatus(id=verification_id, status="pending")
+
+
+@router.get("/api/v1/lob/{verification_id}/status", response_model=LOBVerificationStatus, tags=["UC1"])
+async def get_lob_verification_status(verification_id: int, db: Session = Depends(get_db)):
+    """
+    Get the job status of a LOB verification
+    
+    Args:
+        verification_id: Verification record ID
+    
+    Returns:
+        Verification ID and job status
+    """
+    verification = _get_verification(db, verification_id)
+    
+    if not verification:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Verification {verification_id} not found"
+        )
+    
+    return LOBVerificationStatus(
+        id=verification.id,
+        status=get_job_status(verification.job_status, verification.ai_response),
+        error=verification.job_error,
+        created_at=verification.created_at,
+        updated_at=verification.updated_at
+    )
+
+
 @router.get("/api/v1/lob/{verification_id}", response_model=LOBVerificationOutput, tags=["UC1"])
-async def get_lob_verification(verification_id: int):
+async def get_lob_verification(
+    verification_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
     """
     Get LOB verification by ID
     
+    Responses carry an ETag derived from the record's updated_at; a request
+    whose If-None-Match still matches gets 304 Not Modified, checked with a
+    two-column query and no body.
+    
     Args:
         verification_id: Verification record ID
+        if_none_match: ETag(s) from a previous response
     
     Returns:
         LOB verification output
     """
-    SessionLocal, _ = get_session_factory()
-    db = SessionLocal()
+    if if_none_match:
+        updated_at = _get_verification_updated_at(db, verification_id)
+        if updated_at is not None:
+            etag = _verification_etag(verification_id, updated_at)
+            if _etag_matches(if_none_match, etag):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
     
-    try:
-        verification = db.query(LOBVerification).filter(
-            LOBVerification.id == verification_id
-        ).first()
-        
-        if not verification:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Verification {verification_id} not found"
-            )
-        
-        sources_list = verification.sources if isinstance(verification.sources, list) else [verification.sources] if verification.sources else []
-        sources_names = [s.get("name") if isinstance(s, dict) else str(s) for s in sources_list] if sources_list else []
-        
-        flags_list = verification.flags if isinstance(verification.flags, list) else [verification.flags] if verification.flags else []
-        
-        return LOBVerificationOutput(
-            id=verification.id,
-            ai_response=verification.ai_response or "",
-            website_source=verification.website_source,
-            publication_date=verification.publication_date,
-            activity_level=verification.activity_level or "Unknown",
-            flags=flags_list,
-            sources=sources_names,
-            confidence_score=verification.confidence_score,
-            is_red_flag=verification.is_red_flag,
-            created_at=verification.created_at,
-            updated_at=verification.updated_at
+    verification = _get_verification(db, verification_id)
+    
+    if not verification:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Verification {verification_id} not found"
         )
     
-    finally:
-        db.close()
+    response.headers["ETag"] = _verification_etag(verification.id, verification.updated_at)
+    return LOBVerificationOutput.model_validate(verification)
+
+
+class JSONStreamingResponse(StreamingResponse):
+    """JSON body streamed in chunks"""
+    media_type = "application/json"
+
+
+# Rows fetched (and serialized) per chunk of a streamed verification list
+_LIST_CHUNK_ROWS = 100
+
+
+def _serialize_verifications(verifications: List[LOBVerification]) -> List[bytes]:
+    """Serialize verification rows to JSON documents"""
+    return [
+        LOBVerificationOutput.model_validate(verification).model_dump_json().encode("utf-8")
+        for verification in verifications
+    ]
 
 
-@router.get("/api/v1/lob", response_model=List[LOBVerificationOutput], tags=["UC1"])
-async def list_lob_verifications(limit: int = 10, offset: int = 0):
+def _stream_verifications(first_chunk: List[bytes], rows: Any) -> Iterator[bytes]:
     """
-    List LOB verifications
+    Yield a JSON array of the already serialized first chunk, then the
+    remaining rows as they are fetched
+    """
+    yield b"["
+    yield b",".join(first_chunk)
+    separator = b"," if first_chunk else b""
+    while True:
+        chunk = rows.fetchmany(_LIST_CHUNK_ROWS)
+        if not chunk:
+            break
+        yield separator + b",".join(_serialize_verifications(chunk))
+        separator = b","
+    yield b"]"
+
+
+@router.get(
+    "/api/v1/lob",
+    response_class=JSONStreamingResponse,
+    responses={200: {"model": List[LOBVerificationOutput]}},
+    tags=["UC1"]
+)
+def list_lob_verifications(limit: int = 10, offset: int = 0, after_id: Optional[int] = None):
+    """
+    List LOB verifications (newest first)
+    
+    The JSON array is streamed while rows are read, so large pages are never
+    held in memory whole. The first chunk is read up front, so database
+    errors still return a 500.
     
     Args:
         limit: Maximum number of records to return
-        offset: Offset for pagination
+        offset: Offset for pagination (ignored when after_id is given)
+        after_id: Keyset pagination: only records with a lower ID, i.e. pass the
+            last ID of the previous page (avoids scanning skipped rows)
     
     Returns:
         List of LOB verification outputs
     """
+    # Only the response columns; client/input and freshness columns are never returned,
+    # and touching an unloaded column or relationship raises instead of lazy-loading.
+    # flags/sources are JSON columns, so each page is a single query; if they move to
+    # their own tables, batch-load them for the page with one IN (ids) query
+    stmt = lambda_stmt(lambda: (
+        select(LOBVerification)
+        .options(raiseload("*"), load_only(
+            LOBVerification.id,
+            LOBVerification.ai_response,
+            LOBVerification.website_source,
+            LOBVerification.publication_date,
+            LOBVerification.activity_level,
+            LOBVerification.flags,
+            LOBVerification.sources,
+            LOBVerification.confidence_score,
+            LOBVerification.is_red_flag,
+            LOBVerification.created_at,
+            LOBVerification.updated_at,
+            raiseload=True
+        ))
+        .order_by(LOBVerification.id.desc())
+    ))
+    if after_id is not None:
+        stmt += lambda s: s.where(LOBVerification.id < after_id)
+    else:
+        stmt += lambda s: s.offset(offset)
+    stmt += lambda s: s.limit(limit)
+    
+    # The session outlives the route (the body is produced after it returns)
+    # and is closed once the response has been sent
     SessionLocal, _ = get_session_factory()
     db = SessionLocal()
-    
     try:
-        verifications = db.query(LOBVerification).offset(offset).limit(limit).all()
-        
-        results = []
-        for v in verifications:
-            sources_list = v.sources if isinstance(v.sources, list) else [v.sources] if v.sources else []
-            sources_names = [s.get("name") if isinstance(s, dict) else str(s) for s in sources_list] if sources_list else []
-            
-            flags_list = v.flags if isinstance(v.flags, list) else [v.flags] if v.flags else []
-            
-            results.append(LOBVerificationOutput(
-                id=v.id,
-                ai_response=v.ai_response or "",
-                website_source=v.website_source,
-                publication_date=v.publication_date,
-                activity_level=v.activity_level or "Unknown",
-                flags=flags_list,
-                sources=sources_names,
-                confidence_score=v.confidence_score,
-                is_red_flag=v.is_red_flag,
-                created_at=v.created_at,
-                updated_at=v.updated_at
-            ))
-        
-        return results
-    
-    finally:
+        rows = db.scalars(stmt, execution_options={"yield_per": _LIST_CHUNK_ROWS})
+        # Fetched before the response starts, so connection and query errors
+        # give a 500 rather than a 200 with a truncated body
+        first_chunk = _serialize_verifications(rows.fetchmany(_LIST_CHUNK_ROWS))
+    except Exception as e:
         db.close()
-
+        logger.error("Error listing verifications", error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to list verifications"
+        )
+    
+    return JSONStreamingResponse(
+        _stream_verifications(first_chunk, rows),
+        background=BackgroundTask(db.close)
+    )
@@ -3,17 +3,21 @@ API Schemas (Pydantic Models)
 Request and response schemas for UC1 API endpoints
 """
 
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, Field, StringConstraints, field_validator
+from typing import Annotated, Optional, List, Literal, Dict, Any
 from datetime import datetime
 
 
+# Two-letter country code, upper-cased so downstream checks can compare directly
+CountryCode = Annotated[str, StringConstraints(min_length=2, max_length=2, to_upper=True)]
+
+
 # UC1 Input Schemas
 class LOBVerificationInput(BaseModel):
     """Input schema for LOB verification"""
     client: str = Field(..., description="Company name", min_length=1, max_length=255)
-    client_country: str = Field(..., description="Country code (ISO 3166-1 alpha-2)", min_length=2, max_length=2)
-    client_role: str = Field(..., description="Role: Import or Export", pattern="^(Import|Export)$")
+    client_country: CountryCode = Field(..., description="Country code (ISO 3166-1 alpha-2)")
+    client_role: Literal["Import", "Export"] = Field(..., description="Role: Import or Export")
     product_name: str = Field(..., description="Product name/category", min_length=1, max_length=500)
     
     class Config:
@@ -66,7 +70,35 @@ class LOBVerificationOutput(BaseModel):
     created_at: Optional[datetime] = Field(None, description="Record creation timestamp")
     updated_at: Optional[datetime] = Field(None, description="Record update timestamp")
     
+    @field_validator("ai_response", mode="before")
+    @classmethod
+    def _default_ai_response(cls, value: Any) -> Any:
+        """Unanalyzed records have no AI response yet"""
+        return "" if value is None else value
+    
+    @field_validator("activity_level", mode="before")
+    @classmethod
+    def _default_activity_level(cls, value: Any) -> Any:
+        """Unclassified records report Unknown"""
+        return value or "Unknown"
+    
+    @field_validator("flags", mode="before")
+    @classmethod
+    def _flags_as_list(cls, value: Any) -> Any:
+        """Stored flags may be a single value or missing"""
+        if isinstance(value, list):
+            return value
+        return [value] if value else []
+    
+    @field_validator("sources", mode="before")
+    @classmethod
+    def _source_names(cls, value: Any) -> Any:
+        """Stored sources may be source dicts; only their names are returned"""
+        sources_list = value if isinstance(value, list) else [value] if value else []
+        return [s.get("name") if isinstance(s, dict) else str(s) for s in sources_list]
+    
     class Config:
+        from_attributes = True
         json_schema_extra = {
             "example": {
                 "id": 1,
@@ -84,6 +116,25 @@ class LOBVerificationOutput(BaseModel):
         }
 
 
+class LOBVerificationStatus(BaseModel):
+    """Job status schema for background LOB verification"""
+    id: int = Field(..., description="Verification record ID")
+    status: str = Field(..., description="Job status: pending, running, completed, failed")
+    error: Optional[str] = Field(None, description="Why the job failed")
+    created_at: Optional[datetime] = Field(None, description="Record creation timestamp")
+    updated_at: Optional[datetime] = Field(None, description="Record update timestamp")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "id": 1,
+                "status": "pending",
+                "created_at": "2025-11-01T10:00:00Z",
+                "updated_at": "2025-11-01T10:00:00Z"
+            }
+        }
+
+
 class ErrorResponse(BaseModel):
     """Error response schema"""
     error: str = Field(..., description="Error message")
@@ -0,0 +1,33 @@
+"""
+Async helpers
+Running coroutines from synchronous code
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Coroutine, TypeVar
+
+T = TypeVar("T")
+
+
+def run_coroutine_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine to completion and return its result
+    
+    asyncio.run fails in a thread whose event loop is running (sync code
+    called from an async route or task), so there the coroutine runs on a
+    worker thread with its own loop while the caller waits.
+    
+    Args:
+        coro: Coroutine to run
+    
+    Returns:
+        The coroutine's result
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
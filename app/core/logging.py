@@ -1,9 +1,28 @@
 """Logging configuration"""
 
 import structlog
+import json
 import logging
 import sys
-from typing import Any
+from typing import Any, Callable, Optional
+
+try:
+    import orjson  # Optional: pip install orjson
+except ImportError:
+    orjson = None
+
+
+def _orjson_dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None, **kwargs: Any) -> str:
+    """
+    Serialize a log event with orjson
+    
+    Events orjson rejects (non-string keys, out-of-range integers) fall back
+    to json.dumps.
+    """
+    try:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_NAIVE_UTC).decode("utf-8")
+    except TypeError:
+        return json.dumps(obj, default=default, **kwargs)
 
 
 def setup_logging(level: str = "INFO") -> None:
@@ -31,7 +50,9 @@ def setup_logging(level: str = "INFO") -> None:
             structlog.processors.StackInfoRenderer(),
             structlog.processors.format_exc_info,
             structlog.processors.UnicodeDecoder(),
-            structlog.processors.JSONRenderer()
+            structlog.processors.JSONRenderer(
+                serializer=_orjson_dumps if orjson is not None else json.dumps
+            )
         ],
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
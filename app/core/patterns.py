@@ -0,0 +1,68 @@
+"""
+Regex patterns for untrusted text
+Uses the linear-time RE2 engine when google-re2 is installed
+"""
+
+import re
+from typing import Any, Iterator, List, Optional
+
+try:
+    import re2  # Optional: pip install google-re2
+except ImportError:
+    re2 = None
+
+# Python's \s on ASCII text; RE2's \s lacks \v and \x1c-\x1f
+_ASCII_WHITESPACE = r'[\t-\r\x1c-\x1f ]'
+
+
+class LinearPattern:
+    """
+    Compiled pattern that runs on RE2 for ASCII text
+    
+    RE2 guarantees time linear in the text, so scraped pages can't trigger
+    catastrophic backtracking. Its classes (\\w, \\d, \\b) are ASCII-only, so
+    non-ASCII text (and installs without re2) use the standard re engine;
+    on ASCII text both engines give the same matches.
+    
+    Patterns must not use \\s inside a character class.
+    """
+    
+    def __init__(self, pattern: str, flags: int = 0):
+        """
+        Compile pattern
+        
+        Args:
+            pattern: Regular expression
+            flags: re flags (only re.IGNORECASE carries over to RE2)
+        """
+        self.pattern = pattern
+        self._re = re.compile(pattern, flags)
+        self._re2 = None
+        
+        if re2 is not None:
+            re2_pattern = pattern.replace(r'\s', _ASCII_WHITESPACE)
+            if flags & re.IGNORECASE:
+                re2_pattern = "(?i)" + re2_pattern
+            self._re2 = re2.compile(re2_pattern)
+    
+    def _engine(self, text: str) -> Any:
+        """Pick the engine for text"""
+        if self._re2 is not None and text.isascii():
+            return self._re2
+        return self._re
+    
+    def search(self, text: str) -> Optional[Any]:
+        """Find the first match in text"""
+        return self._engine(text).search(text)
+    
+    def match(self, text: str) -> Optional[Any]:
+        """Match at the start of text"""
+        return self._engine(text).match(text)
+    
+    def findall(self, text: str) -> List[Any]:
+        """Find all non-overlapping matches in text"""
+        return self._engine(text).findall(text)
+    
+    def finditer(self, text: str) -> Iterator[Any]:
+        """Iterate over non-overlapping matches in text"""
+        return self._engine(text).finditer(text)
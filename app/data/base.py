@@ -2,9 +2,11 @@
 Base classes for data source connectors
 """
 
+import time
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Any
 from datetime import datetime
+from app.data.rate_limiter import create_rate_limiter
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -23,8 +25,9 @@ class DataSource(ABC):
         """
         self.name = name
         self.rate_limit = rate_limit
-        self.last_request_time: Optional[datetime] = None
+        self.last_request_time: Optional[float] = None  # time.monotonic() of the last request
         self.request_count = 0
+        self._rate_limiter = create_rate_limiter(name, rate_limit)
         
     @abstractmethod
     def fetch_data(self, query: Dict[str, Any]) -> Dict[str, Any]:
@@ -66,18 +69,10 @@ class DataSource(ABC):
         }
     
     def _rate_limit_check(self):
-        """Check and enforce rate limiting"""
-        # Simple rate limiting - can be enhanced
-        current_time = datetime.utcnow()
-        if self.last_request_time:
-            time_diff = (current_time - self.last_request_time).total_seconds()
-            min_interval = 60.0 / self.rate_limit
-            if time_diff < min_interval:
-                import time
-                sleep_time = min_interval - time_diff
-                time.sleep(sleep_time)
+        """Check and enforce rate limiting (shared across workers when REDIS_URL is set)"""
+        self._rate_limiter.acquire()
         
-        self.last_request_time = datetime.utcnow()
+        self.last_request_time = time.monotonic()
         self.request_count += 1
 
 
@@ -3,16 +3,21 @@ Company registry data fetcher
 Fetches company information from public registries
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
-import requests
 from app.data.base import DataSource, DataCollectionResult
-from app.data.sec_parser import get_sec_parser
+from app.data.http import get_http_client
+from app.data.ttl_cache import TTLCache
 from app.core.logging import get_logger
 import os
 
 logger = get_logger(__name__)
 
+# Registry lookups recur across verifications of the same company; misses
+# expire sooner so newly registered companies are picked up
+_REGISTRY_CACHE = TTLCache(maxsize=10000, ttl=6 * 3600)
+_REGISTRY_MISS_TTL = 15 * 60
+
 
 class CompanyRegistryFetcher(DataSource):
     """Fetches company data from public registries"""
@@ -30,7 +35,6 @@ class CompanyRegistryFetcher(DataSource):
             rate_limit: Maximum requests per minute
         """
         super().__init__(name, rate_limit)
-        self.session = requests.Session()
     
     def fetch_data(self, query: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -94,9 +98,10 @@ class CompanyRegistryFetcher(DataSource):
             Dictionary with company data or None
         """
         try:
-            logger.info(f"Fetching US registry data for: {company_name}")
+            logger.info("Fetching US registry data", company=company_name)
             
             # Get SEC parser instance (singleton, loads file once)
+            from app.data.sec_parser import get_sec_parser
             parser = get_sec_parser()
             
             if not parser.loaded:
@@ -105,14 +110,15 @@ class CompanyRegistryFetcher(DataSource):
             
             # Search for company
             # Try exact match first, then partial
-            matches = parser.search_company(company_name, exact_match=False, use_ticker=True)
+            matches = self._search_sec(parser, company_name)
             
             if matches:
                 # Return first matching company
                 company = matches[0]
                 
                 logger.info(
-                    f"SEC match found for: {company_name}",
+                    "SEC match found",
+                    company=company_name,
                     cik=company.get("cik"),
                     ticker=company.get("ticker"),
                     name=company.get("name")
@@ -130,7 +136,7 @@ class CompanyRegistryFetcher(DataSource):
                 }
             else:
                 # No match found
-                logger.info(f"No SEC match found for: {company_name}")
+                logger.info("No SEC match found", company=company_name)
                 return {
                     "source": "SEC EDGAR",
                     "company_name": company_name,
@@ -139,7 +145,7 @@ class CompanyRegistryFetcher(DataSource):
                 }
                 
         except Exception as e:
-            logger.error(f"Error fetching US registry data", error=str(e), exc_info=True)
+            logger.error("Error fetching US registry data", error=str(e), exc_info=True)
             return {
                 "source": "SEC EDGAR",
                 "company_name": company_name,
@@ -147,6 +153,38 @@ class CompanyRegistryFetcher(DataSource):
                 "note": "Error occurred while checking SEC EDGAR database"
             }
     
+    def _search_sec(self, parser: Any, company_name: str) -> List[Dict[str, Any]]:
+        """
+        Search SEC EDGAR companies, caching results by search term
+        
+        A ticker or exact (normalized) name match is a dict lookup; only other
+        names go through the partial-match scan of search_company.
+        
+        Args:
+            parser: Loaded SEC parser
+            company_name: Company name or ticker
+        
+        Returns:
+            List of matching company records
+        """
+        company = parser.find_exact(company_name)
+        if company is not None:
+            return [company]
+        
+        # search_company only depends on the stripped name, case-insensitively
+        key = "sec:" + company_name.strip().lower()
+        cached = _REGISTRY_CACHE.get(key)
+        if cached is not None:
+            return cached["matches"]
+        
+        matches = parser.search_company(company_name, exact_match=False, use_ticker=True)
+        _REGISTRY_CACHE.set(
+            key,
+            {"matches": matches},
+            ttl=None if matches else _REGISTRY_MISS_TTL
+        )
+        return matches
+    
     def _fetch_uk_registry(self, company_name: str) -> Optional[Dict[str, Any]]:
         """
         Fetch data from UK Companies House
@@ -158,7 +196,7 @@ class CompanyRegistryFetcher(DataSource):
             Dictionary with company data or None
         """
         try:
-            logger.info(f"Fetching UK registry data for: {company_name}")
+            logger.info("Fetching UK registry data", company=company_name)
             
             # Companies House API would require API key
             # Placeholder for structure
@@ -169,7 +207,7 @@ class CompanyRegistryFetcher(DataSource):
                 "note": "Companies House API integration required (API key needed)"
             }
         except Exception as e:
-            logger.error(f"Error fetching UK registry data", error=str(e))
+            logger.error("Error fetching UK registry data", error=str(e))
             return None
     
     def _fetch_au_registry(self, company_name: str) -> Optional[Dict[str, Any]]:
@@ -183,7 +221,7 @@ class CompanyRegistryFetcher(DataSource):
             Dictionary with company data or None
         """
         try:
-            logger.info(f"Fetching AU registry data for: {company_name}")
+            logger.info("Fetching AU registry data", company=company_name)
             
             # ASIC has limited public API access
             return {
@@ -193,7 +231,7 @@ class CompanyRegistryFetcher(DataSource):
                 "note": "ASIC API integration required"
             }
         except Exception as e:
-            logger.error(f"Error fetching AU registry data", error=str(e))
+            logger.error("Error fetching AU registry data", error=str(e))
             return None
     
     def _fetch_opencorporates(
@@ -219,6 +257,11 @@ class CompanyRegistryFetcher(DataSource):
                 logger.info("OpenCorporates API token not configured, skipping")
                 return None
             
+            key = f"opencorporates:{country.lower()}:{company_name}"
+            cached = _REGISTRY_CACHE.get(key)
+            if cached is not None:
+                return cached["company"]
+            
             # Build API URL
             base_url = "https://api.opencorporates.com/v0.4/companies/search"
             params = {
@@ -227,7 +270,7 @@ class CompanyRegistryFetcher(DataSource):
                 "api_token": api_token
             }
             
-            response = self.session.get(base_url, params=params, timeout=30)
+            response = get_http_client().get(base_url, params=params)
             
             if response.status_code == 200:
                 data = response.json()
@@ -236,7 +279,7 @@ class CompanyRegistryFetcher(DataSource):
                 if companies:
                     # Return first matching company
                     company = companies[0]["company"]
-                    return {
+                    result = {
                         "source": "OpenCorporates",
                         "company_name": company.get("name"),
                         "company_number": company.get("company_number"),
@@ -244,11 +287,16 @@ class CompanyRegistryFetcher(DataSource):
                         "status": company.get("current_status"),
                         "opencorporates_url": company.get("opencorporates_url")
                     }
+                    _REGISTRY_CACHE.set(key, {"company": result})
+                    return result
+                
+                # Only a successful search with no results is cached, not API errors
+                _REGISTRY_CACHE.set(key, {"company": None}, ttl=_REGISTRY_MISS_TTL)
             
             return None
             
         except Exception as e:
-            logger.error(f"Error fetching OpenCorporates data", error=str(e))
+            logger.error("Error fetching OpenCorporates data", error=str(e))
             return None
     
     def validate_data(self, data: Dict[str, Any]) -> bool:
@@ -3,21 +3,33 @@ Data source connector architecture
 Manages multiple data sources and orchestrates data collection
 """
 
-from typing import Dict, List, Optional, Any
+import asyncio
+from collections import ChainMap, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Dict, List, Optional, Any, Tuple
 from datetime import datetime
 from app.data.base import DataSource, DataCollectionResult
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Most recent collection results kept in collection_history
+MAX_COLLECTION_HISTORY = 10_000
+
 
 class DataConnector:
     """Manages multiple data sources and coordinates data collection"""
     
-    def __init__(self):
-        """Initialize the data connector"""
+    def __init__(self, max_workers: int = 8):
+        """
+        Initialize the data connector
+        
+        Args:
+            max_workers: Maximum sources collected in parallel by collect_from_all_sources
+        """
         self.sources: Dict[str, DataSource] = {}
-        self.collection_history: List[DataCollectionResult] = []
+        self.collection_history: Deque[DataCollectionResult] = deque(maxlen=MAX_COLLECTION_HISTORY)
+        self.max_workers = max_workers
     
     def register_source(self, source: DataSource):
         """
@@ -27,7 +39,7 @@ class DataConnector:
             source: Data source instance to register
         """
         self.sources[source.name] = source
-        logger.info(f"Registered data source: {source.name}")
+        logger.info("Registered data source", source=source.name)
     
     def collect_from_all_sources(
         self,
@@ -37,6 +49,9 @@ class DataConnector:
         """
         Collect data from all registered sources (or specified sources)
         
+        Sources are I/O-bound, so they run in parallel on a thread pool and the
+        total latency is that of the slowest source. Results keep source order.
+        
         Args:
             query: Query parameters (client, country, product, etc.)
             sources: Optional list of source names to use (if None, use all)
@@ -44,72 +59,152 @@ class DataConnector:
         Returns:
             List of DataCollectionResult objects
         """
-        results = []
-        
         # Determine which sources to use
         sources_to_use = sources or list(self.sources.keys())
         
-        logger.info(f"Collecting data from {len(sources_to_use)} sources", 
+        logger.info("Collecting data from sources", 
+                   sources=sources_to_use, query=query)
+        
+        # Resolve each name once; unregistered names never reach the pool
+        resolved = [(source_name, self.sources.get(source_name)) for source_name in sources_to_use]
+        valid = [(source_name, source) for source_name, source in resolved if source is not None]
+        
+        if len(valid) <= 1:
+            collected = [self._collect_from_source(source_name, source, query) for source_name, source in valid]
+        else:
+            max_workers = min(len(valid), self.max_workers)
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="data-collect") as executor:
+                collected = list(executor.map(
+                    lambda pair: self._collect_from_source(pair[0], pair[1], query),
+                    valid
+                ))
+        
+        results = self._merge_in_source_order(resolved, collected)
+        
+        # Store in history
+        self.collection_history.extend(results)
+        
+        return results
+    
+    async def collect_from_all_sources_async(
+        self,
+        query: Dict[str, Any],
+        sources: Optional[List[str]] = None
+    ) -> List[DataCollectionResult]:
+        """
+        Collect data from all registered sources concurrently
+        
+        Sources are blocking (requests-based), so each runs in a worker
+        thread and their network latency overlaps. Results keep source order.
+        
+        Args:
+            query: Query parameters (client, country, product, etc.)
+            sources: Optional list of source names to use (if None, use all)
+        
+        Returns:
+            List of DataCollectionResult objects
+        """
+        sources_to_use = sources or list(self.sources.keys())
+        
+        logger.info("Collecting data from sources concurrently", 
                    sources=sources_to_use, query=query)
         
-        for source_name in sources_to_use:
-            if source_name not in self.sources:
-                logger.warning(f"Source not found: {source_name}")
+        resolved = [(source_name, self.sources.get(source_name)) for source_name in sources_to_use]
+        collected = await asyncio.gather(*(
+            asyncio.to_thread(self._collect_from_source, source_name, source, query)
+            for source_name, source in resolved if source is not None
+        ))
+        results = self._merge_in_source_order(resolved, collected)
+        
+        # Store in history
+        self.collection_history.extend(results)
+        
+        return results
+    
+    def _merge_in_source_order(
+        self,
+        resolved: List[Tuple[str, Optional[DataSource]]],
+        collected: List[DataCollectionResult]
+    ) -> List[DataCollectionResult]:
+        """
+        Interleave results of registered sources with failures for unknown names
+        
+        Args:
+            resolved: (name, source or None) pairs in requested order
+            collected: Results for the registered sources, in the same order
+        
+        Returns:
+            One result per requested name, in requested order
+        """
+        collected_iter = iter(collected)
+        results = []
+        for source_name, source in resolved:
+            if source is not None:
+                results.append(next(collected_iter))
+            else:
+                logger.warning("Source not found", source=source_name)
                 results.append(DataCollectionResult(
                     source=source_name,
                     success=False,
                     error=f"Source '{source_name}' not registered"
                 ))
-                continue
-            
-            source = self.sources[source_name]
+        return results
+    
+    def _collect_from_source(
+        self,
+        source_name: str,
+        source: DataSource,
+        query: Dict[str, Any]
+    ) -> DataCollectionResult:
+        """
+        Collect and validate data from one registered source
+        
+        Errors become failed results rather than raising.
+        """
+        try:
+            # Collect data from source
+            data = source.fetch_data(query)
             
-            try:
-                # Collect data from source
-                data = source.fetch_data(query)
-                
-                # Validate data
-                if source.validate_data(data):
-                    result = DataCollectionResult(
-                        source=source_name,
-                        success=True,
-                        data=data,
-                        timestamp=datetime.utcnow()
-                    )
-                else:
-                    result = DataCollectionResult(
-                        source=source_name,
-                        success=False,
-                        error="Data validation failed"
-                    )
-                
-                results.append(result)
-                logger.info(f"Collected data from {source_name}", 
-                           success=result.success)
-                
-            except Exception as e:
-                logger.error(f"Error collecting from {source_name}", 
-                           error=str(e), exc_info=True)
-                results.append(DataCollectionResult(
+            # Validate data
+            if source.validate_data(data):
+                result = DataCollectionResult(
+                    source=source_name,
+                    success=True,
+                    data=data,
+                    timestamp=datetime.utcnow()
+                )
+            else:
+                result = DataCollectionResult(
                     source=source_name,
                     success=False,
-                    error=str(e)
-                ))
-        
-        # Store in history
-        self.collection_history.extend(results)
+                    error="Data validation failed"
+                )
+            
+            logger.info("Collected data from source", 
+                       source=source_name, success=result.success)
+            return result
         
-        return results
+        except Exception as e:
+            logger.error("Error collecting from source", source=source_name,
+                       error=str(e), exc_info=True)
+            return DataCollectionResult(
+                source=source_name,
+                success=False,
+                error=str(e)
+            )
     
     def aggregate_results(
         self,
-        results: List[DataCollectionResult]
+        results: List[DataCollectionResult],
+        copy_data: bool = True
     ) -> Dict[str, Any]:
         """
         Aggregate data from multiple sources
         
         Args:
             results: List of DataCollectionResult objects
+            copy_data: Merge source data into a new dict; when False, "data" is a
+                read-only ChainMap view over the sources' dicts (no keys copied)
         
         Returns:
             Aggregated data dictionary
@@ -122,6 +217,7 @@ class DataConnector:
             "total_count": len(results)
         }
         
+        successful_data = []
         for result in results:
             source_info = {
                 "name": result.source,
@@ -130,14 +226,21 @@ class DataConnector:
             }
             
             if result.success and result.data:
-                # Merge successful results
-                aggregated["data"].update(result.data)
-                aggregated["success_count"] += 1
+                successful_data.append(result.data)
             else:
                 source_info["error"] = result.error
             
             aggregated["sources"].append(source_info)
         
+        aggregated["success_count"] = len(successful_data)
+        
+        # Merge successful results (later sources win on shared keys)
+        if copy_data:
+            for data in successful_data:
+                aggregated["data"].update(data)
+        else:
+            aggregated["data"] = ChainMap(*reversed(successful_data))
+        
         return aggregated
     
     def get_source_info(self) -> List[Dict[str, Any]]:
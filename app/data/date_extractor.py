@@ -3,25 +3,199 @@ Publication Date Extractor
 Extracts publication dates from scraped website content
 """
 
+import asyncio
 import re
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Union
 from datetime import datetime
 from bs4 import BeautifulSoup
-import requests
+import httpx
+from lxml import etree
+
+try:
+    from orjson import loads as json_loads  # Optional: pip install orjson
+except ImportError:
+    from json import loads as json_loads
+
+from app.core.async_utils import run_coroutine_sync
 from app.core.logging import get_logger
+from app.core.patterns import LinearPattern
+from app.data.error_handling import RetryConfig, aretry_with_backoff, retry_with_backoff
+from app.data.http import get_http_client
 
 logger = get_logger(__name__)
 
+# Common date formats as one alternation, so page text is scanned once (linear
+# time with RE2); where several formats match at the same spot, the earlier wins
+_CONTENT_DATE_PATTERN = LinearPattern(
+    r'(?P<dmy>\d{1,2}[/-]\d{1,2}[/-]\d{4})'              # MM/DD/YYYY or DD/MM/YYYY
+    r'|(?P<ymd>\d{4}[/-]\d{1,2}[/-]\d{1,2})'             # YYYY/MM/DD
+    r'|(?P<published>Published.*?\d{1,2}\s+\w+\s+\d{4})'  # Published: DD Month YYYY
+    r'|(?P<updated>Updated.*?\d{1,2}\s+\w+\s+\d{4})'      # Updated: DD Month YYYY
+    r'|(?P<mdy>\w+\s+\d{1,2},?\s+\d{4})',                  # Month DD, YYYY
+    re.IGNORECASE
+)
+_COPYRIGHT_PATTERN = LinearPattern(r'Copyright.*?(\d{4})', re.IGNORECASE)
+_YEAR_PATTERN = re.compile(r'(\d{4})')
+_ISO_DATE = re.compile(r'^(\d{4})-(\d{1,2})-(\d{1,2})')
+
+# Meta tags holding the publication date, by priority
+_META_DATE_TAGS = (
+    ('property', 'article:published_time'),
+    ('property', 'og:published_time'),
+    ('name', 'datePublished'),
+    ('name', 'DC.date'),
+)
+_META_DATE_PRIORITY = {key: priority for priority, key in enumerate(_META_DATE_TAGS)}
+
+
+# Formats tried (in order) for dates that aren't ISO; ISO dates (with or
+# without a time) take the _ISO_DATE fast path instead
+_DATE_FORMATS = (
+    '%Y/%m/%d',
+    '%d/%m/%Y',
+    '%m/%d/%Y',
+    '%B %d, %Y',
+    '%b %d, %Y',
+    '%d %B %Y',
+    '%d %b %Y',
+)
+
+
+@lru_cache(maxsize=4096)
+def _normalize_date_cached(date_str: str) -> str:
+    """
+    Normalize a non-empty date string (memoized; pages repeat the same dates)
+    
+    Args:
+        date_str: Date string in various formats
+    
+    Returns:
+        ISO date, or the stripped input if no format matches
+    """
+    # Clean up the string
+    date_str = date_str.strip()
+    if not date_str:
+        return date_str
+    
+    # ISO format (time, if present, is dropped) without any strptime attempts
+    match = _ISO_DATE.match(date_str)
+    if match:
+        year, month, day = match.groups()
+        return f"{year}-{int(month):02d}-{int(day):02d}"
+    
+    # Try parsing common formats
+    date_part = date_str.split('T')[0].split()[0]
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(date_part, fmt).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    
+    # If can't parse, return as-is (might be useful)
+    return date_str
+
+
+class _HeadDateTarget:
+    """lxml parser target recording publication-date meta tags until <head> ends"""
+    
+    def __init__(self):
+        """Initialize target"""
+        self.content: Optional[str] = None
+        self.priority = len(_META_DATE_TAGS)
+        self.done = False
+    
+    def start(self, tag: str, attrib: Dict[str, str]):
+        """Handle an opening tag"""
+        if tag == 'body':
+            self.done = True
+        elif tag == 'meta' and attrib.get('content'):
+            for attr in ('property', 'name'):
+                priority = _META_DATE_PRIORITY.get((attr, attrib.get(attr)), self.priority)
+                if priority < self.priority:
+                    self.content, self.priority = attrib['content'], priority
+            if self.priority == 0:
+                self.done = True  # Nothing outranks article:published_time
+    
+    def end(self, tag: str):
+        """Handle a closing tag"""
+        if tag == 'head':
+            self.done = True
+    
+    def data(self, data: str):
+        """Ignore text"""
+    
+    def close(self) -> Optional[str]:
+        """Finish parsing"""
+        return self.content
+
+
+class _HeadDateScanner:
+    """
+    Incremental parse of a page's <head> while it downloads
+    
+    Fetches stop reading once the head's meta tags give a date; otherwise the
+    collected body is parsed in full. Meta tags misplaced in <body> are only
+    seen by the full parse.
+    """
+    
+    def __init__(self):
+        """Initialize scanner"""
+        self.chunks: List[bytes] = []
+        self._target = _HeadDateTarget()
+        self._parser = etree.HTMLParser(target=self._target)
+    
+    def feed(self, chunk: bytes) -> Optional[str]:
+        """
+        Add a chunk of the body
+        
+        Returns:
+            Normalized date once <head> has given one, else None
+        """
+        self.chunks.append(chunk)
+        if self._target.done:
+            return None
+        
+        try:
+            self._parser.feed(chunk)
+        except etree.Error:
+            self._target.done = True
+            return None
+        
+        if self._target.done and self._target.content:
+            return _normalize_date_cached(self._target.content) or None
+        return None
+    
+    @property
+    def body(self) -> bytes:
+        """Body bytes read so far"""
+        return b''.join(self.chunks)
+
+
+_USER_AGENT = "Mozilla/5.0 (TBAML-System/1.0) Compatible Bot"
+
+# Bytes read per step when streaming pages
+_STREAM_CHUNK_SIZE = 8192
+
+# Max pages fetched at once by update_publication_dates
+_FETCH_CONCURRENCY = 50
+
+# Rows per bulk UPDATE in update_publication_dates
+_UPDATE_BATCH_SIZE = 1000
+
 
 class PublicationDateExtractor:
     """Extracts publication dates from websites"""
     
     def __init__(self):
         """Initialize date extractor"""
-        self.session = requests.Session()
-        self.session.headers.update({
-            "User-Agent": "Mozilla/5.0 (TBAML-System/1.0) Compatible Bot"
-        })
+        # Pages are fetched over the shared pooled client; connection
+        # failures get two quick retries
+        self.retry_config = RetryConfig(
+            max_retries=2,
+            initial_delay=0.5,
+            retryable_exceptions=(httpx.TransportError,)
+        )
     
     def extract_from_url(self, url: str) -> Optional[str]:
         """
@@ -37,71 +211,174 @@ class PublicationDateExtractor:
             return None
         
         try:
-            logger.info(f"Extracting publication date from: {url}")
-            response = self.session.get(url, timeout=10, allow_redirects=True)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Method 1: Check meta tags
-            date = self._extract_from_meta_tags(soup)
-            if date:
-                return date
-            
-            # Method 2: Check structured data (JSON-LD, schema.org)
-            date = self._extract_from_structured_data(soup)
-            if date:
-                return date
-            
-            # Method 3: Look for date patterns in content
-            date = self._extract_from_content(soup)
-            if date:
-                return date
-            
-            # Method 4: Check article dates, copyright, etc.
-            date = self._extract_from_common_patterns(soup)
-            if date:
-                return date
-            
-            logger.debug(f"Could not extract date from {url}")
-            return None
+            logger.info("Extracting publication date", url=url)
+            date = retry_with_backoff(
+                lambda: self._stream_date(url),
+                self.retry_config,
+                context={"url": url}
+            )
+            if not date:
+                logger.debug("Could not extract date", url=url)
+            return date
             
         except Exception as e:
-            logger.error(f"Error extracting date from {url}", error=str(e))
+            logger.error("Error extracting date", url=url, error=str(e))
             return None
     
-    def _extract_from_meta_tags(self, soup: BeautifulSoup) -> Optional[str]:
-        """Extract date from meta tags"""
-        # Check article:published_time
-        meta = soup.find('meta', property='article:published_time')
-        if meta and meta.get('content'):
-            return self._normalize_date(meta['content'])
-        
-        # Check og:published_time
-        meta = soup.find('meta', property='og:published_time')
-        if meta and meta.get('content'):
-            return self._normalize_date(meta['content'])
-        
-        # Check datePublished
-        meta = soup.find('meta', attrs={'name': 'datePublished'})
-        if meta and meta.get('content'):
-            return self._normalize_date(meta['content'])
-        
-        # Check DC.date
-        meta = soup.find('meta', attrs={'name': 'DC.date'})
-        if meta and meta.get('content'):
-            return self._normalize_date(meta['content'])
+    def _stream_date(self, url: str) -> Optional[str]:
+        """
+        Stream a page and extract its date, stopping early at a <head> meta tag
+        
+        Args:
+            url: Website URL
+        
+        Returns:
+            Publication date string or None
+        """
+        scanner = _HeadDateScanner()
+        with get_http_client().stream(
+            "GET",
+            url,
+            headers={"User-Agent": _USER_AGENT},
+            timeout=10.0,
+            follow_redirects=True
+        ) as response:
+            response.raise_for_status()
+            for chunk in response.iter_bytes(_STREAM_CHUNK_SIZE):
+                date = scanner.feed(chunk)
+                if date:
+                    return date  # The rest of the body is never downloaded
+        
+        return self._extract_from_html(scanner.body)
+    
+    def _extract_from_html(self, content: bytes) -> Optional[str]:
+        """
+        Extract publication date from page HTML
+        
+        Args:
+            content: Raw page content
+        
+        Returns:
+            Publication date string or None
+        """
+        soup = BeautifulSoup(content, 'lxml')
+        
+        # Method 1: Check meta tags
+        date = self._extract_from_meta_tags(soup)
+        if date:
+            return date
+        
+        # Method 2: Check structured data (JSON-LD, schema.org)
+        date = self._extract_from_structured_data(soup)
+        if date:
+            return date
+        
+        # Method 3: Look for date patterns in content
+        date = self._extract_from_content(soup)
+        if date:
+            return date
+        
+        # Method 4: Check article dates, copyright, etc.
+        date = self._extract_from_common_patterns(soup)
+        if date:
+            return date
         
         return None
     
+    async def _fetch_and_extract(self, client: httpx.AsyncClient, url: str) -> Optional[str]:
+        """
+        Fetch a page over the async client and extract its publication date
+        
+        Args:
+            client: Pooled async HTTP client
+            url: Website URL
+        
+        Returns:
+            Publication date string or None
+        
+        Raises:
+            Exception: If the page could not be fetched
+        """
+        date = await aretry_with_backoff(
+            lambda: self._stream_date_async(client, url),
+            self.retry_config,
+            context={"url": url}
+        )
+        if not date:
+            logger.debug("Could not extract date", url=url)
+        return date
+    
+    async def _stream_date_async(self, client: httpx.AsyncClient, url: str) -> Optional[str]:
+        """Async _stream_date over the given client"""
+        scanner = _HeadDateScanner()
+        async with client.stream("GET", url) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes(_STREAM_CHUNK_SIZE):
+                date = scanner.feed(chunk)
+                if date:
+                    return date  # The rest of the body is never downloaded
+        
+        return self._extract_from_html(scanner.body)
+    
+    async def _extract_dates_async(self, urls: List[str]) -> List[Union[str, None, Exception]]:
+        """
+        Extract publication dates for many URLs concurrently
+        
+        Args:
+            urls: Website URLs
+        
+        Returns:
+            Publication date (or None) for each URL, in order; the exception
+            for pages that could not be fetched
+        """
+        options = {
+            "headers": {"User-Agent": _USER_AGENT},
+            "timeout": 10.0,
+            "follow_redirects": True,
+            "limits": httpx.Limits(max_connections=_FETCH_CONCURRENCY)
+        }
+        try:
+            client = httpx.AsyncClient(http2=True, **options)
+        except ImportError:
+            client = httpx.AsyncClient(**options)
+        
+        semaphore = asyncio.Semaphore(_FETCH_CONCURRENCY)
+        
+        async def bounded(url: str) -> Optional[str]:
+            async with semaphore:
+                return await self._fetch_and_extract(client, url)
+        
+        async with client:
+            return await asyncio.gather(*(bounded(url) for url in urls), return_exceptions=True)
+    
+    def _extract_from_meta_tags(self, soup: BeautifulSoup) -> Optional[str]:
+        """Extract date from meta tags (in _META_DATE_TAGS priority order)"""
+        # One pass over the meta tags, keeping the highest-priority content seen
+        best_content = None
+        best_priority = len(_META_DATE_TAGS)
+        for meta in soup.find_all('meta', content=True):
+            if not meta['content']:
+                continue
+            for attr in ('property', 'name'):
+                priority = _META_DATE_PRIORITY.get((attr, meta.get(attr)), best_priority)
+                if priority < best_priority:
+                    best_content, best_priority = meta['content'], priority
+            if best_priority == 0:
+                break  # Nothing outranks article:published_time
+        
+        if best_content is None:
+            return None
+        return self._normalize_date(best_content)
+    
     def _extract_from_structured_data(self, soup: BeautifulSoup) -> Optional[str]:
         """Extract date from structured data (JSON-LD, schema.org)"""
         # Look for JSON-LD scripts
         scripts = soup.find_all('script', type='application/ld+json')
         for script in scripts:
+            if not script.string:
+                continue
             try:
-                import json
-                data = json.loads(script.string)
+                data = json_loads(str(script.string))  # orjson rejects str subclasses
                 
                 # Check for datePublished
                 if isinstance(data, dict):
@@ -114,8 +391,8 @@ class PublicationDateExtractor:
                         for item in data['@graph']:
                             if 'datePublished' in item:
                                 return self._normalize_date(item['datePublished'])
-            except Exception:
-                continue
+            except (ValueError, TypeError, AttributeError):
+                continue  # Malformed JSON-LD or unexpected value types
         
         return None
     
@@ -123,25 +400,14 @@ class PublicationDateExtractor:
         """Extract date from page content using patterns"""
         text = soup.get_text()
         
-        # Common date patterns
-        patterns = [
-            r'(\d{1,2}[/-]\d{1,2}[/-]\d{4})',  # MM/DD/YYYY or DD/MM/YYYY
-            r'(\d{4}[/-]\d{1,2}[/-]\d{1,2})',  # YYYY/MM/DD
-            r'(Published.*?(\d{1,2}\s+\w+\s+\d{4}))',  # Published: DD Month YYYY
-            r'(Updated.*?(\d{1,2}\s+\w+\s+\d{4}))',   # Updated: DD Month YYYY
-            r'(\w+\s+\d{1,2},?\s+\d{4})',             # Month DD, YYYY
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                date_str = match.group(1) if len(match.groups()) > 0 else match.group(0)
-                try:
-                    normalized = self._normalize_date(date_str)
-                    if normalized:
-                        return normalized
-                except Exception:
-                    continue
+        # Earliest date on the page; each match is exactly one of the named formats
+        for match in _CONTENT_DATE_PATTERN.finditer(text):
+            try:
+                normalized = self._normalize_date(match.group(0))
+                if normalized:
+                    return normalized
+            except Exception:
+                continue
         
         return None
     
@@ -157,9 +423,9 @@ class PublicationDateExtractor:
                 return self._normalize_date(time_tag.string)
         
         # Check copyright year (fallback)
-        copyright = soup.find(string=re.compile(r'Copyright.*?(\d{4})', re.IGNORECASE))
+        copyright = soup.find(string=lambda string: bool(string and _COPYRIGHT_PATTERN.search(string)))
         if copyright:
-            match = re.search(r'(\d{4})', copyright)
+            match = _YEAR_PATTERN.search(copyright)
             if match:
                 year = match.group(1)
                 # Use current year as fallback (not ideal but better than nothing)
@@ -179,38 +445,7 @@ class PublicationDateExtractor:
         """
         if not date_str:
             return None
-        
-        # Clean up the string
-        date_str = date_str.strip()
-        
-        # If already in ISO format
-        if re.match(r'^\d{4}-\d{2}-\d{2}', date_str):
-            return date_str.split('T')[0]  # Remove time if present
-        
-        # Try parsing common formats
-        formats = [
-            '%Y-%m-%d',
-            '%Y/%m/%d',
-            '%d/%m/%Y',
-            '%m/%d/%Y',
-            '%B %d, %Y',
-            '%b %d, %Y',
-            '%d %B %Y',
-            '%d %b %Y',
-            '%Y-%m-%dT%H:%M:%S',
-            '%Y-%m-%dT%H:%M:%SZ',
-            '%Y-%m-%d %H:%M:%S',
-        ]
-        
-        for fmt in formats:
-            try:
-                dt = datetime.strptime(date_str.split('T')[0].split()[0], fmt if '%H' not in fmt else fmt.split('T')[0].split()[0])
-                return dt.strftime('%Y-%m-%d')
-            except (ValueError, IndexError):
-                continue
-        
-        # If can't parse, return as-is (might be useful)
-        return date_str
+        return _normalize_date_cached(date_str)
     
     def update_publication_dates(self, verification_ids: Optional[list] = None) -> Dict[str, Any]:
         """
@@ -236,7 +471,7 @@ class PublicationDateExtractor:
         }
         
         try:
-            query = db.query(LOBVerification)
+            query = db.query(LOBVerification.id, LOBVerification.client, LOBVerification.website_source)
             
             if verification_ids:
                 query = query.filter(LOBVerification.id.in_(verification_ids))
@@ -248,27 +483,39 @@ class PublicationDateExtractor:
             
             stats["total"] = len(verifications)
             
-            logger.info(f"Updating publication dates for {stats['total']} verifications")
+            logger.info("Updating publication dates", total=stats["total"])
             
+            # Fetch each distinct page once (verifications often share a website),
+            # concurrently, then apply the results in one transaction
+            urls = list(dict.fromkeys(v.website_source for v in verifications))
+            url_to_date = dict(zip(urls, run_coroutine_sync(self._extract_dates_async(urls))))
+            
+            updates = []
+            updated_clients = []
             for v in verifications:
-                try:
-                    date = self.extract_from_url(v.website_source)
-                    if date:
-                        v.publication_date = date
-                        stats["updated"] += 1
-                        logger.info(f"Updated date for {v.client}: {date}")
-                    else:
-                        stats["skipped"] += 1
-                except Exception as e:
+                date = url_to_date[v.website_source]
+                if isinstance(date, Exception):
                     stats["errors"] += 1
-                    logger.error(f"Error updating date for {v.client}", error=str(e))
+                    logger.error("Error updating date", company=v.client, error=str(date))
+                elif date:
+                    updates.append({"id": v.id, "publication_date": date})
+                    updated_clients.append((v.client, date))
+                else:
+                    stats["skipped"] += 1
+            
+            # UPDATE ... WHERE id = :id executemany, in bounded batches
+            for start in range(0, len(updates), _UPDATE_BATCH_SIZE):
+                db.bulk_update_mappings(LOBVerification, updates[start:start + _UPDATE_BATCH_SIZE])
             
             db.commit()
-            logger.info(f"Publication date update complete: {stats['updated']}/{stats['total']} updated")
+            stats["updated"] = len(updates)
+            for client, date in updated_clients:
+                logger.info("Updated publication date", company=client, date=date)
+            logger.info("Publication date update complete", updated=stats["updated"], total=stats["total"])
             
         except Exception as e:
             db.rollback()
-            logger.error(f"Error updating publication dates", error=str(e))
+            logger.error("Error updating publication dates", error=str(e))
         finally:
             db.close()
         
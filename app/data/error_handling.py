@@ -2,13 +2,18 @@
 Error handling and retry logic for data collection
 """
 
-from typing import Callable, Any, Optional, Dict
+import asyncio
+from collections import Counter, deque
+from typing import Awaitable, Callable, Any, Deque, List, Optional, Dict
 from datetime import datetime, timedelta
 import time
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Most recent errors kept in ErrorHandler.error_log
+MAX_ERROR_LOG = 10_000
+
 
 class RetryConfig:
     """Configuration for retry logic"""
@@ -38,6 +43,14 @@ class RetryConfig:
         self.retryable_exceptions = retryable_exceptions
 
 
+def _backoff_delays(config: RetryConfig) -> List[float]:
+    """Delay before each retry: exponential from initial_delay, capped at max_delay"""
+    return [
+        min(config.initial_delay * config.exponential_base ** attempt, config.max_delay)
+        for attempt in range(config.max_retries)
+    ]
+
+
 def retry_with_backoff(
     func: Callable,
     retry_config: Optional[RetryConfig] = None,
@@ -59,43 +72,90 @@ def retry_with_backoff(
     """
     config = retry_config or RetryConfig()
     context = context or {}
-    
-    last_exception = None
-    delay = config.initial_delay
+    delays = _backoff_delays(config)
     
     for attempt in range(config.max_retries + 1):
         try:
             result = func()
             if attempt > 0:
-                logger.info(f"Function succeeded after {attempt} retries", 
-                           **context)
+                logger.info("Function succeeded after retries", retries=attempt, **context)
             return result
             
         except config.retryable_exceptions as e:
-            last_exception = e
+            if attempt < config.max_retries:
+                logger.warning(
+                    "Attempt failed, retrying",
+                    attempt=attempt + 1,
+                    max_attempts=config.max_retries + 1,
+                    delay=round(delays[attempt], 2),
+                    error=str(e),
+                    **context
+                )
+                time.sleep(delays[attempt])
+            else:
+                logger.error(
+                    "All attempts failed",
+                    attempts=config.max_retries + 1,
+                    error=str(e),
+                    **context
+                )
+                raise
+    
+    # Only reached when max_retries is negative (no attempts)
+    raise Exception("Unexpected error in retry logic")
+
+
+async def aretry_with_backoff(
+    coro_factory: Callable[[], Awaitable[Any]],
+    retry_config: Optional[RetryConfig] = None,
+    context: Optional[Dict[str, Any]] = None
+) -> Any:
+    """
+    Async retry_with_backoff; waits with asyncio.sleep so the event loop keeps running
+    
+    Args:
+        coro_factory: Called for a fresh awaitable on every attempt
+        retry_config: Retry configuration (uses default if None)
+        context: Additional context for logging
+    
+    Returns:
+        Result from the awaitable
+    
+    Raises:
+        Last exception if all retries fail
+    """
+    config = retry_config or RetryConfig()
+    context = context or {}
+    delays = _backoff_delays(config)
+    
+    for attempt in range(config.max_retries + 1):
+        try:
+            result = await coro_factory()
+            if attempt > 0:
+                logger.info("Function succeeded after retries", retries=attempt, **context)
+            return result
             
+        except config.retryable_exceptions as e:
             if attempt < config.max_retries:
                 logger.warning(
-                    f"Attempt {attempt + 1}/{config.max_retries + 1} failed, "
-                    f"retrying in {delay:.2f}s",
+                    "Attempt failed, retrying",
+                    attempt=attempt + 1,
+                    max_attempts=config.max_retries + 1,
+                    delay=round(delays[attempt], 2),
                     error=str(e),
                     **context
                 )
-                time.sleep(delay)
-                
-                # Exponential backoff
-                delay = min(delay * config.exponential_base, config.max_delay)
+                await asyncio.sleep(delays[attempt])
             else:
                 logger.error(
-                    f"All {config.max_retries + 1} attempts failed",
+                    "All attempts failed",
+                    attempts=config.max_retries + 1,
                     error=str(e),
                     **context
                 )
                 raise
     
-    # Should not reach here, but handle just in case
-    if last_exception:
-        raise last_exception
+    # Only reached when max_retries is negative (no attempts)
     raise Exception("Unexpected error in retry logic")
 
 
@@ -104,7 +164,7 @@ class ErrorHandler:
     
     def __init__(self):
         """Initialize error handler"""
-        self.error_log: list = []
+        self.error_log: Deque[Dict[str, Any]] = deque(maxlen=MAX_ERROR_LOG)
     
     def handle_error(
         self,
@@ -154,21 +214,15 @@ class ErrorHandler:
         Returns:
             Dictionary with error summary
         """
-        errors = self.error_log
-        
         if source:
-            errors = [e for e in errors if e.get("source") == source]
-        
-        error_types = {}
-        for error in errors:
-            error_type = error.get("error_type", "Unknown")
-            error_types[error_type] = error_types.get(error_type, 0) + 1
+            errors = [e for e in self.error_log if e.get("source") == source]
+        else:
+            errors = list(self.error_log)
         
         return {
             "total_errors": len(errors),
-            "by_source": {e["source"]: sum(1 for err in errors if err["source"] == e["source"]) 
-                         for e in errors},
-            "by_type": error_types,
+            "by_source": dict(Counter(e["source"] for e in errors)),
+            "by_type": dict(Counter(e.get("error_type", "Unknown") for e in errors)),
             "recent_errors": errors[-10:]  # Last 10 errors
         }
 
@@ -4,11 +4,17 @@ Parses the EU Full Sanctions List XML file and provides search functionality
 Source: https://webgate.ec.europa.eu/fsd/fsf/public/files/xmlFullSanctionsList/content
 """
 
-import xml.etree.ElementTree as ET
+import mmap
+from collections import defaultdict
+import threading
+from sys import intern
+from lxml import etree as ET
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 from pathlib import Path
 from app.core.logging import get_logger
+from app.data.name_index import NameIndex
+from app.data.parse_cache import load_parse_cache, save_parse_cache
 
 logger = get_logger(__name__)
 
@@ -17,6 +23,17 @@ NS = {
     "ns": "http://eu.europa.ec/fpi/fsd/export"
 }
 
+# Qualified tags; lxml filters on them in C (no ElementPath parsing per call)
+_ENTITY_TAG = f"{{{NS['ns']}}}sanctionEntity"
+_REMARK_TAG = f"{{{NS['ns']}}}remark"
+_SUBJECT_TYPE_TAG = f"{{{NS['ns']}}}subjectType"
+_NAME_ALIAS_TAG = f"{{{NS['ns']}}}nameAlias"
+_REGULATION_TAG = f"{{{NS['ns']}}}regulation"
+_PUBLICATION_URL_TAG = f"{{{NS['ns']}}}publicationUrl"
+_CITIZENSHIP_TAG = f"{{{NS['ns']}}}citizenship"
+_BIRTHDATE_TAG = f"{{{NS['ns']}}}birthdate"
+_ADDRESS_TAG = f"{{{NS['ns']}}}address"
+
 
 class EUSanctionsParser:
     """Parser for EU Consolidated Sanctions List XML file"""
@@ -36,8 +53,25 @@ class EUSanctionsParser:
         
         self.xml_file_path = Path(xml_file_path)
         self.sanction_entries: List[Dict[str, Any]] = []
-        self.indexed_names: Dict[str, List[Dict[str, Any]]] = {}
+        self.indexed_names: Dict[str, List[int]] = {}  # Name -> indexes into sanction_entries
+        self.name_index = NameIndex(())
         self.loaded = False
+        self._load_lock = threading.Lock()
+    
+    def ensure_loaded(self) -> bool:
+        """
+        Load the XML file on first use
+        
+        Concurrent first callers wait for a single load.
+        
+        Returns:
+            True if the file is loaded
+        """
+        if not self.loaded:
+            with self._load_lock:
+                if not self.loaded:
+                    self.load_file()
+        return self.loaded
     
     def load_file(self) -> bool:
         """
@@ -53,32 +87,56 @@ class EUSanctionsParser:
         try:
             logger.info(f"Loading EU sanctions file: {self.xml_file_path} (size: {self.xml_file_path.stat().st_size / (1024*1024):.1f} MB)")
             
+            # Reuse the entries parsed last time if the file hasn't changed
+            cached = load_parse_cache(self.xml_file_path)
+            if cached is not None:
+                self.sanction_entries, self.indexed_names = cached
+                self.name_index = NameIndex(self.indexed_names)
+                logger.info(f"Loaded {len(self.sanction_entries)} EU sanctions entries from cache")
+                self.loaded = True
+                return True
+            
             # Parse XML with iterparse for large files
             self.sanction_entries = []
             self.indexed_names = {}
+            first_index_by_id: Dict[str, int] = {}
+            names_index: Dict[str, List[int]] = defaultdict(list)
             
             entry_count = 0
             
-            for event, elem in ET.iterparse(str(self.xml_file_path), events=("start", "end")):
-                if event == "start" and elem.tag.endswith("}sanctionEntity"):
+            # Map the file and let lxml read it straight from the page cache
+            with open(self.xml_file_path, "rb") as xml_file, \
+                    mmap.mmap(xml_file.fileno(), 0, access=mmap.ACCESS_READ) as xml_map:
+                for _, elem in ET.iterparse(xml_map, events=("end",), tag=_ENTITY_TAG):
                     # Process a sanctionEntity entry
                     entry = self._parse_sanction_entity(elem)
                     if entry:
                         self.sanction_entries.append(entry)
-                        # Index by name for faster searching
-                        names = entry.get("names", [])
-                        for name in names:
-                            name_lower = name.lower()
-                            if name_lower not in self.indexed_names:
-                                self.indexed_names[name_lower] = []
-                            self.indexed_names[name_lower].append(entry)
+                        # Index names by entry position; entries sharing an ID are
+                        # found as the first of them, entries without one aren't searchable
+                        entry_id = entry.get("logical_id", "")
+                        if entry_id:
+                            entry_index = first_index_by_id.setdefault(entry_id, len(self.sanction_entries) - 1)
+                            for name_lower in entry["names_lower"]:
+                                names_index[name_lower].append(entry_index)
                         
                         entry_count += 1
                         if entry_count % 500 == 0:
                             logger.debug(f"Loaded {entry_count} EU sanctions entries...")
                     
-                    # Clear element to free memory
+                    # Free the parsed entry and the already-processed siblings before it
                     elem.clear()
+                    while elem.getprevious() is not None:
+                        del elem.getparent()[0]
+                
+            # Plain dict, so lookups of unknown names don't add empty lists
+            self.indexed_names = dict(names_index)
+            
+            # Trigram index over the names for partial-match searches
+            self.name_index = NameIndex(self.indexed_names)
+            
+            # Later loads read the entries back instead of parsing again
+            save_parse_cache(self.xml_file_path, (self.sanction_entries, self.indexed_names))
             
             logger.info(f"Successfully loaded {len(self.sanction_entries)} EU sanctions entries")
             self.loaded = True
@@ -91,7 +149,7 @@ class EUSanctionsParser:
             logger.error(f"Error loading EU sanctions file: {str(e)}", exc_info=True)
             return False
     
-    def _parse_sanction_entity(self, entity_elem: ET.Element) -> Optional[Dict[str, Any]]:
+    def _parse_sanction_entity(self, entity_elem: ET._Element) -> Optional[Dict[str, Any]]:
         """
         Parse a sanctionEntity entry from XML
         
@@ -106,76 +164,87 @@ class EUSanctionsParser:
             logical_id = entity_elem.get("logicalId", "")
             united_nation_id = entity_elem.get("unitedNationId", "")
             
-            # Get remark
-            remark_elem = entity_elem.find("ns:remark", NS)
-            remark = remark_elem.text if remark_elem is not None and remark_elem.text else ""
-            
-            # Get subject type (person or entity)
-            subject_type_elem = entity_elem.find("ns:subjectType", NS)
-            subject_type = subject_type_elem.get("code", "") if subject_type_elem is not None else ""
-            
-            # Extract names/aliases
+            remark_elem = None
+            subject_type_elem = None
             names = []
-            for name_alias in entity_elem.findall("ns:nameAlias", NS):
-                # Get whole name first
-                whole_name = name_alias.get("wholeName", "").strip()
-                if whole_name:
-                    names.append(whole_name)
-                else:
-                    # Construct from first/middle/last
-                    first = name_alias.get("firstName", "").strip()
-                    middle = name_alias.get("middleName", "").strip()
-                    last = name_alias.get("lastName", "").strip()
-                    constructed = " ".join([x for x in [first, middle, last] if x])
-                    if constructed:
-                        names.append(constructed)
-            
-            # Extract regulations
             regulations = []
-            for regulation in entity_elem.findall("ns:regulation", NS):
-                reg_info = {
-                    "regulationType": regulation.get("regulationType", ""),
-                    "numberTitle": regulation.get("numberTitle", ""),
-                    "publicationDate": regulation.get("publicationDate", ""),
-                    "programme": regulation.get("programme", ""),
-                    "publicationUrl": ""
-                }
-                pub_url_elem = regulation.find("ns:publicationUrl", NS)
-                if pub_url_elem is not None and pub_url_elem.text:
-                    reg_info["publicationUrl"] = pub_url_elem.text
-                regulations.append(reg_info)
-            
-            # Extract citizenship
             citizenships = []
-            for citizenship in entity_elem.findall("ns:citizenship", NS):
-                citizenships.append({
-                    "countryCode": citizenship.get("countryIso2Code", ""),
-                    "country": citizenship.get("countryDescription", "")
-                })
-            
-            # Extract birthdates
             birthdates = []
-            for birthdate in entity_elem.findall("ns:birthdate", NS):
-                birthdates.append({
-                    "date": birthdate.get("birthdate", ""),
-                    "year": birthdate.get("year", ""),
-                    "month": birthdate.get("monthOfYear", ""),
-                    "day": birthdate.get("dayOfMonth", ""),
-                    "city": birthdate.get("city", ""),
-                    "countryCode": birthdate.get("countryIso2Code", ""),
-                    "country": birthdate.get("countryDescription", "")
-                })
-            
-            # Extract address information
             addresses = []
-            for address in entity_elem.findall("ns:address", NS):
-                addresses.append({
-                    "street": address.get("street", ""),
-                    "city": address.get("city", ""),
-                    "zipCode": address.get("zipCode", ""),
-                    "countryCode": address.get("countryIso2Code", ""),
-                    "country": address.get("countryDescription", "")
-                })
+            
+            # Codes, programmes and countries repeat across thousands of entries,
+            # so they are interned to share one string object; free text isn't
+            
+            # One pass over the entity's children, dispatching on tag
+            for child in entity_elem:
+                tag = child.tag
+                
+                if tag == _NAME_ALIAS_TAG:
+                    # Get whole name first
+                    whole_name = child.get("wholeName", "").strip()
+                    if whole_name:
+                        names.append(whole_name)
+                    else:
+                        # Construct from first/middle/last
+                        first = child.get("firstName", "").strip()
+                        middle = child.get("middleName", "").strip()
+                        last = child.get("lastName", "").strip()
+                        constructed = " ".join([x for x in [first, middle, last] if x])
+                        if constructed:
+                            names.append(constructed)
+                
+                elif tag == _REGULATION_TAG:
+                    reg_info = {
+                        "regulationType": intern(child.get("regulationType", "")),
+                        "numberTitle": intern(child.get("numberTitle", "")),
+                        "publicationDate": intern(child.get("publicationDate", "")),
+                        "programme": intern(child.get("programme", "")),
+                        "publicationUrl": ""
+                    }
+                    pub_url_elem = next(child.iterchildren(_PUBLICATION_URL_TAG), None)
+                    if pub_url_elem is not None and pub_url_elem.text:
+                        reg_info["publicationUrl"] = pub_url_elem.text
+                    regulations.append(reg_info)
+                
+                elif tag == _CITIZENSHIP_TAG:
+                    citizenships.append({
+                        "countryCode": intern(child.get("countryIso2Code", "")),
+                        "country": intern(child.get("countryDescription", ""))
+                    })
+                
+                elif tag == _BIRTHDATE_TAG:
+                    birthdates.append({
+                        "date": child.get("birthdate", ""),
+                        "year": child.get("year", ""),
+                        "month": child.get("monthOfYear", ""),
+                        "day": child.get("dayOfMonth", ""),
+                        "city": child.get("city", ""),
+                        "countryCode": intern(child.get("countryIso2Code", "")),
+                        "country": intern(child.get("countryDescription", ""))
+                    })
+                
+                elif tag == _ADDRESS_TAG:
+                    addresses.append({
+                        "street": child.get("street", ""),
+                        "city": child.get("city", ""),
+                        "zipCode": child.get("zipCode", ""),
+                        "countryCode": intern(child.get("countryIso2Code", "")),
+                        "country": intern(child.get("countryDescription", ""))
+                    })
+                
+                elif tag == _REMARK_TAG:
+                    if remark_elem is None:
+                        remark_elem = child
+                
+                elif tag == _SUBJECT_TYPE_TAG:
+                    if subject_type_elem is None:
+                        subject_type_elem = child
+            
+            # Get remark
+            remark = remark_elem.text if remark_elem is not None and remark_elem.text else ""
+            
+            # Get subject type (person or entity)
+            subject_type = intern(subject_type_elem.get("code", "")) if subject_type_elem is not None else ""
             
             # Only return if we have at least one name
             if not names:
@@ -187,6 +256,7 @@ class EUSanctionsParser:
                 "remark": remark,
                 "subject_type": subject_type,  # "person" or "entity"
                 "names": names,
+                "names_lower": [name.lower() for name in names],  # Index keys (same str objects)
                 "regulations": regulations,
                 "citizenships": citizenships,
                 "birthdates": birthdates,
@@ -211,34 +281,22 @@ class EUSanctionsParser:
         Returns:
             List of matching entries
         """
-        if not self.loaded:
-            logger.warning("EU sanctions file not loaded. Loading now...")
-            if not self.load_file():
-                return []
+        if not self.ensure_loaded():
+            return []
         
-        matches = []
         entity_name_lower = entity_name.lower().strip()
         
+        # Positions of matching entries; the set drops entries matched by several names
+        entry_indexes = set()
         if exact_match:
             # Exact match (case-insensitive)
-            if entity_name_lower in self.indexed_names:
-                matches.extend(self.indexed_names[entity_name_lower])
+            entry_indexes.update(self.indexed_names.get(entity_name_lower, ()))
         else:
-            # Partial match - check all indexed names
-            for indexed_name, entries in self.indexed_names.items():
-                if entity_name_lower in indexed_name or indexed_name in entity_name_lower:
-                    matches.extend(entries)
-        
-        # Remove duplicates based on logical_id
-        seen_ids = set()
-        unique_matches = []
-        for match in matches:
-            logical_id = match.get("logical_id", "")
-            if logical_id and logical_id not in seen_ids:
-                seen_ids.add(logical_id)
-                unique_matches.append(match)
+            # Partial match - names containing the query or contained in it
+            for indexed_name in self.name_index.partial_matches(entity_name_lower):
+                entry_indexes.update(self.indexed_names[indexed_name])
         
-        return unique_matches
+        return [self.sanction_entries[i] for i in sorted(entry_indexes)]
     
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -266,12 +324,19 @@ class EUSanctionsParser:
 
 # Singleton instance for caching
 _parser_instance: Optional[EUSanctionsParser] = None
+_parser_lock = threading.Lock()
 
 
 def get_eu_sanctions_parser() -> EUSanctionsParser:
-    """Get singleton EU sanctions parser instance"""
+    """
+    Get singleton EU sanctions parser instance
+    
+    The XML file is not parsed here but on first search (ensure_loaded),
+    so callers that never search don't pay for the load.
+    """
     global _parser_instance
     if _parser_instance is None:
-        _parser_instance = EUSanctionsParser()
-        _parser_instance.load_file()
+        with _parser_lock:
+            if _parser_instance is None:
+                _parser_instance = EUSanctionsParser()
     return _parser_instance
@@ -3,12 +3,17 @@ Data freshness tracking
 Tracks and scores data freshness for collected information
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, List, Optional
 from datetime import datetime, timedelta
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Freshness score thresholds (age in seconds)
+_FRESH_SECONDS = 24 * 3600.0  # 24 hours
+_RECENT_SECONDS = 7 * 86400.0  # 7 days
+_STALE_SECONDS = 30 * 86400.0  # 30 days
+
 
 class DataFreshnessTracker:
     """Tracks data freshness and timestamps"""
@@ -35,23 +40,43 @@ class DataFreshnessTracker:
         if current_time is None:
             current_time = datetime.utcnow()
         
-        age = current_time - collected_at
+        age_seconds = (current_time - collected_at).total_seconds()
         
-        # Define freshness thresholds
-        if age < timedelta(hours=24):
-            return "fresh"  # Less than 24 hours
-        elif age < timedelta(days=7):
-            return "recent"  # Less than 7 days
-        elif age < timedelta(days=30):
-            return "stale"  # Less than 30 days
+        if age_seconds < _FRESH_SECONDS:
+            return "fresh"
+        elif age_seconds < _RECENT_SECONDS:
+            return "recent"
+        elif age_seconds < _STALE_SECONDS:
+            return "stale"
         else:
-            return "very_stale"  # More than 30 days
+            return "very_stale"
+    
+    def calculate_freshness_scores(
+        self,
+        collected_times: Iterable[datetime],
+        current_time: Optional[datetime] = None
+    ) -> List[str]:
+        """
+        Calculate freshness scores for many records against one current time
+        
+        Args:
+            collected_times: Timestamps when each record's data was collected
+            current_time: Current time (uses UTC now if None; read once)
+        
+        Returns:
+            Freshness score for each timestamp, in order
+        """
+        if current_time is None:
+            current_time = datetime.utcnow()
+        
+        return [self.calculate_freshness_score(collected_at, current_time) for collected_at in collected_times]
     
     def track_data_collection(
         self,
         source: str,
         collected_at: datetime,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        current_time: Optional[datetime] = None
     ) -> Dict[str, Any]:
         """
         Track data collection with timestamp
@@ -60,17 +85,20 @@ class DataFreshnessTracker:
             source: Name of data source
             collected_at: Timestamp when data was collected
             metadata: Additional metadata
+            current_time: Current time (uses UTC now if None)
         
         Returns:
             Dictionary with freshness tracking information
         """
-        freshness_score = self.calculate_freshness_score(collected_at)
+        if current_time is None:
+            current_time = datetime.utcnow()
+        freshness_score = self.calculate_freshness_score(collected_at, current_time)
         
         tracking_info = {
             "source": source,
             "collected_at": collected_at.isoformat(),
             "freshness_score": freshness_score,
-            "age_hours": (datetime.utcnow() - collected_at).total_seconds() / 3600,
+            "age_hours": (current_time - collected_at).total_seconds() / 3600,
             "metadata": metadata or {}
         }
         
@@ -85,7 +113,8 @@ class DataFreshnessTracker:
     def should_refresh_data(
         self,
         last_collected_at: datetime,
-        refresh_threshold: timedelta = timedelta(days=7)
+        refresh_threshold: timedelta = timedelta(days=7),
+        current_time: Optional[datetime] = None
     ) -> bool:
         """
         Determine if data should be refreshed
@@ -93,11 +122,15 @@ class DataFreshnessTracker:
         Args:
             last_collected_at: Timestamp when data was last collected
             refresh_threshold: Maximum age before refresh recommended
+            current_time: Current time (uses UTC now if None)
         
         Returns:
             True if data should be refreshed
         """
-        age = datetime.utcnow() - last_collected_at
+        if current_time is None:
+            current_time = datetime.utcnow()
+        
+        age = current_time - last_collected_at
         should_refresh = age > refresh_threshold
         
         logger.info(
@@ -112,7 +145,8 @@ class DataFreshnessTracker:
     def get_freshness_info(
         self,
         collected_at: datetime,
-        verified_at: Optional[datetime] = None
+        verified_at: Optional[datetime] = None,
+        current_time: Optional[datetime] = None
     ) -> Dict[str, Any]:
         """
         Get comprehensive freshness information
@@ -120,11 +154,13 @@ class DataFreshnessTracker:
         Args:
             collected_at: Timestamp when data was collected
             verified_at: Optional timestamp when data was last verified
+            current_time: Current time (uses UTC now if None)
         
         Returns:
             Dictionary with freshness information
         """
-        current_time = datetime.utcnow()
+        if current_time is None:
+            current_time = datetime.utcnow()
         
         freshness_score = self.calculate_freshness_score(collected_at, current_time)
         age = current_time - collected_at
@@ -0,0 +1,33 @@
+"""
+Shared HTTP client for data sources
+One pooled keep-alive client per process (HTTP/2 when h2 is installed)
+"""
+
+import threading
+from typing import Optional
+import httpx
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Singleton client; sources call it from collection worker threads
+_http_client: Optional[httpx.Client] = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.Client:
+    """Get the shared HTTP client (created on first use)"""
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                options = {
+                    "timeout": 30.0,
+                    "limits": httpx.Limits(max_connections=100, max_keepalive_connections=50)
+                }
+                try:
+                    _http_client = httpx.Client(http2=True, **options)
+                except ImportError:
+                    logger.debug("h2 not installed, using HTTP/1.1 connection pool")
+                    _http_client = httpx.Client(**options)
+    return _http_client
@@ -0,0 +1,107 @@
+"""
+Name Index Module
+Substring search over the lowercased names of a sanctions list
+"""
+
+from typing import Dict, Iterable, List, Set
+
+try:
+    import ahocorasick  # Optional: pip install pyahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Queries shorter than this have no trigrams and scan every name
+_TRIGRAM = 3
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Distinct character trigrams of text"""
+    return {text[i:i + _TRIGRAM] for i in range(len(text) - _TRIGRAM + 1)}
+
+
+class NameIndex:
+    """
+    Finds names that contain a query or are contained in it
+    
+    Names containing the query are found by intersecting the posting sets
+    of the query's trigrams; names contained in the query are among the
+    query's own substrings, or with pyahocorasick installed, the names an
+    Aho-Corasick automaton over all names reports in one pass of the query.
+    Either way only candidates are checked, instead of every name.
+    """
+    
+    def __init__(self, names: Iterable[str]):
+        """
+        Build the index
+        
+        Args:
+            names: Lowercased names, in the order results should keep
+        """
+        self._order: Dict[str, int] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        self._short_names: List[str] = []
+        
+        for name in names:
+            if name in self._order:
+                continue
+            self._order[name] = len(self._order)
+            if len(name) < _TRIGRAM:
+                self._short_names.append(name)
+            for trigram in _trigrams(name):
+                self._postings.setdefault(trigram, set()).add(name)
+        
+        self._automaton = None
+        if ahocorasick is not None and self._order:
+            automaton = ahocorasick.Automaton()
+            for name in self._order:
+                automaton.add_word(name, name)
+            automaton.make_automaton()
+            self._automaton = automaton
+    
+    def partial_matches(self, query: str) -> List[str]:
+        """
+        Find names where query is a substring of the name or vice versa
+        
+        Args:
+            query: Lowercased, stripped query
+        
+        Returns:
+            Matching names in index order
+        """
+        if len(query) < _TRIGRAM:
+            return [name for name in self._order if query in name or name in query]
+        
+        matched = set()
+        
+        # Names containing the query hold every one of its trigrams
+        postings = []
+        for trigram in _trigrams(query):
+            posting = self._postings.get(trigram)
+            if posting is None:
+                postings = []
+                break
+            postings.append(posting)
+        if postings:
+            postings.sort(key=len)
+            candidates = postings[0].intersection(*postings[1:])
+            matched.update(name for name in candidates if query in name)
+        
+        # Names contained in the query are substrings of it
+        matched.update(self._contained_in(query))
+        
+        return sorted(matched, key=self._order.__getitem__)
+    
+    def _contained_in(self, query: str) -> Set[str]:
+        """Indexed names that occur in query"""
+        if self._automaton is not None:
+            found = {name for _, name in self._automaton.iter(query)}
+            if "" in self._order:
+                found.add("")  # The automaton can't hold the empty name
+            return found
+        
+        found = {name for name in self._short_names if name in query}
+        for start in range(len(query)):
+            for end in range(start + _TRIGRAM, len(query) + 1):
+                if query[start:end] in self._order:
+                    found.add(query[start:end])
+        return found
@@ -3,12 +3,18 @@ OFAC SDN List Parser
 Parses the OFAC SDN Advanced XML file and provides search functionality
 """
 
-import xml.etree.ElementTree as ET
+import mmap
+from collections import defaultdict
+import threading
+from sys import intern
+from lxml import etree as ET
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 import os
 from pathlib import Path
 from app.core.logging import get_logger
+from app.data.name_index import NameIndex
+from app.data.parse_cache import load_parse_cache, save_parse_cache
 
 logger = get_logger(__name__)
 
@@ -17,17 +23,48 @@ NS = {
     "ns": "https://sanctionslistservice.ofac.treas.gov/api/PublicationPreview/exports/ADVANCED_XML"
 }
 
+# Qualified tags; lxml filters on them in C (no ElementPath parsing per call)
+_PARTY_TAG = f"{{{NS['ns']}}}DistinctParty"
+_PROFILE_TAG = f"{{{NS['ns']}}}Profile"
+_DOCUMENTED_NAME_TAG = f"{{{NS['ns']}}}DocumentedName"
+_NAME_PART_VALUE_TAG = f"{{{NS['ns']}}}NamePartValue"
+_DATE_OF_BIRTH_TAG = f"{{{NS['ns']}}}DateOfBirth"
+_YEAR_TAG = f"{{{NS['ns']}}}Year"
+_MONTH_TAG = f"{{{NS['ns']}}}Month"
+_DAY_TAG = f"{{{NS['ns']}}}Day"
+_PLACE_OF_BIRTH_LIST_TAG = f"{{{NS['ns']}}}PlaceOfBirthList"
+_PLACE_OF_BIRTH_TAG = f"{{{NS['ns']}}}PlaceOfBirth"
+_CITY_TAG = f"{{{NS['ns']}}}City"
+_STATE_TAG = f"{{{NS['ns']}}}StateOrProvince"
+_COUNTRY_TAG = f"{{{NS['ns']}}}Country"
+_PROGRAM_LIST_TAG = f"{{{NS['ns']}}}ProgramList"
+_PROGRAM_TAG = f"{{{NS['ns']}}}Program"
+_REMARKS_TAG = f"{{{NS['ns']}}}Remarks"
+
+# Elements _parse_party_entry reads, collected in a single subtree walk
+_PARTY_FIELD_TAGS = (
+    _PROFILE_TAG,
+    _DOCUMENTED_NAME_TAG,
+    _NAME_PART_VALUE_TAG,
+    _DATE_OF_BIRTH_TAG,
+    _PLACE_OF_BIRTH_TAG,
+    _PROGRAM_TAG,
+    _REMARKS_TAG,
+)
+
 
 class OFACSDNParser:
     """Parser for OFAC SDN Advanced XML files"""
     
-    def __init__(self, xml_file_path: Optional[str] = None):
+    def __init__(self, xml_file_path: Optional[str] = None, keep_raw_xml: bool = False):
         """
         Initialize OFAC SDN parser
         
         Args:
             xml_file_path: Path to OFAC SDN Advanced XML file
                           If None, uses default path in project data folder
+            keep_raw_xml: Store the first 500 chars of each entry's XML as raw_xml
+                          (off by default; serializing every entry is costly)
         """
         if xml_file_path is None:
             # Default to project data folder
@@ -35,11 +72,29 @@ class OFACSDNParser:
             xml_file_path = project_root / "data" / "ofac" / "sdn_advanced.xml"
         
         self.xml_file_path = Path(xml_file_path)
-        self.tree: Optional[ET.ElementTree] = None
-        self.root: Optional[ET.Element] = None
+        self.keep_raw_xml = keep_raw_xml
+        self.tree: Optional[ET._ElementTree] = None
+        self.root: Optional[ET._Element] = None
         self.sdn_entries: List[Dict[str, Any]] = []
-        self.indexed_names: Dict[str, List[Dict[str, Any]]] = {}
+        self.indexed_names: Dict[str, List[int]] = {}  # Name -> indexes into sdn_entries
+        self.name_index = NameIndex(())
         self.loaded = False
+        self._load_lock = threading.Lock()
+    
+    def ensure_loaded(self) -> bool:
+        """
+        Load the XML file on first use
+        
+        Concurrent first callers wait for a single load.
+        
+        Returns:
+            True if the file is loaded
+        """
+        if not self.loaded:
+            with self._load_lock:
+                if not self.loaded:
+                    self.load_file()
+        return self.loaded
     
     def load_file(self) -> bool:
         """
@@ -55,33 +110,58 @@ class OFACSDNParser:
         try:
             logger.info(f"Loading OFAC SDN file: {self.xml_file_path} (size: {self.xml_file_path.stat().st_size / (1024*1024):.1f} MB)")
             
+            # Reuse the entries parsed last time if the file hasn't changed
+            cached = load_parse_cache(self.xml_file_path, variant=self.keep_raw_xml)
+            if cached is not None:
+                self.sdn_entries, self.indexed_names = cached
+                self.name_index = NameIndex(self.indexed_names)
+                logger.info(f"Loaded {len(self.sdn_entries)} OFAC SDN entries from cache")
+                self.loaded = True
+                return True
+            
             # Parse XML with iterparse for large files
             self.sdn_entries = []
             self.indexed_names = {}
+            first_index_by_id: Dict[str, int] = {}
+            names_index: Dict[str, List[int]] = defaultdict(list)
             
             # Count entries first to show progress
             entry_count = 0
             
-            for event, elem in ET.iterparse(str(self.xml_file_path), events=("start", "end")):
-                if event == "start" and elem.tag.endswith("}DistinctParty"):
+            # Map the file and let lxml read it straight from the page cache
+            with open(self.xml_file_path, "rb") as xml_file, \
+                    mmap.mmap(xml_file.fileno(), 0, access=mmap.ACCESS_READ) as xml_map:
+                for _, elem in ET.iterparse(xml_map, events=("end",), tag=_PARTY_TAG):
                     # Process a DistinctParty entry
                     entry = self._parse_party_entry(elem)
+                    
+                    # Free the parsed entry and the already-processed siblings before it
+                    elem.clear()
+                    while elem.getprevious() is not None:
+                        del elem.getparent()[0]
+                    
                     if entry:
                         self.sdn_entries.append(entry)
-                        # Index by name for faster searching
-                        names = entry.get("names", [])
-                        for name in names:
-                            name_lower = name.lower()
-                            if name_lower not in self.indexed_names:
-                                self.indexed_names[name_lower] = []
-                            self.indexed_names[name_lower].append(entry)
+                        # Index names by entry position; entries sharing an ID are
+                        # found as the first of them, entries without one aren't searchable
+                        entry_id = entry.get("profile_id", "")
+                        if entry_id:
+                            entry_index = first_index_by_id.setdefault(entry_id, len(self.sdn_entries) - 1)
+                            for name_lower in entry["names_lower"]:
+                                names_index[name_lower].append(entry_index)
                         
                         entry_count += 1
                         if entry_count % 1000 == 0:
                             logger.debug(f"Loaded {entry_count} OFAC entries...")
-                    
-                    # Clear element to free memory
-                    elem.clear()
+            
+            # Plain dict, so lookups of unknown names don't add empty lists
+            self.indexed_names = dict(names_index)
+            
+            # Trigram index over the names for partial-match searches
+            self.name_index = NameIndex(self.indexed_names)
+            
+            # Later loads read the entries back instead of parsing again
+            save_parse_cache(self.xml_file_path, (self.sdn_entries, self.indexed_names), variant=self.keep_raw_xml)
             
             logger.info(f"Successfully loaded {len(self.sdn_entries)} OFAC SDN entries")
             self.loaded = True
@@ -94,7 +174,7 @@ class OFACSDNParser:
             logger.error(f"Error loading OFAC SDN file: {str(e)}", exc_info=True)
             return False
     
-    def _parse_party_entry(self, party_elem: ET.Element) -> Optional[Dict[str, Any]]:
+    def _parse_party_entry(self, party_elem: ET._Element) -> Optional[Dict[str, Any]]:
         """
         Parse a DistinctParty entry from XML
         
@@ -105,23 +185,64 @@ class OFACSDNParser:
             Dictionary with party data or None
         """
         try:
-            # Get profile ID from Profile element
-            profile_elem = party_elem.find(".//ns:Profile", NS)
-            profile_id = profile_elem.get("ID", "") if profile_elem is not None else ""
-            
-            # Extract names/aliases - names are in NamePartValue elements
-            names = []
+            profile_id = None
+            documented_names = []  # (DocumentedName element, its name parts)
+            name_part_texts = []  # Every NamePartValue text, for the fallback
+            dates_of_birth = []
+            places_of_birth = []
+            programs = []
+            remarks = []
             
-            # Find all DocumentedName elements
-            for documented_name in party_elem.findall(".//ns:DocumentedName", NS):
-                # Find all NamePartValue elements within this DocumentedName
-                name_parts = []
-                for name_part_value in documented_name.findall(".//ns:NamePartValue", NS):
-                    name_text = name_part_value.text
+            # One walk over the subtree; lxml only yields the tags of interest
+            for elem in party_elem.iterdescendants(*_PARTY_FIELD_TAGS):
+                tag = elem.tag
+                
+                if tag == _NAME_PART_VALUE_TAG:
+                    # Names are in NamePartValue elements, grouped by DocumentedName
+                    name_text = elem.text
                     if name_text:
-                        name_parts.append(name_text.strip())
+                        name_part_texts.append(name_text)
+                        if documented_names and next(elem.iterancestors(_DOCUMENTED_NAME_TAG), None) is documented_names[-1][0]:
+                            documented_names[-1][1].append(name_text.strip())
+                
+                elif tag == _DOCUMENTED_NAME_TAG:
+                    documented_names.append((elem, []))
+                
+                elif tag == _PROFILE_TAG:
+                    # Get profile ID from (the first) Profile element
+                    if profile_id is None:
+                        profile_id = elem.get("ID", "")
+                
+                elif tag == _DATE_OF_BIRTH_TAG:
+                    year = next(elem.iterchildren(_YEAR_TAG), None)
+                    month = next(elem.iterchildren(_MONTH_TAG), None)
+                    day = next(elem.iterchildren(_DAY_TAG), None)
+                    if year is not None and month is not None and day is not None:
+                        dates_of_birth.append(f"{year.text}-{month.text}-{day.text}")
+                
+                elif tag == _PLACE_OF_BIRTH_TAG:
+                    if elem.getparent().tag != _PLACE_OF_BIRTH_LIST_TAG:
+                        continue
+                    location_parts = []
+                    for part_tag in (_CITY_TAG, _STATE_TAG, _COUNTRY_TAG):
+                        part = next(elem.iterchildren(part_tag), None)
+                        if part is not None and part.text:
+                            location_parts.append(part.text)
+                    if location_parts:
+                        places_of_birth.append(", ".join(location_parts))
                 
-                # Join name parts
+                elif tag == _PROGRAM_TAG:
+                    # Interned: a few dozen codes repeat across all entries
+                    if elem.text and elem.getparent().tag == _PROGRAM_LIST_TAG:
+                        programs.append(intern(elem.text))
+                
+                elif tag == _REMARKS_TAG:
+                    if elem.text:
+                        remarks.append(elem.text.strip())
+            
+            # Join the parts of each DocumentedName
+            names = []
+            for _, name_parts in documented_names:
                 if name_parts:
                     full_name = " ".join(name_parts)
                     if full_name and full_name not in names:
@@ -129,61 +250,22 @@ class OFACSDNParser:
             
             # If still no names, try alternative path
             if not names:
-                for name_part_value in party_elem.findall(".//ns:NamePartValue", NS):
-                    name_text = name_part_value.text
-                    if name_text and name_text.strip():
-                        name = name_text.strip()
-                        if name not in names:
-                            names.append(name)
-            
-            # Extract additional info
-            dates_of_birth = []
-            for dob in party_elem.findall(".//ns:DateOfBirth", NS):
-                year = dob.find("ns:Year", NS)
-                month = dob.find("ns:Month", NS)
-                day = dob.find("ns:Day", NS)
-                if year is not None and month is not None and day is not None:
-                    dates_of_birth.append(f"{year.text}-{month.text}-{day.text}")
-            
-            # Extract places of birth
-            places_of_birth = []
-            for pob in party_elem.findall(".//ns:PlaceOfBirthList/ns:PlaceOfBirth", NS):
-                city = pob.find("ns:City", NS)
-                state = pob.find("ns:StateOrProvince", NS)
-                country = pob.find("ns:Country", NS)
-                
-                location_parts = []
-                if city is not None and city.text:
-                    location_parts.append(city.text)
-                if state is not None and state.text:
-                    location_parts.append(state.text)
-                if country is not None and country.text:
-                    location_parts.append(country.text)
-                
-                if location_parts:
-                    places_of_birth.append(", ".join(location_parts))
-            
-            # Extract program list
-            programs = []
-            for program in party_elem.findall(".//ns:ProgramList/ns:Program", NS):
-                if program.text:
-                    programs.append(program.text)
-            
-            # Extract remarks
-            remarks = []
-            for remark in party_elem.findall(".//ns:Remarks", NS):
-                if remark.text:
-                    remarks.append(remark.text.strip())
+                for name_text in name_part_texts:
+                    name = name_text.strip()
+                    if name and name not in names:
+                        names.append(name)
             
             entry = {
-                "profile_id": profile_id,
+                "profile_id": profile_id or "",
                 "names": names,
+                "names_lower": [name.lower() for name in names],  # Index keys (same str objects)
                 "dates_of_birth": dates_of_birth,
                 "places_of_birth": places_of_birth,
                 "programs": programs,
-                "remarks": remarks,
-                "raw_xml": ET.tostring(party_elem, encoding="unicode")[:500]  # Store first 500 chars for reference
+                "remarks": remarks
             }
+            if self.keep_raw_xml:
+                entry["raw_xml"] = ET.tostring(party_elem, encoding="unicode")[:500]  # Store first 500 chars for reference
             
             return entry if names else None  # Only return if we have at least one name
             
@@ -203,34 +285,22 @@ class OFACSDNParser:
         Returns:
             List of matching entries
         """
-        if not self.loaded:
-            logger.warning("OFAC SDN file not loaded. Loading now...")
-            if not self.load_file():
-                return []
+        if not self.ensure_loaded():
+            return []
         
-        matches = []
         entity_name_lower = entity_name.lower().strip()
         
+        # Positions of matching entries; the set drops entries matched by several names
+        entry_indexes = set()
         if exact_match:
             # Exact match (case-insensitive)
-            if entity_name_lower in self.indexed_names:
-                matches.extend(self.indexed_names[entity_name_lower])
+            entry_indexes.update(self.indexed_names.get(entity_name_lower, ()))
         else:
-            # Partial match - check all indexed names
-            for indexed_name, entries in self.indexed_names.items():
-                if entity_name_lower in indexed_name or indexed_name in entity_name_lower:
-                    matches.extend(entries)
-        
-        # Remove duplicates based on profile_id
-        seen_ids = set()
-        unique_matches = []
-        for match in matches:
-            profile_id = match.get("profile_id", "")
-            if profile_id and profile_id not in seen_ids:
-                seen_ids.add(profile_id)
-                unique_matches.append(match)
+            # Partial match - names containing the query or contained in it
+            for indexed_name in self.name_index.partial_matches(entity_name_lower):
+                entry_indexes.update(self.indexed_names[indexed_name])
         
-        return unique_matches
+        return [self.sdn_entries[i] for i in sorted(entry_indexes)]
     
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -256,13 +326,19 @@ class OFACSDNParser:
 
 # Singleton instance for caching
 _parser_instance: Optional[OFACSDNParser] = None
+_parser_lock = threading.Lock()
 
 
 def get_ofac_parser() -> OFACSDNParser:
-    """Get singleton OFAC parser instance"""
+    """
+    Get singleton OFAC parser instance
+    
+    The XML file is not parsed here but on first search (ensure_loaded),
+    so callers that never search don't pay for the load.
+    """
     global _parser_instance
     if _parser_instance is None:
-        _parser_instance = OFACSDNParser()
-        _parser_instance.load_file()
+        with _parser_lock:
+            if _parser_instance is None:
+                _parser_instance = OFACSDNParser()
     return _parser_instance
-
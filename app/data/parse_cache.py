@@ -0,0 +1,113 @@
+"""
+Parse Cache Module
+Pickled results of parsing a large source file, stored next to the file
+and reused while the file's mtime and size are unchanged
+"""
+
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Optional, Tuple
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Bump when the layout of cached data changes so older caches are ignored
+CACHE_VERSION = 4
+
+
+def cache_path_for(source_path: Path) -> Path:
+    """Cache file path for a source file (<name>.cache.pkl alongside it)"""
+    return source_path.with_suffix(".cache.pkl")
+
+
+def _cache_header(source_path: Path, variant: Any) -> Tuple[Any, ...]:
+    """Header identifying the source file version a cache was built from"""
+    stat = source_path.stat()
+    return (CACHE_VERSION, stat.st_mtime_ns, stat.st_size, variant)
+
+
+def _read_header(cache_file) -> Any:
+    """Read the header pickled at the start of a cache file"""
+    return pickle.load(cache_file)
+
+
+def parse_cache_is_fresh(source_path: Path, variant: Any = None) -> bool:
+    """
+    Check whether a usable cache exists for a source file
+    
+    Only the header is read, not the cached data.
+    
+    Args:
+        source_path: File the results were parsed from
+        variant: Parse options the results depend on (part of the header)
+    
+    Returns:
+        True if the cache matches the file's current version
+    """
+    try:
+        with open(cache_path_for(source_path), "rb") as cache_file:
+            return _read_header(cache_file) == _cache_header(source_path, variant)
+    except Exception:
+        return False
+
+
+def load_parse_cache(source_path: Path, variant: Any = None) -> Optional[Any]:
+    """
+    Load cached parse results for a source file
+    
+    Args:
+        source_path: File the results were parsed from
+        variant: Parse options the results depend on (part of the header)
+    
+    Returns:
+        Cached data, or None if there is no cache or it is stale or unreadable
+    """
+    cache_path = cache_path_for(source_path)
+    if not cache_path.exists():
+        return None
+    
+    try:
+        with open(cache_path, "rb") as cache_file:
+            # The header is pickled separately so stale data is never unpickled
+            if _read_header(cache_file) != _cache_header(source_path, variant):
+                logger.info("Parse cache is stale", path=str(cache_path))
+                return None
+            return pickle.load(cache_file)
+    except Exception as e:
+        logger.warning("Ignoring unreadable parse cache", path=str(cache_path), error=str(e))
+        return None
+
+
+def save_parse_cache(source_path: Path, data: Any, variant: Any = None) -> bool:
+    """
+    Store parse results for a source file
+    
+    The cache is written to a temporary file and moved into place, so
+    readers never see a partial cache.
+    
+    Args:
+        source_path: File the results were parsed from
+        data: Picklable parse results
+        variant: Parse options the results depend on (part of the header)
+    
+    Returns:
+        True if the cache was written
+    """
+    cache_path = cache_path_for(source_path)
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    
+    try:
+        header = _cache_header(source_path, variant)
+        with open(tmp_path, "wb") as tmp_file:
+            pickle.dump(header, tmp_file, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(data, tmp_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+        return True
+    except Exception as e:
+        logger.warning("Could not write parse cache", path=str(cache_path), error=str(e))
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        return False
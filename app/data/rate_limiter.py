@@ -0,0 +1,125 @@
+"""
+Rate limiting for data sources
+Spaces requests to an external source evenly, shared across processes via
+Redis when REDIS_URL is set
+"""
+
+import os
+import threading
+import time
+from typing import Optional, Union
+from app.core.logging import get_logger
+
+try:
+    import redis  # Optional: pip install redis
+except ImportError:
+    redis = None
+
+logger = get_logger(__name__)
+
+# Reserves the next slot for a key and returns how long (ms) the caller must wait.
+# Uses the Redis server clock so every worker agrees on "now".
+_RESERVE_SLOT_SCRIPT = """
+local t = redis.call('TIME')
+local now = t[1] * 1000 + math.floor(t[2] / 1000)
+local interval = tonumber(ARGV[1])
+local next_slot = tonumber(redis.call('GET', KEYS[1]) or '0')
+local start = math.max(now, next_slot)
+redis.call('SET', KEYS[1], start + interval, 'PX', start + interval - now + 1000)
+return start - now
+"""
+
+
+class RateLimiter:
+    """
+    In-process limiter allowing one request per interval
+    
+    Thread-safe: concurrent callers reserve consecutive slots instead of all
+    sleeping for the same gap and then firing together.
+    """
+    
+    def __init__(self, rate_limit: int):
+        """
+        Initialize rate limiter
+        
+        Args:
+            rate_limit: Maximum requests per minute
+        """
+        self.interval = 60.0 / rate_limit
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until the caller may send its request"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_slot)
+            self._next_slot = start + self.interval
+        
+        if start > now:
+            time.sleep(start - now)
+
+
+class RedisRateLimiter:
+    """Limiter whose slots are shared by every process using the same Redis key"""
+    
+    def __init__(self, client: "redis.Redis", name: str, rate_limit: int):
+        """
+        Initialize Redis rate limiter
+        
+        Args:
+            client: Redis client
+            name: Data source name (the key is rl:{name})
+            rate_limit: Maximum requests per minute
+        """
+        self.key = f"rl:{name}"
+        self.interval_ms = int(60000 / rate_limit)
+        self._reserve = client.register_script(_RESERVE_SLOT_SCRIPT)
+        self._fallback = RateLimiter(rate_limit)
+    
+    def acquire(self):
+        """Block until the caller may send its request"""
+        try:
+            wait_ms = self._reserve(keys=[self.key], args=[self.interval_ms])
+        except Exception as e:
+            logger.warning("Redis rate limiter unavailable, limiting in-process", key=self.key, error=str(e))
+            self._fallback.acquire()
+            return
+        
+        if wait_ms > 0:
+            time.sleep(wait_ms / 1000)
+
+
+# Shared Redis client (None when REDIS_URL is unset or redis isn't installed)
+_redis_client: Optional["redis.Redis"] = None
+_redis_checked = False
+
+
+def _get_redis_client() -> Optional["redis.Redis"]:
+    """Get the shared Redis client, if configured"""
+    global _redis_client, _redis_checked
+    if not _redis_checked:
+        _redis_checked = True
+        redis_url = os.getenv("REDIS_URL")
+        if redis_url and redis is not None:
+            _redis_client = redis.Redis.from_url(redis_url)
+        elif redis_url:
+            logger.warning("REDIS_URL is set but redis is not installed; rate limits are per process")
+    return _redis_client
+
+
+def create_rate_limiter(name: str, rate_limit: int) -> Union[RateLimiter, RedisRateLimiter]:
+    """
+    Create the limiter for a data source
+    
+    Args:
+        name: Data source name
+        rate_limit: Maximum requests per minute
+    
+    Returns:
+        Redis-backed limiter when REDIS_URL is set, in-process limiter otherwise
+    """
+    client = _get_redis_client()
+    if client is not None:
+        return RedisRateLimiter(client, name, rate_limit)
+    return RateLimiter(rate_limit)
@@ -13,6 +13,13 @@ import os
 
 logger = get_logger(__name__)
 
+# Countries whose checks include the EU sanctions list
+_EU_COUNTRIES = frozenset([
+    "EU", "AT", "BE", "BG", "HR", "CY", "CZ", "DK", "EE",
+    "FI", "FR", "DE", "GR", "HU", "IE", "IT", "LV", "LT",
+    "LU", "MT", "NL", "PL", "PT", "RO", "SK", "SI", "ES", "SE"
+])
+
 
 class SanctionsChecker(DataSource):
     """Checks sanctions lists and watchlists"""
@@ -58,6 +65,8 @@ class SanctionsChecker(DataSource):
             "is_sanctioned": False
         }
         
+        check_eu = country in _EU_COUNTRIES
+        
         # Check OFAC (US Sanctions)
         ofac_result = self._check_ofac(entity_name)
         if ofac_result:
@@ -81,9 +90,7 @@ class SanctionsChecker(DataSource):
                 result_data["is_sanctioned"] = True
         
         # Check EU Sanctions (if applicable)
-        if country in ["EU", "AT", "BE", "BG", "HR", "CY", "CZ", "DK", "EE", 
-                      "FI", "FR", "DE", "GR", "HU", "IE", "IT", "LV", "LT", 
-                      "LU", "MT", "NL", "PL", "PT", "RO", "SK", "SI", "ES", "SE"]:
+        if check_eu:
             eu_result = self._check_eu_sanctions(entity_name)
             if eu_result:
                 result_data["sanctions_checks"]["eu"] = eu_result
@@ -107,7 +114,7 @@ class SanctionsChecker(DataSource):
             Dictionary with OFAC check results or None
         """
         try:
-            logger.info(f"Checking OFAC sanctions list for: {entity_name}")
+            logger.info("Checking OFAC sanctions list", entity=entity_name)
             
             # Get OFAC parser instance (singleton, loads file once)
             parser = get_ofac_parser()
@@ -133,7 +140,8 @@ class SanctionsChecker(DataSource):
                     })
                 
                 logger.warning(
-                    f"OFAC match found for: {entity_name}",
+                    "OFAC match found",
+                    entity=entity_name,
                     matches=len(matches),
                     profile_ids=[m.get("profile_id") for m in matches[:5]]
                 )
@@ -149,7 +157,7 @@ class SanctionsChecker(DataSource):
                 }
             else:
                 # No matches found
-                logger.info(f"No OFAC match found for: {entity_name}")
+                logger.info("No OFAC match found", entity=entity_name)
                 return {
                     "source": "OFAC SDN List",
                     "list_url": "https://ofac.treasury.gov/specially-designated-nationals-list-sdn-list",
@@ -161,7 +169,7 @@ class SanctionsChecker(DataSource):
                 }
                 
         except Exception as e:
-            logger.error(f"Error checking OFAC list", error=str(e), exc_info=True)
+            logger.error("Error checking OFAC list", error=str(e), exc_info=True)
             return {
                 "source": "OFAC SDN List",
                 "list_url": "https://ofac.treasury.gov/specially-designated-nationals-list-sdn-list",
@@ -182,7 +190,7 @@ class SanctionsChecker(DataSource):
             Dictionary with UN sanctions check results or None
         """
         try:
-            logger.info(f"Checking UN sanctions list for: {entity_name}")
+            logger.info("Checking UN sanctions list", entity=entity_name)
             
             # UN sanctions lists are available via API or downloadable files
             # Placeholder structure
@@ -195,7 +203,7 @@ class SanctionsChecker(DataSource):
                 "note": "UN sanctions list checking requires API integration or file parsing"
             }
         except Exception as e:
-            logger.error(f"Error checking UN sanctions list", error=str(e))
+            logger.error("Error checking UN sanctions list", error=str(e))
             return None
     
     def _check_eu_sanctions(self, entity_name: str) -> Optional[Dict[str, Any]]:
@@ -209,14 +217,14 @@ class SanctionsChecker(DataSource):
             Dictionary with EU sanctions check results or None
         """
         try:
-            logger.info(f"Checking EU sanctions list for: {entity_name}")
+            logger.info("Checking EU sanctions list", entity=entity_name)
             
             # Get EU sanctions parser instance (singleton, loads file once)
             from app.data.eu_sanctions_parser import get_eu_sanctions_parser
             
             parser = get_eu_sanctions_parser()
             
-            if not parser.loaded:
+            if not parser.ensure_loaded():
                 logger.warning("EU sanctions file not loaded")
                 return None
             
@@ -243,7 +251,8 @@ class SanctionsChecker(DataSource):
                     })
                 
                 logger.warning(
-                    f"EU sanctions match found for: {entity_name}",
+                    "EU sanctions match found",
+                    entity=entity_name,
                     matches=len(matches),
                     logical_ids=[m.get("logical_id") for m in matches[:5]]
                 )
@@ -259,7 +268,7 @@ class SanctionsChecker(DataSource):
                 }
             else:
                 # No matches found
-                logger.info(f"No EU sanctions match found for: {entity_name}")
+                logger.info("No EU sanctions match found", entity=entity_name)
                 return {
                     "source": "EU Consolidated Sanctions List",
                     "list_url": "https://webgate.ec.europa.eu/fsd/fsf/public/files/xmlFullSanctionsList/content",
@@ -271,7 +280,7 @@ class SanctionsChecker(DataSource):
                 }
                 
         except Exception as e:
-            logger.error(f"Error checking EU sanctions list", error=str(e), exc_info=True)
+            logger.error("Error checking EU sanctions list", error=str(e), exc_info=True)
             return {
                 "source": "EU Consolidated Sanctions List",
                 "list_url": "https://webgate.ec.europa.eu/fsd/fsf/public/files/xmlFullSanctionsList/content",
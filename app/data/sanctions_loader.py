@@ -0,0 +1,92 @@
+"""
+Sanctions List Loader
+Parses the EU and OFAC sanctions lists side by side
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from typing import Any, Dict, Type
+from app.core.logging import get_logger
+from app.data.eu_sanctions_parser import get_eu_sanctions_parser
+from app.data.ofac_parser import get_ofac_parser
+from app.data.parse_cache import parse_cache_is_fresh
+
+logger = get_logger(__name__)
+
+# Concurrent callers share one preload instead of each starting workers
+_preload_lock = threading.Lock()
+
+# Workers are spawned, not forked: a fork of a threaded server can copy locks
+# held by other threads and deadlock in the child
+_WORKER_CONTEXT = multiprocessing.get_context("spawn")
+
+
+def _parse_to_cache(parser_class: Type, xml_file_path: str, options: Dict[str, Any]) -> bool:
+    """Parse a list in a worker process; load_file saves the parse cache"""
+    return parser_class(xml_file_path, **options).load_file()
+
+
+def preload_sanctions_lists(timeout: float = 300) -> Dict[str, bool]:
+    """
+    Load both sanctions lists, parsing the XML files in parallel
+    
+    Parsing is mostly Python work holding the GIL, so two threads take as
+    long as parsing the files one after the other; lists that need a full
+    parse are parsed in worker processes instead. Each worker writes the
+    list's parse cache, which this process then loads instead of parsing
+    again. Lists that are loaded or have a fresh cache skip the workers, so
+    the cost of starting them is only paid when both files have changed.
+    
+    Started in the background at application startup; checks load lists
+    lazily otherwise.
+    
+    Args:
+        timeout: Seconds to wait for the workers; after that they are
+            terminated and unfinished lists are parsed here
+    
+    Returns:
+        Whether each list ("eu", "ofac") is loaded
+    """
+    with _preload_lock:
+        eu_parser = get_eu_sanctions_parser()
+        ofac_parser = get_ofac_parser()
+        
+        # (parser, constructor options, parse cache variant)
+        lists = {
+            "eu": (eu_parser, {}, None),
+            "ofac": (ofac_parser, {"keep_raw_xml": ofac_parser.keep_raw_xml}, ofac_parser.keep_raw_xml),
+        }
+        
+        to_parse = {
+            name: (parser, options)
+            for name, (parser, options, variant) in lists.items()
+            if not parser.loaded
+            and parser.xml_file_path.exists()
+            and not parse_cache_is_fresh(parser.xml_file_path, variant)
+        }
+        
+        # A single list (or a single CPU) gains nothing from workers;
+        # ensure_loaded parses such lists below
+        if len(to_parse) > 1 and (os.cpu_count() or 1) > 1:
+            deadline = time.monotonic() + timeout
+            # Leaving the block terminates any worker still running
+            with _WORKER_CONTEXT.Pool(processes=len(to_parse)) as pool:
+                tasks = {
+                    name: pool.apply_async(_parse_to_cache, (type(parser), str(parser.xml_file_path), options))
+                    for name, (parser, options) in to_parse.items()
+                }
+                for name, task in tasks.items():
+                    try:
+                        task.get(timeout=max(deadline - time.monotonic(), 0))
+                    except multiprocessing.TimeoutError:
+                        logger.warning("Sanctions list worker timed out", list=name, timeout=timeout)
+                    except Exception as e:
+                        logger.warning("Sanctions list worker failed", list=name, error=str(e))
+        
+        # Reads the caches written above (or parses here if a worker couldn't write one)
+        loaded = {name: parser.ensure_loaded() for name, (parser, _, _) in lists.items()}
+    
+    logger.info("Sanctions lists preloaded", **loaded)
+    return loaded
@@ -80,7 +80,7 @@ class WebScraper(DataSource):
                 if scraped_data:
                     result_data["sources"].append(scraped_data)
             except Exception as e:
-                logger.error(f"Error scraping URL {url}", error=str(e))
+                logger.error("Error scraping URL", url=url, error=str(e))
         
         # Search for company website and scrape
         else:
@@ -92,7 +92,7 @@ class WebScraper(DataSource):
                     if scraped_data:
                         result_data["sources"].append(scraped_data)
                 except Exception as e:
-                    logger.error(f"Error scraping company website", 
+                    logger.error("Error scraping company website", 
                                url=company_website, error=str(e))
         
         return result_data
@@ -108,7 +108,7 @@ class WebScraper(DataSource):
             Dictionary with scraped content or None
         """
         try:
-            logger.info(f"Scraping URL: {url}")
+            logger.info("Scraping URL", url=url)
             response = self.session.get(url, timeout=self.timeout)
             response.raise_for_status()
             
@@ -158,10 +158,10 @@ class WebScraper(DataSource):
             }
             
         except requests.exceptions.RequestException as e:
-            logger.error(f"Request error for {url}", error=str(e))
+            logger.error("Request error", url=url, error=str(e))
             return None
         except Exception as e:
-            logger.error(f"Error scraping {url}", error=str(e))
+            logger.error("Error scraping", url=url, error=str(e))
             return None
     
     def _find_company_website(
@@ -186,7 +186,7 @@ class WebScraper(DataSource):
             Potential company website URL or None if not found
         """
         try:
-            logger.info(f"Attempting to find website for: {company_name} ({country})")
+            logger.info("Attempting to find website", company=company_name, country=country)
             
             # Use URLFinder to discover website
             url_result = self.url_finder.find_company_url(company_name, country)
@@ -195,18 +195,18 @@ class WebScraper(DataSource):
                 found_url = url_result.get("url")
                 confidence = url_result.get("confidence", "medium")
                 logger.info(
-                    f"Found company website",
+                    "Found company website",
                     company=company_name,
                     url=found_url,
                     confidence=confidence
                 )
                 return found_url
             else:
-                logger.warning(f"Could not find website for: {company_name}")
+                logger.warning("Could not find website", company=company_name)
                 return None
                 
         except Exception as e:
-            logger.error(f"Error finding company website", company=company_name, error=str(e))
+            logger.error("Error finding company website", company=company_name, error=str(e))
             return None
     
     def validate_data(self, data: Dict[str, Any]) -> bool:
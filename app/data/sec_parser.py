@@ -5,12 +5,26 @@ Parses the SEC company tickers JSON file and provides search functionality
 
 import json
 import gzip
+import threading
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 from app.core.logging import get_logger
 
+try:
+    import orjson  # Optional: pip install orjson
+except ImportError:
+    orjson = None
+
 logger = get_logger(__name__)
 
+# Punctuation is dropped when normalizing names ("Apple Inc." == "apple inc")
+_NAME_PUNCTUATION = str.maketrans({c: " " for c in ".,&'\"()/-"})
+
+
+def normalize_company_name(name: str) -> str:
+    """Normalize a company name for exact lookups (case, punctuation, spacing)"""
+    return " ".join(name.lower().translate(_NAME_PUNCTUATION).split())
+
 
 class SECCompanyParser:
     """Parser for SEC EDGAR company tickers file"""
@@ -32,6 +46,7 @@ class SECCompanyParser:
         self.companies: Dict[str, Dict[str, Any]] = {}
         self.indexed_names: Dict[str, List[Dict[str, Any]]] = {}
         self.indexed_tickers: Dict[str, Dict[str, Any]] = {}
+        self.normalized_names: Dict[str, Dict[str, Any]] = {}  # Full normalized title -> first company
         self.loaded = False
     
     def load_file(self) -> bool:
@@ -50,16 +65,12 @@ class SECCompanyParser:
             
             # Try to open as gzip first, then regular JSON
             try:
-                # Check if file is gzip compressed
-                with open(self.json_file_path, 'rb') as f:
-                    is_gzip = f.read(2) == b'\x1f\x8b'
+                # Read once; decompress if the file is gzip compressed
+                raw = self.json_file_path.read_bytes()
+                if raw[:2] == b'\x1f\x8b':
+                    raw = gzip.decompress(raw)
                 
-                if is_gzip:
-                    with gzip.open(self.json_file_path, 'rt', encoding='utf-8') as f:
-                        data = json.load(f)
-                else:
-                    with open(self.json_file_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
+                data = orjson.loads(raw) if orjson is not None else json.loads(raw)
             except Exception as e:
                 logger.warning(f"Error reading file, trying alternative method: {str(e)}")
                 # Fallback: try regular JSON
@@ -71,6 +82,7 @@ class SECCompanyParser:
             self.companies = {}
             self.indexed_names = {}
             self.indexed_tickers = {}
+            self.normalized_names = {}
             
             for key, company_info in data.items():
                 if isinstance(company_info, dict):
@@ -95,6 +107,8 @@ class SECCompanyParser:
                         
                         # Index by name (case-insensitive)
                         if title:
+                            self.normalized_names.setdefault(normalize_company_name(title), company)
+                            
                             title_lower = title.lower()
                             if title_lower not in self.indexed_names:
                                 self.indexed_names[title_lower] = []
@@ -219,6 +233,25 @@ class SECCompanyParser:
         
         return self.indexed_tickers.get(ticker.upper())
     
+    def find_exact(self, company_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a company by ticker or full normalized name in O(1)
+        
+        Args:
+            company_name: Company name or ticker
+        
+        Returns:
+            Company record or None (callers fall back to search_company)
+        """
+        if not self.loaded:
+            if not self.load_file():
+                return None
+        
+        return (
+            self.indexed_tickers.get(company_name.upper().strip())
+            or self.normalized_names.get(normalize_company_name(company_name))
+        )
+    
     def get_statistics(self) -> Dict[str, Any]:
         """
         Get statistics about the loaded company database
@@ -241,13 +274,22 @@ class SECCompanyParser:
 
 # Singleton instance for caching
 _parser_instance: Optional[SECCompanyParser] = None
+_parser_lock = threading.Lock()
 
 
 def get_sec_parser() -> SECCompanyParser:
-    """Get singleton SEC parser instance"""
+    """
+    Get singleton SEC parser instance
+    
+    The tickers file is loaded on first use (not at import), exactly once even
+    when concurrent requests ask for the parser together.
+    """
     global _parser_instance
     if _parser_instance is None:
-        _parser_instance = SECCompanyParser()
-        _parser_instance.load_file()
+        with _parser_lock:
+            if _parser_instance is None:
+                parser = SECCompanyParser()
+                parser.load_file()
+                _parser_instance = parser
     return _parser_instance
 
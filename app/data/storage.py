@@ -24,7 +24,8 @@ class DataStorage:
         self,
         input_data: Dict[str, Any],
         collected_data: Dict[str, Any],
-        aggregated_data: Dict[str, Any]
+        aggregated_data: Dict[str, Any],
+        job_status: Optional[str] = None
     ) -> Optional[int]:
         """
         Store LOB verification data
@@ -33,6 +34,7 @@ class DataStorage:
             input_data: Original input (client, country, role, product)
             collected_data: Raw collected data from sources
             aggregated_data: Aggregated and cleaned data
+            job_status: Initial state when a background job fills the record
         
         Returns:
             ID of created record or None
@@ -54,19 +56,20 @@ class DataStorage:
                 flags=None,
                 sources=aggregated_data.get("sources", []),
                 is_red_flag=False,
-                confidence_score=None
+                confidence_score=None,
+                job_status=job_status
             )
             
             db.add(verification)
             db.commit()
             db.refresh(verification)
             
-            logger.info(f"Stored verification record: {verification.id}")
+            logger.info("Stored verification record", verification_id=verification.id)
             return verification.id
             
         except Exception as e:
             db.rollback()
-            logger.error(f"Error storing verification data", error=str(e))
+            logger.error("Error storing verification data", error=str(e))
             return None
         finally:
             db.close()
@@ -93,7 +96,7 @@ class DataStorage:
             ).first()
             
             if not verification:
-                logger.warning(f"Verification record not found: {verification_id}")
+                logger.warning("Verification record not found", verification_id=verification_id)
                 return False
             
             # Update fields
@@ -102,12 +105,12 @@ class DataStorage:
                     setattr(verification, key, value)
             
             db.commit()
-            logger.info(f"Updated verification record: {verification_id}")
+            logger.info("Updated verification record", verification_id=verification_id)
             return True
             
         except Exception as e:
             db.rollback()
-            logger.error(f"Error updating verification data", error=str(e))
+            logger.error("Error updating verification data", error=str(e))
             return False
         finally:
             db.close()
@@ -150,7 +153,7 @@ class DataStorage:
             }
             
         except Exception as e:
-            logger.error(f"Error getting verification data", error=str(e))
+            logger.error("Error getting verification data", error=str(e))
             return None
         finally:
             db.close()
@@ -199,13 +202,13 @@ class DataStorage:
             verification.sources = sources
             
             db.commit()
-            logger.info(f"Tracked data source for verification {verification_id}", 
-                       source=source_name)
+            logger.info("Tracked data source for verification", 
+                       verification_id=verification_id, source=source_name)
             return True
             
         except Exception as e:
             db.rollback()
-            logger.error(f"Error tracking data source", error=str(e))
+            logger.error("Error tracking data source", error=str(e))
             return False
         finally:
             db.close()
@@ -0,0 +1,70 @@
+"""
+TTL Cache Module
+Small in-process TTL/LRU cache for data source lookups
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a time-to-live"""
+    
+    def __init__(self, maxsize: int = 10000, ttl: float = 3600):
+        """
+        Initialize cache
+        
+        Args:
+            maxsize: Maximum number of entries (least recently used are evicted)
+            ttl: Default time-to-live for each entry in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a live entry
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            Cached value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """
+        Store a value
+        
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Time-to-live for this entry in seconds (defaults to the cache's ttl)
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
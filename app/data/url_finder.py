@@ -60,21 +60,21 @@ class URLFinder:
         Returns:
             Dictionary with URL and validation info, or None if not found
         """
-        logger.info(f"Finding URL for: {company_name} ({country})")
+        logger.info("Finding URL", company=company_name, country=country)
         
         # Strategy 1: Try common domain patterns (fast, free, no API needed)
-        logger.debug(f"Strategy 1: Trying common domain patterns for {company_name}")
+        logger.debug("Strategy 1: Trying common domain patterns", company=company_name)
         candidate_urls = self._generate_candidate_urls(company_name, country)
         
         # Test each candidate
         for url in candidate_urls:
             result = self._validate_url(url, company_name)
             if result and result.get("valid"):
-                logger.info(f"Found valid URL via domain patterns: {url}")
+                logger.info("Found valid URL via domain patterns", url=url)
                 return result
         
         # Strategy 2: Try company name variations (handles abbreviations, suffixes)
-        logger.debug(f"Strategy 2: Trying name variations for {company_name}")
+        logger.debug("Strategy 2: Trying name variations", company=company_name)
         variations = self._generate_name_variations(company_name)
         for variation in variations:
             # Skip if variation is same as original (already tried)
@@ -85,18 +85,18 @@ class URLFinder:
             for url in candidate_urls:
                 result = self._validate_url(url, company_name)
                 if result and result.get("valid"):
-                    logger.info(f"Found valid URL with variation '{variation}': {url}")
+                    logger.info("Found valid URL with name variation", variation=variation, url=url)
                     return result
         
         # Strategy 3 (FALLBACK): Try web search API (Tavily) - only if other methods fail
         # This is more expensive (API calls) and slower, so use as fallback
-        logger.debug(f"Strategy 3 (Fallback): Trying web search API for {company_name}")
+        logger.debug("Strategy 3 (Fallback): Trying web search API", company=company_name)
         search_result = self._search_for_url(company_name, country)
         if search_result and search_result.get("valid"):
-            logger.info(f"Found URL via web search API (fallback): {search_result.get('url')}")
+            logger.info("Found URL via web search API (fallback)", url=search_result.get("url"))
             return search_result
         
-        logger.warning(f"Could not find valid URL for: {company_name} (all strategies exhausted)")
+        logger.warning("Could not find valid URL (all strategies exhausted)", company=company_name)
         return None
     
     def _generate_candidate_urls(
@@ -238,13 +238,13 @@ class URLFinder:
                 }
             
         except requests.exceptions.Timeout:
-            logger.debug(f"Timeout checking URL: {url}")
+            logger.debug("Timeout checking URL", url=url)
         except requests.exceptions.ConnectionError:
-            logger.debug(f"Connection error for URL: {url}")
+            logger.debug("Connection error for URL", url=url)
         except requests.exceptions.RequestException as e:
-            logger.debug(f"Request error for {url}: {str(e)}")
+            logger.debug("Request error for URL", url=url, error=str(e))
         except Exception as e:
-            logger.debug(f"Error validating {url}: {str(e)}")
+            logger.debug("Error validating URL", url=url, error=str(e))
         
         return None
     
@@ -310,13 +310,13 @@ class URLFinder:
         tavily_api_key = os.getenv("TAVILY_API_KEY")
         
         if not tavily_api_key:
-            logger.debug(f"Tavily API key not configured - skipping web search fallback")
+            logger.debug("Tavily API key not configured - skipping web search fallback")
             return None
         
         try:
             # Construct search query for official website
             search_query = f"{company_name} official website {country}"
-            logger.debug(f"Searching Tavily API: {search_query}")
+            logger.debug("Searching Tavily API", query=search_query)
             
             response = self.session.get(
                 "https://api.tavily.com/search",
@@ -334,10 +334,10 @@ class URLFinder:
                 results = data.get("results", [])
                 
                 if not results:
-                    logger.debug(f"No results from Tavily API for: {company_name}")
+                    logger.debug("No results from Tavily API", company=company_name)
                     return None
                 
-                logger.debug(f"Tavily API returned {len(results)} results")
+                logger.debug("Tavily API returned results", count=len(results))
                 
                 # Try each result until we find a valid match
                 for i, result in enumerate(results[:5], 1):  # Check top 5 results
@@ -347,34 +347,35 @@ class URLFinder:
                     if not url:
                         continue
                     
-                    logger.debug(f"Validating Tavily result {i}/{len(results)}: {url}")
+                    logger.debug("Validating Tavily result", index=i, total=len(results), url=url)
                     
                     # Validate the found URL
                     validated = self._validate_url(url, company_name)
                     if validated and validated.get("valid"):
                         logger.info(
-                            f"Found valid URL via Tavily API (result {i})",
+                            "Found valid URL via Tavily API",
+                            index=i,
                             url=url,
                             title=title[:50]
                         )
                         return validated
                     else:
-                        logger.debug(f"Tavily result {i} failed validation: {url}")
+                        logger.debug("Tavily result failed validation", index=i, url=url)
                 
-                logger.warning(f"Tavily API returned results but none validated for: {company_name}")
+                logger.warning("Tavily API returned results but none validated", company=company_name)
             elif response.status_code == 401:
                 logger.warning("Tavily API key is invalid or expired")
             elif response.status_code == 429:
                 logger.warning("Tavily API rate limit exceeded - consider upgrading plan")
             else:
-                logger.warning(f"Tavily API returned status {response.status_code}: {response.text[:200]}")
+                logger.warning("Tavily API returned an error status", status=response.status_code, body=response.text[:200])
             
         except requests.exceptions.Timeout:
             logger.warning("Tavily API request timed out - check network connection")
         except requests.exceptions.RequestException as e:
-            logger.warning(f"Tavily API request error: {str(e)}")
+            logger.warning("Tavily API request error", error=str(e))
         except Exception as e:
-            logger.error(f"Unexpected error in Tavily search: {str(e)}", exc_info=True)
+            logger.error("Unexpected error in Tavily search", error=str(e), exc_info=True)
         
         return None
     
@@ -450,7 +451,7 @@ class URLFinder:
         """
         results = []
         
-        logger.info(f"Finding URLs for {len(companies)} companies")
+        logger.info("Finding URLs", companies=len(companies))
         
         for i, company in enumerate(companies, 1):
             company_name = company.get("name", "")
@@ -3,11 +3,20 @@ TBAML System - Main FastAPI Application
 UC1: Line of Business Verification
 """
 
+import asyncio
+from typing import Optional
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from app.core.logging import setup_logging, get_logger
+from app.data.sanctions_loader import preload_sanctions_lists
 from pydantic_settings import BaseSettings
 
+try:
+    import orjson  # Optional: pip install orjson
+except ImportError:
+    orjson = None
+
 # Setup logging
 setup_logging()
 logger = get_logger(__name__)
@@ -19,6 +28,7 @@ class Settings(BaseSettings):
     app_version: str = "0.1.0"
     environment: str = "development"
     debug: bool = True
+    preload_sanctions: bool = True  # Parse sanctions lists in the background at startup
     
     model_config = {
         "env_file": ".env",
@@ -28,13 +38,18 @@ class Settings(BaseSettings):
 
 settings = Settings()
 
+# Background sanctions preload (referenced so the task isn't garbage collected)
+_preload_task: Optional[asyncio.Task] = None
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     description="Trade-Based Anti-Money Laundering System - UC1: Line of Business Verification",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    # orjson encodes large ai_response payloads several times faster than json
+    default_response_class=ORJSONResponse if orjson is not None else JSONResponse
 )
 
 # CORS middleware
@@ -50,7 +65,12 @@ app.add_middleware(
 @app.on_event("startup")
 async def startup_event():
     """Application startup event"""
+    global _preload_task
     logger.info("Application starting up", version=settings.app_version)
+    if settings.preload_sanctions:
+        # Not awaited: requests are served meanwhile, and checks that arrive
+        # before it finishes load the lists themselves (ensure_loaded)
+        _preload_task = asyncio.create_task(asyncio.to_thread(preload_sanctions_lists))
 
 
 @app.on_event("shutdown")
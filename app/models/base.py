@@ -1,8 +1,10 @@
 """Base database models and configuration"""
 
+from functools import lru_cache
+from typing import Iterator
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy import Column, Integer, DateTime
 from datetime import datetime
 
@@ -43,17 +45,42 @@ def create_database_engine():
             connect_args={"check_same_thread": False}
         )
     else:
-        engine = create_engine(database_url)
+        engine = create_engine(
+            database_url,
+            pool_size=10,
+            max_overflow=20,
+            pool_pre_ping=True
+        )
     return engine
 
 
+@lru_cache(maxsize=1)
 def get_session_factory():
-    """Get database session factory"""
+    """
+    Get database session factory
+    
+    The engine (and its connection pool) is created once per process and
+    shared by every caller.
+    """
     engine = create_database_engine()
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     return SessionLocal, engine
 
 
+def get_db() -> Iterator[Session]:
+    """
+    FastAPI dependency yielding a database session
+    
+    The session is closed once the request has been handled.
+    """
+    SessionLocal, _ = get_session_factory()
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 def init_db():
     """Initialize database tables"""
     # Import models to register them with Base.metadata
@@ -29,4 +29,8 @@ class LOBVerification(BaseModel):
     data_collected_at = Column(DateTime, nullable=True)  # When data was collected
     data_freshness_score = Column(String(50), nullable=True)  # Freshness rating
     last_verified_at = Column(DateTime, nullable=True)  # Last verification timestamp
+    
+    # Background job tracking (unset for synchronous verifications)
+    job_status = Column(String(20), nullable=True)  # pending, running, completed, failed
+    job_error = Column(Text, nullable=True)  # Why the job failed
 
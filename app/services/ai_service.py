@@ -4,15 +4,27 @@ Service layer that integrates AI analysis with data storage
 Updates database records with AI-generated UC1 outputs
 """
 
-from typing import Dict, List, Optional, Any
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple
 from app.core.logging import get_logger
-from app.ai.orchestrator import AIOrchestrator
+from app.ai.config import get_ai_config
+from app.ai.orchestrator import AIOrchestrator, AnalysisResult
 from app.models.base import get_session_factory
 from app.models.lob import LOBVerification
+from sqlalchemy import update
 from app.data.storage import DataStorage
 
 logger = get_logger(__name__)
 
+# Blocking DB reads and writes of async analyses run here, sized to the LLM
+# concurrency budget rather than the event loop's small default executor
+_ANALYSIS_EXECUTOR = ThreadPoolExecutor(
+    max_workers=get_ai_config().llm_batch_concurrency,
+    thread_name_prefix="ai-analysis"
+)
+
 
 class AIService:
     """Service for AI analysis and database updates"""
@@ -27,7 +39,8 @@ class AIService:
     def analyze_and_update(
         self,
         verification_id: int,
-        force_update: bool = False
+        force_update: bool = False,
+        return_record: bool = False
     ) -> Optional[Dict[str, Any]]:
         """
         Analyze LOB verification and update database with AI outputs
@@ -35,10 +48,78 @@ class AIService:
         Args:
             verification_id: Verification record ID
             force_update: Whether to force update even if analysis exists
+            return_record: Include the updated (detached) LOBVerification under
+                "record", so callers need not re-read it
+        
+        Returns:
+            Updated verification record or None
+        """
+        analysis_inputs, early_result = self._load_analysis_inputs(verification_id, force_update)
+        if analysis_inputs is None:
+            return early_result
+        
+        ai_result = self.orchestrator.analyze_lob(**analysis_inputs, force_refresh=force_update)
+        return self._store_analysis(verification_id, analysis_inputs, ai_result, return_record)
+    
+    async def analyze_and_update_async(
+        self,
+        verification_id: int,
+        force_update: bool = False,
+        return_record: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Analyze and update without blocking the event loop
+        
+        The record is read and written on the analysis thread pool; the
+        analysis itself runs on the event loop (analyze_lob_async), so the
+        main report streams while the classifier calls are in flight, and
+        those calls are micro-batched with other concurrent analyses.
+        
+        Args:
+            verification_id: Verification record ID
+            force_update: Whether to force update even if analysis exists
+            return_record: Include the updated LOBVerification under "record"
         
         Returns:
             Updated verification record or None
         """
+        loop = asyncio.get_running_loop()
+        analysis_inputs, early_result = await loop.run_in_executor(
+            _ANALYSIS_EXECUTOR,
+            self._load_analysis_inputs,
+            verification_id,
+            force_update
+        )
+        if analysis_inputs is None:
+            return early_result
+        
+        ai_result = await self.orchestrator.analyze_lob_async(**analysis_inputs, force_refresh=force_update)
+        return await loop.run_in_executor(
+            _ANALYSIS_EXECUTOR,
+            self._store_analysis,
+            verification_id,
+            analysis_inputs,
+            ai_result,
+            return_record
+        )
+    
+    def _load_analysis_inputs(
+        self,
+        verification_id: int,
+        force_update: bool
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Read a verification record and build the orchestrator inputs
+        
+        Args:
+            verification_id: Verification record ID
+            force_update: Whether to analyze even if analysis exists
+        
+        Returns:
+            Tuple of (analyze_lob keyword arguments, early result). The
+            arguments are None when there is nothing to analyze; the early
+            result (already-analyzed status, or None) is then returned as is.
+        """
         db = self.SessionLocal()
         try:
             # Get verification record
@@ -47,20 +128,20 @@ class AIService:
             ).first()
             
             if not verification:
-                logger.error(f"Verification not found: {verification_id}")
-                return None
+                logger.error("Verification not found", verification_id=verification_id)
+                return None, None
             
             # Check if already analyzed (unless force update)
             if not force_update and verification.ai_response:
-                logger.info(f"Verification {verification_id} already analyzed, skipping")
-                return {
+                logger.info("Verification already analyzed, skipping", verification_id=verification_id)
+                return None, {
                     "id": verification.id,
                     "company": verification.client,
                     "status": "already_analyzed",
                     "existing_ai_response": verification.ai_response[:200] + "..."
                 }
             
-            logger.info(f"Analyzing verification {verification_id}: {verification.client}")
+            logger.info("Analyzing verification", verification_id=verification_id, company=verification.client)
             
             # Prepare input data
             input_data = {
@@ -90,60 +171,92 @@ class AIService:
                 "sources": [s.get("name") if isinstance(s, dict) else str(s) for s in sources_list] if sources_list else []
             }
             
-            # Run AI analysis
-            try:
-                ai_result = self.orchestrator.analyze_lob(
-                    input_data=input_data,
-                    collected_data=collected_data,
-                    aggregated_data=aggregated_data
-                )
-                
-                # Update database record
-                verification.ai_response = ai_result.get("ai_response", "")
-                verification.activity_level = ai_result.get("activity_level", "Unknown")
-                verification.flags = ai_result.get("flags", [])
-                verification.is_red_flag = ai_result.get("is_red_flag", False)
-                verification.confidence_score = ai_result.get("confidence_score", "Low")
-                
-                # Update timestamp
-                from datetime import datetime
-                verification.last_verified_at = datetime.utcnow()
-                
-                db.commit()
-                db.refresh(verification)
-                
-                logger.info(
-                    f"Updated verification {verification_id}",
-                    activity_level=verification.activity_level,
-                    flags_count=len(verification.flags or []),
-                    is_red_flag=verification.is_red_flag
+            return {
+                "input_data": input_data,
+                "collected_data": collected_data,
+                "aggregated_data": aggregated_data
+            }, None
+        
+        except Exception as e:
+            logger.error("Error updating verification", verification_id=verification_id, error=str(e))
+            return None, None
+        finally:
+            db.close()
+    
+    def _store_analysis(
+        self,
+        verification_id: int,
+        analysis_inputs: Dict[str, Any],
+        ai_result: AnalysisResult,
+        return_record: bool
+    ) -> Dict[str, Any]:
+        """
+        Write an analysis result to its verification record
+        
+        Args:
+            verification_id: Verification record ID
+            analysis_inputs: Inputs the analysis ran on
+            ai_result: Orchestrator result
+            return_record: Include the updated LOBVerification under "record"
+        
+        Returns:
+            Analysis summary (status "analyzed", or "error" if the update failed)
+        """
+        db = self.SessionLocal()
+        try:
+            # Update database record in one UPDATE ... RETURNING (no dirty-attribute
+            # flush, and the returned row replaces a refresh SELECT after commit)
+            stmt = (
+                update(LOBVerification)
+                .where(LOBVerification.id == verification_id)
+                .values(
+                    ai_response=ai_result.ai_response,
+                    activity_level=ai_result.activity_level,
+                    flags=ai_result.flags,
+                    is_red_flag=ai_result.is_red_flag,
+                    confidence_score=ai_result.confidence_score,
+                    last_verified_at=datetime.utcnow()
                 )
-                
-                return {
-                    "id": verification.id,
-                    "company": verification.client,
-                    "status": "analyzed",
-                    "activity_level": verification.activity_level,
-                    "risk_level": ai_result.get("risk_level"),
-                    "flags_count": len(verification.flags or []),
-                    "is_red_flag": verification.is_red_flag,
-                    "confidence_score": verification.confidence_score
-                }
+                .returning(LOBVerification)
+            )
+            verification = db.execute(stmt).scalar_one()
             
-            except Exception as e:
-                logger.error(f"Error in AI analysis for {verification_id}", error=str(e))
-                db.rollback()
-                return {
-                    "id": verification.id,
-                    "company": verification.client,
-                    "status": "error",
-                    "error": str(e)
-                }
+            # Detach first so commit doesn't expire the returned values
+            db.expunge(verification)
+            db.commit()
+            
+            logger.info(
+                "Updated verification",
+                verification_id=verification_id,
+                activity_level=verification.activity_level,
+                flags_count=len(verification.flags or []),
+                is_red_flag=verification.is_red_flag
+            )
+            
+            result = {
+                "id": verification.id,
+                "company": verification.client,
+                "status": "analyzed",
+                "activity_level": verification.activity_level,
+                "risk_level": ai_result.risk_level,
+                "flags_count": len(verification.flags or []),
+                "is_red_flag": verification.is_red_flag,
+                "confidence_score": verification.confidence_score
+            }
+            if return_record:
+                # Loaded by RETURNING and detached, so every column stays readable
+                result["record"] = verification
+            return result
         
         except Exception as e:
-            logger.error(f"Error updating verification {verification_id}", error=str(e))
+            logger.error("Error in AI analysis", verification_id=verification_id, error=str(e))
             db.rollback()
-            return None
+            return {
+                "id": verification_id,
+                "company": analysis_inputs["input_data"]["client"],
+                "status": "error",
+                "error": str(e)
+            }
         finally:
             db.close()
     
@@ -153,7 +266,7 @@ class AIService:
         force_update: bool = False
     ) -> Dict[str, Any]:
         """
-        Analyze multiple verifications
+        Analyze multiple verifications (runs analyze_batch_async to completion)
         
         Args:
             limit: Maximum number of records to analyze (None for all)
@@ -161,9 +274,38 @@ class AIService:
         
         Returns:
             Dictionary with batch results
+        
+        Raises:
+            RuntimeError: If called while this thread runs an event loop;
+                async callers await analyze_batch_async instead
         """
-        db = self.SessionLocal()
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.analyze_batch_async(limit=limit, force_update=force_update))
         
+        # A second loop on a worker thread would fight the running one over
+        # the LLM client's async connections, which belong to one loop
+        raise RuntimeError("analyze_batch called from a running event loop; await analyze_batch_async")
+    
+    async def analyze_batch_async(
+        self,
+        limit: Optional[int] = None,
+        force_update: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Analyze multiple verifications
+        
+        Records are analyzed concurrently on the async path, so their LLM
+        calls are coalesced into micro-batches.
+        
+        Args:
+            limit: Maximum number of records to analyze (None for all)
+            force_update: Whether to force update even if analysis exists
+        
+        Returns:
+            Dictionary with batch results
+        """
         results = {
             "total": 0,
             "analyzed": 0,
@@ -173,23 +315,20 @@ class AIService:
         }
         
         try:
-            # Get verifications to analyze
-            query = db.query(LOBVerification)
-            
-            if not force_update:
-                query = query.filter(LOBVerification.ai_response.is_(None))
-            
-            if limit:
-                query = query.limit(limit)
+            loop = asyncio.get_running_loop()
+            verification_ids = await loop.run_in_executor(
+                _ANALYSIS_EXECUTOR,
+                self._batch_verification_ids,
+                limit,
+                force_update
+            )
+            results["total"] = len(verification_ids)
             
-            verifications = query.all()
-            results["total"] = len(verifications)
+            logger.info("Starting batch analysis", total=results["total"])
             
-            logger.info(f"Starting batch analysis for {results['total']} verifications")
+            batch_results = await self._analyze_many_async(verification_ids, force_update)
             
-            for v in verifications:
-                result = self.analyze_and_update(v.id, force_update=force_update)
-                
+            for result in batch_results:
                 if result:
                     status = result.get("status", "unknown")
                     if status == "analyzed":
@@ -204,7 +343,7 @@ class AIService:
                     results["errors"] += 1
             
             logger.info(
-                f"Batch analysis complete",
+                "Batch analysis complete",
                 total=results["total"],
                 analyzed=results["analyzed"],
                 skipped=results["skipped"],
@@ -214,11 +353,48 @@ class AIService:
             return results
         
         except Exception as e:
-            logger.error(f"Error in batch analysis", error=str(e))
+            logger.error("Error in batch analysis", error=str(e))
             return results
+    
+    def _batch_verification_ids(self, limit: Optional[int], force_update: bool) -> List[int]:
+        """IDs of the verifications a batch analyzes"""
+        db = self.SessionLocal()
+        try:
+            query = db.query(LOBVerification.id)
+            
+            if not force_update:
+                query = query.filter(LOBVerification.ai_response.is_(None))
+            
+            if limit:
+                query = query.limit(limit)
+            
+            return [row.id for row in query.all()]
         finally:
             db.close()
     
+    async def _analyze_many_async(
+        self,
+        verification_ids: List[int],
+        force_update: bool
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Analyze verifications concurrently, at most llm_batch_concurrency at a time
+        
+        Args:
+            verification_ids: Verification record IDs
+            force_update: Whether to force update even if analysis exists
+        
+        Returns:
+            analyze_and_update_async result per ID, in order
+        """
+        semaphore = asyncio.Semaphore(self.orchestrator.config.llm_batch_concurrency)
+        
+        async def analyze_one(verification_id: int) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                return await self.analyze_and_update_async(verification_id, force_update=force_update)
+        
+        return await asyncio.gather(*(analyze_one(vid) for vid in verification_ids))
+    
     def get_analysis_status(self) -> Dict[str, Any]:
         """Get status of AI analysis for all records"""
         db = self.SessionLocal()
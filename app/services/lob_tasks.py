@@ -0,0 +1,146 @@
+"""
+LOB Verification Tasks
+Runs the collection and analysis pipeline for a verification record
+after the request that created it has returned
+"""
+
+from typing import Any, Dict, Optional, Tuple
+from app.core.logging import get_logger
+from app.data.connector import DataConnector
+from app.data.storage import DataStorage
+from app.services.ai_service import AIService
+
+logger = get_logger(__name__)
+
+# Job states, stored on the record (job_status) so every worker sees them;
+# records with an ai_response are completed regardless of tracking
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+
+async def collect_lob_data(
+    data_connector: DataConnector,
+    input_dict: Dict[str, Any]
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Collect, format and aggregate data from all sources
+    
+    Args:
+        data_connector: Connector with its sources registered
+        input_dict: Verification input (client, country, role, product)
+    
+    Returns:
+        Tuple of (collected_data, aggregated_data)
+    """
+    # Collect from all sources (concurrently, off the event loop)
+    results = await data_connector.collect_from_all_sources_async(input_dict)
+    
+    # Format collected data
+    collected_data = {
+        "sources": [],
+        "data": {}
+    }
+    
+    for result in results:
+        if result.success:
+            collected_data["sources"].append({
+                "name": result.source,
+                "data": result.data,
+                "timestamp": result.timestamp.isoformat() if result.timestamp else None
+            })
+            # Merge data
+            if result.data:
+                collected_data["data"].update(result.data)
+    
+    # Aggregate and validate data
+    logger.info("Aggregating and validating data...")
+    # Callers only read the merged data (website URL), so skip copying it
+    aggregated_data = data_connector.aggregate_results(results, copy_data=False)
+    
+    return collected_data, aggregated_data
+
+
+def create_pending_verification(
+    storage: DataStorage,
+    input_dict: Dict[str, Any]
+) -> Optional[int]:
+    """
+    Store a verification record with no collected data yet
+    
+    Args:
+        storage: Data storage
+        input_dict: Verification input (client, country, role, product)
+    
+    Returns:
+        ID of created record or None
+    """
+    return storage.store_verification(
+        input_data=input_dict,
+        collected_data={},
+        aggregated_data={},
+        job_status=JOB_PENDING
+    )
+
+
+async def run_lob_verification(
+    verification_id: int,
+    input_dict: Dict[str, Any],
+    data_connector: DataConnector,
+    ai_service: AIService,
+    storage: DataStorage
+):
+    """
+    Collect data for a pending record, then analyze and update it
+    
+    Args:
+        verification_id: ID returned by create_pending_verification
+        input_dict: Verification input (client, country, role, product)
+        data_connector: Connector to collect through
+        ai_service: Service running the AI analysis
+        storage: Data storage
+    """
+    storage.update_verification(verification_id, {"job_status": JOB_RUNNING})
+    try:
+        _, aggregated_data = await collect_lob_data(data_connector, input_dict)
+        
+        if not storage.update_verification(verification_id, {
+            "website_source": aggregated_data.get("data", {}).get("url"),
+            "sources": aggregated_data.get("sources", [])
+        }):
+            raise RuntimeError("Failed to store collected data")
+        
+        ai_result = await ai_service.analyze_and_update_async(
+            verification_id=verification_id,
+            force_update=False
+        )
+        
+        if not ai_result or ai_result.get("status") == "error":
+            error = (ai_result or {}).get("error") or "AI analysis failed"
+            storage.update_verification(verification_id, {"job_status": JOB_FAILED, "job_error": error})
+            logger.warning("AI analysis failed for verification job", verification_id=verification_id)
+            return
+        
+        storage.update_verification(verification_id, {"job_status": JOB_COMPLETED})
+        logger.info("Verification job complete", verification_id=verification_id)
+    
+    except Exception as e:
+        storage.update_verification(verification_id, {"job_status": JOB_FAILED, "job_error": str(e)})
+        logger.error("Error in verification job", verification_id=verification_id, error=str(e))
+
+
+def get_job_status(job_status: Optional[str], ai_response: Optional[str]) -> str:
+    """
+    Get the job state of a verification record
+    
+    Args:
+        job_status: The record's stored job state
+        ai_response: The record's stored AI response
+    
+    Returns:
+        pending, running, completed or failed
+    """
+    if ai_response:
+        return JOB_COMPLETED
+    return job_status or JOB_PENDING
@@ -122,7 +122,7 @@ class CompanyTester:
             }
             
             collected_at = datetime.utcnow()
-            freshness_score = self.freshness_tracker.calculate_freshness_score(collected_at)
+            freshness_score = self.freshness_tracker.calculate_freshness_score(collected_at, current_time=collected_at)
             
             verification_id = self.storage.store_verification(
                 input_data,